@@ -0,0 +1,10 @@
+# benchmarks/__init__.py
+
+"""
+Benchmarks del simulador y de las MTs de César.
+
+Uso:
+    python -m benchmarks --quick
+    python -m benchmarks --json resultados.json
+    python -m benchmarks --json nuevo.json --compare viejo.json
+"""
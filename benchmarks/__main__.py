@@ -0,0 +1,5 @@
+# benchmarks/__main__.py
+
+from .run import main
+
+main()
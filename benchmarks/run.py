@@ -0,0 +1,260 @@
+# benchmarks/run.py
+
+import argparse
+import dataclasses
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from maquina.parser import load_mt_from_json  # noqa: E402
+from maquina.turing import TuringMachine  # noqa: E402
+from maquina.compiled import CompiledTuringMachine  # noqa: E402
+from maquina.codegen import GeneratedTuringMachine  # noqa: E402
+from maquina.binary import dumps_binary, loads_binary  # noqa: E402
+from maquina.encoder_mt import encrypt, encrypt_with_trace  # noqa: E402
+from maquina.decoder_mt import decrypt, decrypt_with_trace  # noqa: E402
+
+
+MACHINES = ["mt_encoder", "mt_decoder", "mt_encoder_26", "mt_decoder_26"]
+LENGTHS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+KEYS = list(range(27))
+ENGINES: Dict[str, Callable] = {
+    "interprete": TuringMachine,
+    "compilado": CompiledTuringMachine,
+    "generado": GeneratedTuringMachine,
+}
+
+# encrypt()/decrypt() usan el max_steps del JSON: solo mensajes que caben
+API_LENGTHS = [10, 100, 1_000, 10_000]
+# El trazado guarda todos los pasos: se limita a mensajes cortos
+TRACE_LENGTHS = [10, 100, 1_000]
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ .#"
+
+
+def make_message(key: int, length: int, seed: int = 0) -> str:
+    """Entrada "k#MENSAJE" determinista de largo `length`."""
+    rng = random.Random(seed * 1_000_003 + length)
+    body = "".join(rng.choice(ALPHABET[:-1]) for _ in range(length))
+    return f"{key}#{body}"
+
+
+def timed(fn: Callable, repeat: int) -> float:
+    """Mejor tiempo (s) de `repeat` ejecuciones."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def peak_memory(fn: Callable) -> int:
+    """Pico de memoria (bytes) asignada por fn, medido con tracemalloc."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(bench: str, **fields) -> dict:
+    row = {"bench": bench}
+    row.update(fields)
+    return row
+
+
+# ----------------- benchmarks ----------------- #
+
+def bench_load(machines: List[str], repeat: int) -> List[dict]:
+    rows = []
+    for name in machines:
+        path = ROOT / "ejemplos" / f"{name}.json"
+        t = timed(lambda: load_mt_from_json(str(path)), repeat)
+        rows.append(result("load_json", machine=name, seconds=t))
+        blob = dumps_binary(load_mt_from_json(str(path)))
+        t = timed(lambda: loads_binary(blob), repeat)
+        rows.append(result("load_binary", machine=name, seconds=t, bytes=len(blob)))
+    return rows
+
+
+def bench_run(machines: List[str], lengths: List[int], keys: List[int],
+              repeat: int, memory: bool) -> List[dict]:
+    rows = []
+    for name in machines:
+        base = load_mt_from_json(str(ROOT / "ejemplos" / f"{name}.json"))
+        for length in lengths:
+            config = dataclasses.replace(base, max_steps=10 * length + 1_000)
+            for engine, cls in ENGINES.items():
+                tm = cls(config)
+                for key in keys:
+                    word = make_message(key, length)
+
+                    def run():
+                        tm.reset([word])
+                        tm.run()
+
+                    t = timed(run, repeat)
+                    row = result("run", machine=name, engine=engine, length=length,
+                                 key=key, seconds=t, steps=tm.steps,
+                                 steps_per_s=tm.steps / t if t else None,
+                                 us_per_char=t * 1e6 / length)
+                    if memory:
+                        row["peak_bytes"] = peak_memory(run)
+                    rows.append(row)
+    return rows
+
+
+def bench_step(machines: List[str], steps: int, repeat: int) -> List[dict]:
+    """Costo de step() llamado desde Python (sin el bucle especializado)."""
+    rows = []
+    word = make_message(3, steps)
+    for name in machines:
+        base = load_mt_from_json(str(ROOT / "ejemplos" / f"{name}.json"))
+        config = dataclasses.replace(base, max_steps=10 * steps)
+        for engine, cls in ENGINES.items():
+            tm = cls(config)
+
+            def run():
+                tm.reset([word])
+                for _ in range(steps):
+                    tm.step()
+
+            t = timed(run, repeat)
+            rows.append(result("step", machine=name, engine=engine, steps=steps,
+                               seconds=t, us_per_step=t * 1e6 / steps))
+    return rows
+
+
+def bench_api(lengths: List[int], keys: List[int], repeat: int, trace: bool) -> List[dict]:
+    rows = []
+    funcs = [("encrypt", encrypt), ("decrypt", decrypt)]
+    if trace:
+        funcs += [("encrypt_with_trace", encrypt_with_trace),
+                  ("decrypt_with_trace", decrypt_with_trace)]
+    for fname, fn in funcs:
+        is_trace = fname.endswith("_trace")
+        for length in (TRACE_LENGTHS if is_trace else API_LENGTHS):
+            if length not in lengths:
+                continue
+            for key in keys:
+                word = make_message(key, length)
+                if is_trace:
+                    call = lambda: fn(word, max_steps=10 * length + 1_000)  # noqa: E731
+                else:
+                    call = lambda: fn(word)  # noqa: E731
+                call()  # calentar la caché de máquinas
+                t = timed(call, repeat)
+                row = result(fname, length=length, key=key, seconds=t,
+                             us_per_char=t * 1e6 / length)
+                if is_trace:
+                    row["peak_bytes"] = peak_memory(call)
+                rows.append(row)
+    return rows
+
+
+# ----------------- reporte ----------------- #
+
+def _row_id(row: dict) -> tuple:
+    fields = ("bench", "machine", "engine", "length", "key")
+    if row["bench"] == "step":
+        fields += ("steps",)
+    return tuple((k, row[k]) for k in fields if k in row)
+
+
+def summarize(rows: List[dict]) -> None:
+    for row in rows:
+        parts = [row["bench"]]
+        for k in ("machine", "engine", "length", "key"):
+            if k in row:
+                parts.append(f"{k}={row[k]}")
+        parts.append(f"{row['seconds'] * 1e3:.3f} ms")
+        if row.get("steps_per_s"):
+            parts.append(f"{row['steps_per_s']:,.0f} pasos/s")
+        if "us_per_char" in row:
+            parts.append(f"{row['us_per_char']:.3f} µs/char")
+        if "us_per_step" in row:
+            parts.append(f"{row['us_per_step']:.3f} µs/paso")
+        if "peak_bytes" in row:
+            parts.append(f"pico {row['peak_bytes'] / 1024:,.0f} KiB")
+        print("  ".join(parts))
+
+
+def compare(rows: List[dict], old_path: str) -> None:
+    """Imprime la razón tiempo_nuevo / tiempo_viejo para filas equivalentes."""
+    old = {_row_id(r): r for r in json.loads(Path(old_path).read_text())["results"]}
+    print(f"\nComparación contra {old_path} (< 1.0 es más rápido):")
+    for row in rows:
+        prev = old.get(_row_id(row))
+        if prev and prev["seconds"]:
+            label = " ".join(f"{k}={v}" for k, v in _row_id(row))
+            print(f"  {row['seconds'] / prev['seconds']:6.2f}x  {label}")
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador de MT")
+    parser.add_argument("--quick", action="store_true",
+                        help="Subconjunto corto (largos 10 y 1000, llaves 0, 3, 26)")
+    parser.add_argument("--machines", nargs="+", default=MACHINES, choices=MACHINES)
+    parser.add_argument("--lengths", nargs="+", type=int, default=LENGTHS)
+    parser.add_argument("--keys", nargs="+", type=int, default=KEYS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="No medir pico de memoria (tracemalloc es lento)")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="Omitir encrypt_with_trace/decrypt_with_trace")
+    parser.add_argument("--json", help="Escribir resultados en este archivo JSON")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.quick:
+        args.lengths = [10, 1_000]
+        args.keys = [0, 3, 26]
+        args.repeat = 1
+
+    rows: List[dict] = []
+    rows += bench_load(args.machines, args.repeat)
+    rows += bench_step(args.machines, 10_000, args.repeat)
+    rows += bench_run(args.machines, args.lengths, args.keys, args.repeat, not args.no_memory)
+    rows += bench_api(args.lengths, args.keys, args.repeat, not args.no_trace)
+
+    summarize(rows)
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"meta": metadata(), "results": rows}, indent=2), encoding="utf-8"
+        )
+        print(f"\nResultados guardados en: {args.json}")
+    if args.compare:
+        compare(rows, args.compare)
+
+
+if __name__ == "__main__":
+    main()
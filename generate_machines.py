@@ -4,6 +4,9 @@ Salida:
     - ejemplos/mt_encoder.json
     - ejemplos/mt_decoder.json
 
+Opciones: --format pretty|lines|min, --gzip (.json.gz), --tmc (binario
+compilado), --alphabet (otro alfabeto), --out-dir.
+
 Notas:
     - 1 cinta; entrada: "LLAVE#MENSAJE" (llave 0..26 o A..Z).
     - Se crean estados qKey_k y qProc_k para k=0..26.
@@ -11,6 +14,7 @@ Notas:
 """
 
 from pathlib import Path
+import gzip
 import json
 
 ALPHABET = [
@@ -21,104 +25,229 @@ ALPHABET_LEN = len(ALPHABET)  # 26
 SIGMA_BASE = [" ", "#", "."] + ALPHABET + [str(d) for d in range(10)]
 GAMMA_BASE = ["_"] + SIGMA_BASE  # blank + symbols
 
-def shift_letter(letter: str, k: int, encode: bool = True) -> str:
-    if letter not in ALPHABET:
+def shift_letter(letter: str, k: int, encode: bool = True, alphabet=None) -> str:
+    alphabet = alphabet or ALPHABET
+    if letter not in alphabet:
         return letter
-    idx = ALPHABET.index(letter)
+    idx = alphabet.index(letter)
     if encode:
-        new_idx = (idx + k) % ALPHABET_LEN
+        new_idx = (idx + k) % len(alphabet)
     else:
-        new_idx = (idx - k) % ALPHABET_LEN
-    return ALPHABET[new_idx]
+        new_idx = (idx - k) % len(alphabet)
+    return alphabet[new_idx]
+
+def _two_digit_prefixes(n: int):
+    """Primeros dígitos d con los que empieza alguna llave de dos dígitos <= n."""
+    return [d for d in range(1, 10) if d * 10 <= n]
+
 
-def build_machine(encode: bool) -> dict:
-    states = ["q0", "qMaybeTwo_1", "qMaybeTwo_2", "qAccept"]
-    # Agregar qKey_k y qProc_k para k=0..26
-    for k in range(ALPHABET_LEN + 1):  # 0..26
+def machine_header(encode: bool, alphabet=None) -> dict:
+    """Todo el JSON de la MT menos las transiciones (ver iter_transitions)."""
+    alphabet = list(alphabet or ALPHABET)
+    n = len(alphabet)
+    states = ["q0"] + [f"qMaybeTwo_{d}" for d in _two_digit_prefixes(n)] + ["qAccept"]
+    # Agregar qKey_k y qProc_k para k=0..n
+    for k in range(n + 1):
         states.append(f"qKey_{k}")
         states.append(f"qProc_{k}")
+    sigma = [" ", "#", "."] + alphabet + [str(d) for d in range(10)]
+    return {
+        "Q": states,
+        "Sigma": sigma,
+        "Gamma": ["_"] + sigma,
+        "blank": "_",
+        "q0": "q0",
+        "F": ["qAccept"],
+        "num_tapes": 1,
+        "max_steps": 500000,
+    }
+
+
+def iter_transitions(encode: bool, alphabet=None):
+    """
+    Genera las transiciones una por una, como [q, [r], q', [w], [m]].
 
-    transitions = []
+    alphabet: letras que se desplazan (por defecto A..Z). Las llaves van de
+    0 a len(alphabet), en dígitos (hasta 99) o como letra del alfabeto.
+    """
+    alphabet = list(alphabet or ALPHABET)
+    n = len(alphabet)
+    prefixes = _two_digit_prefixes(n)
 
     # Helper to add transition
     def add(state, read, next_state, write, move):
-        transitions.append([state, [read], next_state, [write], [move]])
+        return [state, [read], next_state, [write], [move]]
 
     # q0: primer símbolo (dígito o letra)
     # Dígitos '0'-'9'
     for d in range(10):
-        if d in (1,2):
+        if d in prefixes:
             # posible clave de dos dígitos
-            add("q0", str(d), f"qMaybeTwo_{d}", str(d), "R")
-        else:
+            yield add("q0", str(d), f"qMaybeTwo_{d}", str(d), "R")
+        elif d <= n:
             # clave de un dígito
             k = d
-            add("q0", str(d), f"qKey_{k}", str(d), "R")
+            yield add("q0", str(d), f"qKey_{k}", str(d), "R")
 
-    # Letras A..Z
-    for idx, letter in enumerate(ALPHABET):
+    # Letras del alfabeto
+    for idx, letter in enumerate(alphabet):
         k = idx  # A=0, B=1,...
-        add("q0", letter, f"qKey_{k}", letter, "R")
+        yield add("q0", letter, f"qKey_{k}", letter, "R")
 
-    # qMaybeTwo_1: '#' => k=1 o segundo dígito 10+d
-    add("qMaybeTwo_1", "#", "qProc_1", "#", "R")
-    for d in range(10):
-        k = 10 + d
-        if k <= 26:
-            # keep second digit, move to wait for '#'
-            add("qMaybeTwo_1", str(d), f"qKey_{k}", str(d), "R")
-    # qMaybeTwo_2: '#' => k=2 o segundo dígito 0..6 formando 20..26
-    add("qMaybeTwo_2", "#", "qProc_2", "#", "R")
-    for d in range(7):  # 0..6
-        k = 20 + d
-        add("qMaybeTwo_2", str(d), f"qKey_{k}", str(d), "R")
+    # qMaybeTwo_d: '#' => k=d o segundo dígito e formando 10*d+e <= n
+    for d in prefixes:
+        yield add(f"qMaybeTwo_{d}", "#", f"qProc_{d}", "#", "R")
+        for e in range(10):
+            k = 10 * d + e
+            if k <= n:
+                # keep second digit, move to wait for '#'
+                yield add(f"qMaybeTwo_{d}", str(e), f"qKey_{k}", str(e), "R")
 
     # qKey_k: expect '#'; when seen go to qProc_k
-    for k in range(ALPHABET_LEN + 1):
-        add(f"qKey_{k}", "#", f"qProc_{k}", "#", "R")
+    for k in range(n + 1):
+        yield add(f"qKey_{k}", "#", f"qProc_{k}", "#", "R")
 
     # Procesamiento en qProc_k
-    for k in range(ALPHABET_LEN + 1):
+    for k in range(n + 1):
         proc = f"qProc_{k}"
         # Letras
-        for letter in ALPHABET:
-            out = shift_letter(letter, k % ALPHABET_LEN, encode)
-            add(proc, letter, proc, out, "R")
+        for letter in alphabet:
+            out = shift_letter(letter, k % n, encode, alphabet)
+            yield add(proc, letter, proc, out, "R")
         # Espacio y punto se copian
-        add(proc, " ", proc, " ", "R")
-        add(proc, ".", proc, ".", "R")
+        yield add(proc, " ", proc, " ", "R")
+        yield add(proc, ".", proc, ".", "R")
         # Dígitos: copiar si aparecen en el mensaje
         for d in range(10):
-            add(proc, str(d), proc, str(d), "R")
+            yield add(proc, str(d), proc, str(d), "R")
         # En blanco => aceptar
-        add(proc, "_", "qAccept", "_", "S")
+        yield add(proc, "_", "qAccept", "_", "S")
         # Si aparece '#', conservar y continuar
-        add(proc, "#", proc, "#", "R")
+        yield add(proc, "#", proc, "#", "R")
 
-    machine = {
-        "Q": states,
-        "Sigma": SIGMA_BASE,
-        "Gamma": GAMMA_BASE,
-        "blank": "_",
-        "q0": "q0",
-        "F": ["qAccept"],
-        "num_tapes": 1,
-        "max_steps": 500000,
-        "transitions": transitions,
-    }
+
+def build_machine(encode: bool, alphabet=None) -> dict:
+    machine = machine_header(encode, alphabet)
+    machine["transitions"] = list(iter_transitions(encode, alphabet))
     return machine
 
-def main():
+
+def check_alphabet(alphabet) -> None:
+    reserved = set(" #._0123456789")
+    if len(alphabet) != len(set(alphabet)):
+        raise ValueError("El alfabeto tiene letras repetidas")
+    if not 1 <= len(alphabet) <= 99:
+        raise ValueError("El alfabeto debe tener entre 1 y 99 letras (llaves de hasta 2 dígitos)")
+    bad = [c for c in alphabet if len(c) != 1 or c in reserved]
+    if bad:
+        raise ValueError(f"Símbolos no permitidos en el alfabeto: {bad}")
+
+
+def write_json(path: Path, encode: bool, alphabet=None, fmt: str = "pretty",
+               compress: bool = False) -> None:
+    """
+    Escribe la MT en JSON.
+
+    - pretty: indent=2 (el formato de siempre).
+    - lines:  una transición por línea.
+    - min:    sin espacios ni saltos de línea.
+
+    lines y min se escriben a medida que se generan las transiciones, sin
+    armar la lista completa. Con compress=True el archivo va en gzip.
+    """
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        if fmt == "pretty":
+            f.write(json.dumps(build_machine(encode, alphabet), ensure_ascii=False, indent=2))
+            return
+        sep = (",", ":") if fmt == "min" else (", ", ": ")
+        nl = "" if fmt == "min" else "\n"
+        header = machine_header(encode, alphabet)
+        f.write("{")
+        for name, value in header.items():
+            f.write(json.dumps(name) + sep[1] + json.dumps(value, ensure_ascii=False, separators=sep) + sep[0])
+        f.write('"transitions"' + sep[1] + "[" + nl)
+        for i, t in enumerate(iter_transitions(encode, alphabet)):
+            if i:
+                f.write("," + nl)
+            f.write(json.dumps(t, ensure_ascii=False, separators=(",", ":")))
+        f.write(nl + "]}" + nl)
+
+
+def write_tmc(path: Path, encode: bool, alphabet=None, source=None) -> None:
+    """
+    Escribe directo el formato binario compilado (.tmc), sin pasar por JSON.
+
+    source es el source_stamp del JSON equivalente ya escrito: con él la
+    caché de maquina/cache.py usa este .tmc en vez de reparsear el JSON.
+    """
+    from maquina.turing import TMConfig
+    from maquina.binary import dumps_binary
+
+    header = machine_header(encode, alphabet)
+    transitions = {
+        (q, tuple(r)): (q2, tuple(w), tuple(m))
+        for q, r, q2, w, m in iter_transitions(encode, alphabet)
+    }
+    config = TMConfig(
+        states=header["Q"],
+        input_alphabet=header["Sigma"],
+        tape_alphabet=header["Gamma"],
+        blank=header["blank"],
+        initial_state=header["q0"],
+        accept_states=header["F"],
+        transitions=transitions,
+        num_tapes=header["num_tapes"],
+        max_steps=header["max_steps"],
+    )
+    path.write_bytes(dumps_binary(config, source=source))
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera las MT de cifrado César")
+    parser.add_argument("--format", choices=["pretty", "lines", "min"], default="pretty",
+                        help="pretty (indent=2), lines (una transición por línea) o min")
+    parser.add_argument("--gzip", action="store_true", help="Escribir .json.gz")
+    parser.add_argument("--tmc", action="store_true",
+                        help="Escribir también el binario compilado (.tmc)")
+    parser.add_argument("--alphabet", default=None,
+                        help="Letras a desplazar (por defecto A..Z)")
+    parser.add_argument("--out-dir", default=None, help="Directorio de salida (por defecto ejemplos/)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     root = Path(__file__).parent
-    ejemplos = root / "ejemplos"
+    ejemplos = Path(args.out_dir) if args.out_dir else root / "ejemplos"
     ejemplos.mkdir(exist_ok=True)
-    enc = build_machine(encode=True)
-    dec = build_machine(encode=False)
-    (ejemplos / "mt_encoder.json").write_text(json.dumps(enc, ensure_ascii=False, indent=2), encoding="utf-8")
-    (ejemplos / "mt_decoder.json").write_text(json.dumps(dec, ensure_ascii=False, indent=2), encoding="utf-8")
+    alphabet = list(args.alphabet) if args.alphabet else None
+    if alphabet:
+        check_alphabet(alphabet)
+
+    suffix = ".json.gz" if args.gzip else ".json"
+    written = []
+    for name, encode in (("mt_encoder", True), ("mt_decoder", False)):
+        out = ejemplos / f"{name}{suffix}"
+        write_json(out, encode, alphabet, args.format, args.gzip)
+        written.append(out)
+        if args.tmc:
+            from maquina.binary import source_stamp
+            from maquina.cache import precompiled_path
+
+            # Donde lo busca la caché (mt_encoder.json -> mt_encoder.tmc)
+            tmc = precompiled_path(out)
+            write_tmc(tmc, encode, alphabet, source=source_stamp(out))
+            written.append(tmc)
     print("Máquinas generadas:")
-    print(" - ejemplos/mt_encoder.json")
-    print(" - ejemplos/mt_decoder.json")
+    for out in written:
+        try:
+            shown = out.relative_to(root)
+        except ValueError:
+            shown = out
+        print(f" - {shown.as_posix()}")
 
 if __name__ == "__main__":
     main()
@@ -4,11 +4,226 @@ GUI para el Proyecto 3 - Teoría de la Computación
 Simulador de Máquinas de Turing para Cifrado César
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+from tkinter import font as tkfont
 from pathlib import Path
-from maquina.encoder_mt import encrypt
-from maquina.decoder_mt import decrypt
+
+# Las MTs se importan y cargan al primer encriptar/decriptar (arranque rápido)
+
+# Cada cuántos ms se revisa el progreso del hilo de simulación
+POLL_MS = 50
+
+
+class TraceViewer:
+    """
+    Ventana de trazado virtualizada.
+
+    Solo se dibujan los pasos que caben en la ventana: cada vez que cambia
+    la vista se piden al DeltaTrace las entradas visibles (trace.entries),
+    con la cinta recortada alrededor de la cabeza. La barra de scroll se
+    maneja a mano sobre el número de pasos, no sobre el texto.
+    """
+
+    LINES_PER_STEP = 2   # format_entry ocupa dos líneas
+    TAPE_RADIUS = 40     # celdas de cinta a cada lado de la cabeza
+
+    def __init__(self, root, trace, title="Trazado MT"):
+        self.trace = trace
+        self.top_step = 0     # primer paso visible
+        self.current = 0      # paso seleccionado
+        self.rows = 1         # pasos que caben en la ventana
+        self.play_job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("800x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Ir al paso / buscar estado
+        search_frame = ttk.Frame(self.window, padding=(10, 10, 10, 0))
+        search_frame.pack(fill='x')
+
+        ttk.Label(search_frame, text="Ir al paso:", background='#f0f0f0').pack(side='left')
+        self.step_entry = ttk.Entry(search_frame, width=10)
+        self.step_entry.pack(side='left', padx=5)
+        self.step_entry.bind('<Return>', lambda e: self.jump_to_step())
+        ttk.Button(search_frame, text="Ir", command=self.jump_to_step).pack(side='left')
+
+        ttk.Label(search_frame, text="Estado:", background='#f0f0f0').pack(side='left', padx=(20, 0))
+        self.state_entry = ttk.Combobox(search_frame, values=trace.states, width=14)
+        self.state_entry.pack(side='left', padx=5)
+        self.state_entry.bind('<Return>', lambda e: self.search_state())
+        ttk.Button(search_frame, text="◀ Anterior",
+                   command=lambda: self.search_state(backward=True)).pack(side='left')
+        ttk.Button(search_frame, text="Siguiente ▶",
+                   command=self.search_state).pack(side='left', padx=5)
+
+        # Reproducción paso a paso
+        play_frame = ttk.Frame(self.window, padding=(10, 5))
+        play_frame.pack(fill='x')
+
+        ttk.Button(play_frame, text="⏮", width=3,
+                   command=lambda: self.select(0)).pack(side='left')
+        ttk.Button(play_frame, text="◀", width=3,
+                   command=lambda: self.select(self.current - 1)).pack(side='left', padx=2)
+        self.play_btn = ttk.Button(play_frame, text="Reproducir", command=self.toggle_play)
+        self.play_btn.pack(side='left', padx=2)
+        ttk.Button(play_frame, text="▶", width=3,
+                   command=lambda: self.select(self.current + 1)).pack(side='left', padx=2)
+        ttk.Button(play_frame, text="⏭", width=3,
+                   command=lambda: self.select(len(self.trace) - 1)).pack(side='left')
+
+        ttk.Label(play_frame, text="Pasos/s:", background='#f0f0f0').pack(side='left', padx=(20, 5))
+        self.speed = tk.IntVar(value=10)
+        ttk.Spinbox(play_frame, from_=1, to=10_000, increment=10, width=7,
+                    textvariable=self.speed).pack(side='left')
+
+        # Pasos visibles
+        body = ttk.Frame(self.window, padding=(10, 0))
+        body.pack(fill='both', expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient='vertical', command=self.on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text = tk.Text(body, wrap=tk.NONE, font=('Consolas', 10),
+                            relief='solid', borderwidth=1, cursor='arrow')
+        self.text.pack(side='left', fill='both', expand=True)
+        self.text.tag_configure('current', background='#bbdefb')
+        self.line_height = tkfont.Font(font=self.text['font']).metrics('linespace')
+
+        self.status = ttk.Label(self.window, text="", padding=(10, 5), background='#f0f0f0')
+        self.status.pack(fill='x')
+
+        self.text.bind('<Configure>', self.on_resize)
+        self.text.bind('<Button-1>', self.on_click)
+        for widget in (self.text, self.scrollbar):
+            widget.bind('<MouseWheel>', lambda e: self.scroll_by(-e.delta // 120 * 3))
+            widget.bind('<Button-4>', lambda e: self.scroll_by(-3))
+            widget.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.text.bind('<Up>', lambda e: self.select(self.current - 1))
+        self.text.bind('<Down>', lambda e: self.select(self.current + 1))
+        self.text.bind('<Prior>', lambda e: self.select(self.current - self.rows))
+        self.text.bind('<Next>', lambda e: self.select(self.current + self.rows))
+        self.text.bind('<Home>', lambda e: self.select(0))
+        self.text.bind('<End>', lambda e: self.select(len(self.trace) - 1))
+        self.text.focus_set()
+
+        self.render()
+
+    # ----------------- vista ----------------- #
+
+    def render(self):
+        """Dibuja los pasos top_step .. top_step + rows - 1"""
+        n = len(self.trace)
+        self.top_step = max(0, min(self.top_step, n - self.rows))
+        stop = min(n, self.top_step + self.rows)
+        entries = self.trace.entries(self.top_step, stop, radius=self.TAPE_RADIUS)
+        lines = [self.trace.format_entry(entry) for entry in entries]
+
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', "".join(lines))
+        if self.top_step <= self.current < stop:
+            line = (self.current - self.top_step) * self.LINES_PER_STEP + 1
+            self.text.tag_add('current', f"{line}.0", f"{line + self.LINES_PER_STEP}.0")
+        self.text.config(state='disabled')
+
+        self.scrollbar.set(self.top_step / n, stop / n)
+        self.status.config(
+            text=f"Paso {self.current:,} de {n - 1:,}   |   "
+                 f"Estado: {self.trace.state_at(self.current)}   |   "
+                 f"Cabeza: {self.trace.head_at(self.current)}"
+        )
+
+    def on_resize(self, event):
+        rows = max(1, event.height // (self.line_height * self.LINES_PER_STEP))
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def on_scroll(self, *args):
+        """Comando de la barra de scroll ('moveto' o 'scroll')"""
+        if args[0] == 'moveto':
+            self.top_step = int(float(args[1]) * len(self.trace))
+            self.render()
+        elif args[0] == 'scroll':
+            count = int(args[1])
+            self.scroll_by(count * self.rows if args[2] == 'pages' else count)
+
+    def scroll_by(self, steps):
+        self.top_step += steps
+        self.render()
+        return 'break'
+
+    def on_click(self, event):
+        line = int(self.text.index(f"@{event.x},{event.y}").split('.')[0])
+        self.select(self.top_step + (line - 1) // self.LINES_PER_STEP)
+        self.text.focus_set()
+        return 'break'
+
+    def select(self, step):
+        """Selecciona un paso y lo trae a la vista si no está visible"""
+        self.current = max(0, min(step, len(self.trace) - 1))
+        if not self.top_step <= self.current < self.top_step + self.rows:
+            self.top_step = self.current - self.rows // 2
+        self.render()
+        return 'break'
+
+    # ----------------- navegación ----------------- #
+
+    def jump_to_step(self):
+        try:
+            step = int(self.step_entry.get().replace(',', '').strip())
+        except ValueError:
+            self.window.bell()
+            return
+        self.select(step)
+
+    def search_state(self, backward=False):
+        """Siguiente (o anterior) paso cuyo estado contiene el texto buscado"""
+        pattern = self.state_entry.get().strip()
+        if not pattern:
+            return
+        start = self.current - 1 if backward else self.current + 1
+        step = self.trace.find_state(pattern, start, backward=backward)
+        if step is None:
+            self.window.bell()
+            self.status.config(text=f"No hay más pasos con estado '{pattern}'")
+            return
+        self.select(step)
+
+    def toggle_play(self):
+        if self.play_job is None:
+            if self.current >= len(self.trace) - 1:
+                self.select(0)
+            self.play_btn.config(text="Pausa")
+            self.play_tick()
+        else:
+            self.stop_play()
+
+    def play_tick(self):
+        """Avanza la reproducción; a más de 50 pasos/s avanza varios por cuadro"""
+        try:
+            speed = max(1, self.speed.get())
+        except tk.TclError:
+            speed = 1
+        delay = max(20, 1000 // speed)
+        self.select(self.current + max(1, speed * delay // 1000))
+        if self.current >= len(self.trace) - 1:
+            self.stop_play()
+            return
+        self.play_job = self.window.after(delay, self.play_tick)
+
+    def stop_play(self):
+        if self.play_job is not None:
+            self.window.after_cancel(self.play_job)
+            self.play_job = None
+        self.play_btn.config(text="Reproducir")
+
+    def close(self):
+        self.stop_play()
+        self.window.destroy()
 
 
 class CaesarCipherGUI:
@@ -19,6 +234,12 @@ class CaesarCipherGUI:
         self.root.title("Cifrado César - Máquinas de Turing")
         self.root.geometry("900x700")
         self.root.resizable(True, True)
+
+        # Simulación en segundo plano (ver run_simulation)
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.progress_steps = (0, 0)
         
         # Configurar estilo
         self.setup_styles()
@@ -90,6 +311,9 @@ class CaesarCipherGUI:
         self.create_decoder_tab()
         self.create_examples_tab()
         self.create_info_tab()
+
+        # Progreso de la simulación en curso
+        self.create_progress_bar()
         
         # Footer
         footer_frame = ttk.Frame(self.root)
@@ -102,6 +326,31 @@ class CaesarCipherGUI:
         )
         footer_label.pack()
     
+    def create_progress_bar(self):
+        """Crea la barra de progreso (pasos / max_steps) y el botón Cancelar"""
+        progress_frame = ttk.Frame(self.root)
+        progress_frame.pack(fill='x', padx=20)
+
+        self.progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=1)
+        self.progress.pack(side='left', fill='x', expand=True, padx=(0, 10))
+
+        self.progress_label = ttk.Label(
+            progress_frame,
+            text="Listo",
+            font=('Arial', 9),
+            width=30,
+            background='#f0f0f0'
+        )
+        self.progress_label.pack(side='left')
+
+        self.cancel_btn = ttk.Button(
+            progress_frame,
+            text="Cancelar",
+            command=self.cancel_simulation
+        )
+        self.cancel_btn.pack(side='left', padx=(10, 0))
+        self.cancel_btn.config(state='disabled')
+    
     def create_encoder_tab(self):
         """Crea la pestaña de encriptación"""
         encoder_frame = ttk.Frame(self.notebook, style='TFrame')
@@ -143,13 +392,13 @@ class CaesarCipherGUI:
         btn_frame = ttk.Frame(card)
         btn_frame.pack(pady=10)
         
-        encrypt_btn = ttk.Button(
+        self.encrypt_btn = ttk.Button(
             btn_frame,
             text="Encriptar",
             command=self.encrypt_message,
             style='TButton'
         )
-        encrypt_btn.pack(side='left', padx=5)
+        self.encrypt_btn.pack(side='left', padx=5)
         
         clear_btn = ttk.Button(
             btn_frame,
@@ -231,13 +480,13 @@ class CaesarCipherGUI:
         btn_frame = ttk.Frame(card)
         btn_frame.pack(pady=10)
         
-        decrypt_btn = ttk.Button(
+        self.decrypt_btn = ttk.Button(
             btn_frame,
             text="Decriptar",
             command=self.decrypt_message,
             style='TButton'
         )
-        decrypt_btn.pack(side='left', padx=5)
+        self.decrypt_btn.pack(side='left', padx=5)
         
         clear_btn = ttk.Button(
             btn_frame,
@@ -448,83 +697,149 @@ Desarrollado con Python y Tkinter • 2025
     
     def encrypt_message(self):
         """Encripta el mensaje usando la MT"""
-        input_text = self.encoder_input.get('1.0', 'end-1c').strip()
-        
-        if not input_text:
-            messagebox.showwarning("Advertencia", "Por favor, ingresa un texto a encriptar.")
-            return
-        
-        try:
-            # Mostrar mensaje de procesamiento
-            self.root.config(cursor="wait")
-            self.root.update()
-            
-            # Encriptar usando la MT
-            from maquina.encoder_mt import encrypt_with_trace
-            result, trace = encrypt_with_trace(input_text)
-            
-            # Mostrar resultado
-            self.encoder_output.config(state='normal')
-            self.encoder_output.delete('1.0', 'end')
-            self.encoder_output.insert('1.0', result)
-            self.encoder_output.config(state='disabled')
-            self.encoder_trace = trace
-            self.trace_btn_enc.config(state='normal')
-            
-            # Guardar en archivo
-            self.save_output(result, 'encoder_output.txt')
-            
-            messagebox.showinfo(
-                "Éxito",
-                "Mensaje encriptado correctamente.\n"
-                f"Resultado guardado en: output/encoder_output.txt"
-            )
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al encriptar:\n{str(e)}")
-        
-        finally:
-            self.root.config(cursor="")
+        self.run_simulation('encoder')
     
     def decrypt_message(self):
         """Decripta el mensaje usando la MT"""
-        input_text = self.decoder_input.get('1.0', 'end-1c').strip()
+        self.run_simulation('decoder')
+
+    def _mode(self, mode):
+        """Widgets y textos de la pestaña 'encoder' o 'decoder'"""
+        if mode == 'encoder':
+            return {
+                'input': self.encoder_input,
+                'output': self.encoder_output,
+                'trace_btn': self.trace_btn_enc,
+                'trace_attr': 'encoder_trace',
+                'file': 'encoder_output.txt',
+                'verb': 'encriptar',
+                'done': 'encriptado',
+            }
+        return {
+            'input': self.decoder_input,
+            'output': self.decoder_output,
+            'trace_btn': self.trace_btn_dec,
+            'trace_attr': 'decoder_trace',
+            'file': 'decoder_output.txt',
+            'verb': 'decriptar',
+            'done': 'decriptado',
+        }
+
+    def run_simulation(self, mode):
+        """
+        Corre la MT en un hilo aparte para no congelar la ventana.
+
+        El hilo no toca widgets: deja el progreso en self.progress_steps y
+        el resultado en self.results; poll_simulation (con root.after) los
+        lleva a la interfaz. Cancelar pide al hilo que se detenga en el
+        próximo chequeo de trace_run.
+        """
+        if self.worker is not None:
+            return
+        ui = self._mode(mode)
+        input_text = ui['input'].get('1.0', 'end-1c').strip()
         
         if not input_text:
-            messagebox.showwarning("Advertencia", "Por favor, ingresa un texto a decriptar.")
+            messagebox.showwarning("Advertencia", f"Por favor, ingresa un texto a {ui['verb']}.")
             return
-        
+
+        cancel_event = threading.Event()
+        results = self.results
+        self.cancel_event = cancel_event
+        self.progress_steps = (0, 0)
+
+        def on_progress(steps, max_steps):
+            self.progress_steps = (steps, max_steps)
+
+        def work():
+            try:
+                if mode == 'encoder':
+                    from maquina.encoder_mt import encrypt_with_trace as run
+                else:
+                    from maquina.decoder_mt import decrypt_with_trace as run
+                # max_steps=None: el límite del JSON de la MT
+                outcome = run(input_text, max_steps=None,
+                              should_stop=cancel_event.is_set,
+                              on_progress=on_progress)
+                results.put((mode, outcome, None))
+            except Exception as e:
+                results.put((mode, None, e))
+
+        self.encrypt_btn.config(state='disabled')
+        self.decrypt_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
+        self.progress.config(value=0)
+        self.progress_label.config(text="Iniciando...")
+        self.root.config(cursor="watch")
+
+        self.worker = threading.Thread(target=work, daemon=True)
+        self.worker.start()
+        self.root.after(POLL_MS, self.poll_simulation)
+
+    def cancel_simulation(self):
+        """Pide al hilo de simulación que se detenga"""
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.cancel_btn.config(state='disabled')
+            self.progress_label.config(text="Cancelando...")
+
+    def poll_simulation(self):
+        """Actualiza la barra de progreso y recoge el resultado del hilo"""
         try:
-            # Mostrar mensaje de procesamiento
-            self.root.config(cursor="wait")
-            self.root.update()
-            
-            # Decriptar usando la MT
-            from maquina.decoder_mt import decrypt_with_trace
-            result, trace = decrypt_with_trace(input_text)
-            
-            # Mostrar resultado
-            self.decoder_output.config(state='normal')
-            self.decoder_output.delete('1.0', 'end')
-            self.decoder_output.insert('1.0', result)
-            self.decoder_output.config(state='disabled')
-            self.decoder_trace = trace
-            self.trace_btn_dec.config(state='normal')
-            
-            # Guardar en archivo
-            self.save_output(result, 'decoder_output.txt')
+            mode, outcome, error = self.results.get_nowait()
+        except queue.Empty:
+            steps, max_steps = self.progress_steps
+            if max_steps and not self.cancel_event.is_set():
+                self.progress.config(value=steps / max_steps)
+                self.progress_label.config(text=f"Paso {steps:,} / {max_steps:,}")
+            self.root.after(POLL_MS, self.poll_simulation)
+            return
+
+        self.worker = None
+        self.encrypt_btn.config(state='normal')
+        self.decrypt_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        self.root.config(cursor="")
+        self.finish_simulation(mode, outcome, error)
+
+    def finish_simulation(self, mode, outcome, error):
+        """Muestra el resultado (o el error/cancelación) de una simulación"""
+        ui = self._mode(mode)
+        if error is not None:
+            self.progress_label.config(text="Error")
+            messagebox.showerror("Error", f"Error al {ui['verb']}:\n{str(error)}")
+            return
+
+        result, trace = outcome
+        # El trazado (aunque sea parcial) queda disponible para inspección
+        setattr(self, ui['trace_attr'], trace)
+        ui['trace_btn'].config(state='normal')
+        steps = len(trace) - 1  # la entrada 0 es la configuración inicial
+
+        # Solo se descarta si la corrida de verdad se cortó: un Cancelar que
+        # llega cuando el hilo ya terminó no invalida el resultado
+        from maquina.turing import HALT_CANCELLED
+        if trace.halt_reason == HALT_CANCELLED:
+            self.progress_label.config(text=f"Cancelado en el paso {steps:,}")
+            return
+
+        self.progress.config(value=self.progress['maximum'])
+        self.progress_label.config(text=f"Listo ({steps:,} pasos)")
+
+        # Mostrar resultado
+        ui['output'].config(state='normal')
+        ui['output'].delete('1.0', 'end')
+        ui['output'].insert('1.0', result)
+        ui['output'].config(state='disabled')
             
-            messagebox.showinfo(
-                "Éxito",
-                "Mensaje decriptado correctamente.\n"
-                f"Resultado guardado en: output/decoder_output.txt"
-            )
+        # Guardar en archivo
+        self.save_output(result, ui['file'])
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al decriptar:\n{str(e)}")
-        
-        finally:
-            self.root.config(cursor="")
+        messagebox.showinfo(
+            "Éxito",
+            f"Mensaje {ui['done']} correctamente.\n"
+            f"Resultado guardado en: output/{ui['file']}"
+        )
     
     def save_output(self, text, filename):
         """Guarda el resultado en un archivo"""
@@ -575,16 +890,8 @@ Desarrollado con Python y Tkinter • 2025
         if not trace:
             messagebox.showwarning("Sin trazado", "No hay trazado disponible.")
             return
-        top = tk.Toplevel(self.root)
-        top.title(title)
-        top.geometry("700x500")
-        text = scrolledtext.ScrolledText(top, wrap=tk.NONE, font=('Consolas', 10))
-        text.pack(fill='both', expand=True)
-        lines = []
-        for entry in trace:
-            lines.append(f"Paso {entry['step']:>4} | Estado: {entry['state']:<10} | Cabeza: {entry['head']:>3}\n  Cinta: {entry['tape']}\n")
-        text.insert('1.0', "".join(lines))
-        text.config(state='disabled')
+        # El trazado es un DeltaTrace: el visor pide solo los pasos visibles
+        TraceViewer(self.root, trace, title=title)
     
     def load_default_examples(self):
         """Carga los ejemplos por defecto desde los archivos"""
@@ -2,5 +2,6 @@
 
 from .turing import TuringMachine
 from .parser import load_mt_from_json
+from .compiled import CompiledTuringMachine, compile_machine
 
-__all__ = ["TuringMachine", "load_mt_from_json"]
+__all__ = ["TuringMachine", "CompiledTuringMachine", "compile_machine", "load_mt_from_json"]
@@ -0,0 +1,81 @@
+# maquina/batch.py
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from .cache import get_default_cache
+
+
+@dataclass
+class BatchResult:
+    """
+    Resultado de un mensaje dentro de un lote.
+
+    - output: salida sin la llave (None si hubo una excepción).
+    - accepted: True si la MT terminó en un estado de aceptación.
+    - error: descripción del problema, o None si todo salió bien.
+    - halt_reason: motivo de detención de la MT (HALT_* de turing.py);
+      "step-limit", "timeout" o "memory-limit" indican salida incompleta y
+      "cycle" que la MT entró en un ciclo (con detect_cycles).
+    """
+    index: int
+    input: str
+    output: Optional[str]
+    accepted: bool
+    steps: int
+    error: Optional[str] = None
+    halt_reason: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def strip_key(raw: str) -> str:
+    """Quita el prefijo "k#" si la llave permanece en la cinta."""
+    if '#' in raw:
+        parts = raw.split('#', 1)
+        if len(parts) == 2:
+            return parts[1]
+    return raw
+
+
+def run_many(
+    mt_path: Union[str, Path],
+    input_words: Iterable[str],
+    compiled: bool = True,
+    detect_cycles: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Corre la MT de mt_path sobre cada entrada, en orden.
+
+    La MT se carga una sola vez y se reutiliza la misma máquina (reset()
+    por mensaje). Un mensaje inválido o rechazado no detiene el lote: su
+    BatchResult trae el error y se sigue con el siguiente.
+
+    Con detect_cycles=True una MT que entra en un ciclo se corta con
+    halt_reason "cycle" en vez de gastar todo max_steps.
+    """
+    with get_default_cache().machine(mt_path, compiled=compiled) as tm:
+        for index, word in enumerate(input_words):
+            yield run_one(tm, index, word, detect_cycles)
+
+
+def run_one(tm, index: int, word: str, detect_cycles: bool = False) -> BatchResult:
+    """Corre una entrada en una máquina ya cargada y arma su BatchResult."""
+    if not isinstance(word, str):
+        return BatchResult(index, word, None, False, 0,
+                           f"Entrada inválida (se esperaba str): {word!r}")
+    try:
+        tm.reset([word])
+        tm.run(verbose=False, detect_cycles=detect_cycles)
+        output = strip_key(tm.get_tape(tape_index=0, strip_blanks=True))
+    except Exception as e:  # un mensaje no debe abortar el lote
+        return BatchResult(index, word, None, False, tm.steps,
+                           f"{type(e).__name__}: {e}")
+    error = None
+    if not tm.accepted:
+        error = (f"La MT no aceptó la entrada (estado final {tm.current_state}, "
+                 f"motivo {tm.halt_reason})")
+    return BatchResult(index, word, output, tm.accepted, tm.steps, error, tm.halt_reason)
@@ -0,0 +1,240 @@
+# maquina/binary.py
+
+"""
+Formato binario de MT compilada (.tmc), little-endian:
+
+    cabecera (HEADER):
+        magic      4s   b"TMCB"
+        version    H
+        reserved   H
+        num_tapes  I
+        num_states I
+        num_symbols I
+        blank      I
+        initial    I
+        max_steps  Q
+        table_size I    (estados * |Γ|^k)
+        meta_len   I    (bytes del bloque de metadatos)
+        crc32      I    (de todo lo que sigue a la cabecera)
+    metadatos: JSON UTF-8 con nombres internados y Q/Sigma/Gamma/F
+               (y "source": [mtime_ns, tamaño] del JSON del que salió, ver
+               source_stamp; cache.py solo usa un .tmc cuyo source
+               coincide con el JSON actual)
+    accept:    num_states bytes
+    next_state table_size * int32
+    writes     table_size * k * int32
+    moves      table_size * k * int8
+
+Cada sección empieza alineada a 8 bytes para poder leer los arrays
+directamente desde un mmap.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .turing import TMConfig
+from .parser import load_mt_from_json
+from .compiled import (
+    CompiledMachine,
+    compile_machine,
+    decompile_transitions,
+)
+
+
+MAGIC = b"TMCB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIQIII")
+SUFFIX = ".tmc"
+
+
+class BinaryFormatError(ValueError):
+    """El archivo no es una MT compilada válida para esta versión."""
+
+
+@dataclass
+class BinaryMachine:
+    """MT leída de un .tmc: tablas compiladas + metadatos del JSON original."""
+    machine: CompiledMachine
+    meta: dict
+
+    def to_config(self) -> TMConfig:
+        """Reconstruye el TMConfig (las transiciones salen de la tabla)."""
+        m = self.machine
+        return TMConfig(
+            states=list(self.meta["Q"]),
+            input_alphabet=list(self.meta["Sigma"]),
+            tape_alphabet=list(self.meta["Gamma"]),
+            blank=self.meta["blank"],
+            initial_state=self.meta["q0"],
+            accept_states=list(self.meta["F"]),
+            transitions=decompile_transitions(m),
+            num_tapes=m.num_tapes,
+            max_steps=m.max_steps,
+        )
+
+
+def _pad(n: int) -> int:
+    return (8 - n % 8) % 8
+
+
+def dumps_binary(config: TMConfig, machine: Optional[CompiledMachine] = None,
+                 source: Optional[list] = None) -> bytes:
+    """
+    Serializa una MT (y su forma compilada) al formato .tmc.
+
+    source, si se da, queda en los metadatos para saber de qué versión del
+    JSON salió el archivo (la caché guarda [mtime_ns, tamaño]).
+    """
+    if machine is None:
+        machine = compile_machine(config)
+    meta = {
+        "states": machine.states,
+        "symbols": machine.symbols,
+        "Q": config.states,
+        "Sigma": config.input_alphabet,
+        "Gamma": config.tape_alphabet,
+        "blank": config.blank,
+        "q0": config.initial_state,
+        "F": config.accept_states,
+    }
+    if source is not None:
+        meta["source"] = source
+    meta = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+    def le(arr: array) -> bytes:
+        arr = array(arr.typecode, arr)
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tobytes()
+
+    sections = [meta, bytes(machine.accept), le(machine.next_state),
+                le(array("i", machine.writes)), le(array("b", machine.moves))]
+    payload = bytearray(_pad(HEADER.size))
+    for data in sections:
+        payload += data
+        payload += bytes(_pad(HEADER.size + len(payload)))
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0,
+        machine.num_tapes, len(machine.states), len(machine.symbols),
+        machine.blank, machine.initial_state, machine.max_steps,
+        len(machine.next_state), len(meta),
+        zlib.crc32(payload),
+    )
+    return header + bytes(payload)
+
+
+def source_stamp(json_path: Union[str, Path]) -> List[int]:
+    """[mtime_ns, tamaño] del JSON: con esto se sabe si un .tmc está al día."""
+    st = Path(json_path).stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def compile_file(json_path: Union[str, Path], out_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Compila un JSON de MT al formato binario.
+
+    Por defecto escribe junto al JSON con extensión .tmc, que es donde lo
+    busca la caché de cache.py. El .tmc lleva el source_stamp del JSON.
+    """
+    json_path = Path(json_path)
+    out = Path(out_path) if out_path is not None else json_path.with_suffix(SUFFIX)
+    # El stamp se toma antes de leer: si el JSON cambia entremedio, el
+    # .tmc queda marcado como viejo en vez de como actual
+    source = source_stamp(json_path)
+    config = load_mt_from_json(str(json_path))
+    out.write_bytes(dumps_binary(config, source=source))
+    return out
+
+
+def _view(buf, offset: int, count: int, typecode: str, itemsize: int):
+    data = memoryview(buf)[offset:offset + count * itemsize]
+    if sys.byteorder == "little":
+        return data.cast(typecode)
+    arr = array(typecode, data.tobytes())
+    arr.byteswap()
+    return arr
+
+
+def loads_binary(buf, verify: bool = True) -> BinaryMachine:
+    """
+    Lee una MT compilada desde un buffer (bytes, mmap...).
+
+    Los arrays de la tabla son vistas sobre el buffer: no se copian.
+    """
+    if len(buf) < HEADER.size:
+        raise BinaryFormatError("Archivo demasiado corto para ser una MT compilada")
+    (magic, version, _reserved, num_tapes, num_states, num_symbols, blank,
+     initial, max_steps, table_size, meta_len, crc) = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise BinaryFormatError(f"Firma inválida: {magic!r}")
+    if version != VERSION:
+        raise BinaryFormatError(f"Versión no soportada: {version} (se esperaba {VERSION})")
+    if verify and zlib.crc32(memoryview(buf)[HEADER.size:]) != crc:
+        raise BinaryFormatError("Checksum inválido: el archivo está dañado")
+
+    offset = HEADER.size + _pad(HEADER.size)
+    meta = json.loads(bytes(buf[offset:offset + meta_len]).decode("utf-8"))
+    offset += meta_len + _pad(meta_len)
+    accept = bytes(buf[offset:offset + num_states])
+    offset += num_states + _pad(offset + num_states)
+    next_state = _view(buf, offset, table_size, "i", 4)
+    offset += table_size * 4 + _pad(offset + table_size * 4)
+    writes = _view(buf, offset, table_size * num_tapes, "i", 4)
+    offset += table_size * num_tapes * 4 + _pad(offset + table_size * num_tapes * 4)
+    moves = _view(buf, offset, table_size * num_tapes, "b", 1)
+
+    if len(meta["states"]) != num_states or len(meta["symbols"]) != num_symbols:
+        raise BinaryFormatError("Metadatos inconsistentes con la cabecera")
+
+    machine = CompiledMachine(
+        states=meta["states"],
+        symbols=meta["symbols"],
+        num_tapes=num_tapes,
+        blank=blank,
+        initial_state=initial,
+        accept=accept,
+        next_state=next_state,
+        writes=writes,
+        moves=moves,
+        max_steps=max_steps,
+    )
+    return BinaryMachine(machine, meta)
+
+
+def load_binary(path: Union[str, Path], use_mmap: bool = True, verify: bool = True) -> BinaryMachine:
+    """
+    Carga un archivo .tmc.
+
+    Con use_mmap=True el archivo se mapea en memoria y las tablas se leen
+    directamente del mapa (sin parsear ni copiar).
+    """
+    with open(path, "rb") as f:
+        if use_mmap:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = f.read()
+    return loads_binary(buf, verify=verify)
+
+
+def main(argv=None) -> None:
+    """python -m maquina.binary ejemplos/mt_encoder.json [...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compila MTs JSON al formato binario .tmc")
+    parser.add_argument("json", nargs="+", help="Archivos JSON de MT")
+    args = parser.parse_args(argv)
+    for path in args.json:
+        out = compile_file(path)
+        print(f"{path} -> {out} ({out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# maquina/cache.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .turing import TMConfig, TuringMachine
+from .parser import load_mt_from_json
+from .compiled import CompiledMachine, CompiledTuringMachine, compile_machine, machine_fingerprint
+from .binary import BinaryFormatError, BinaryMachine, SUFFIX, dumps_binary, load_binary
+
+
+# (ruta resuelta, mtime en ns, tamaño en bytes)
+CacheKey = Tuple[str, int, int]
+
+Machine = Union[TuringMachine, CompiledTuringMachine]
+
+
+@dataclass
+class _CacheEntry:
+    config: Optional[TMConfig] = None
+    compiled: Optional[CompiledMachine] = None
+    idle: List[Machine] = field(default_factory=list)
+    # .tmc del que salió la entrada; el TMConfig se reconstruye solo si se pide
+    binary: Optional[BinaryMachine] = None
+    fingerprint: Optional[str] = None
+
+    def get_config(self) -> TMConfig:
+        if self.config is None:
+            self.config = self.binary.to_config()
+        return self.config
+
+    def get_compiled(self) -> CompiledMachine:
+        if self.compiled is None:
+            self.compiled = compile_machine(self.config)
+        return self.compiled
+
+
+def precompiled_path(json_path: Union[str, Path]) -> Path:
+    """Ruta del .tmc que acompaña a un JSON (misma ruta, extensión .tmc)."""
+    return Path(json_path).with_suffix(SUFFIX)
+
+
+def _source_stamp(key: "CacheKey") -> List[int]:
+    """binary.source_stamp del JSON, a partir del stat que ya está en la clave."""
+    return [key[1], key[2]]
+
+
+def _load_precompiled(key: "CacheKey") -> Optional[_CacheEntry]:
+    """
+    Lee el .tmc junto al JSON si existe y corresponde a esta versión del
+    JSON (mismo source_stamp). Vale igual si lo escribió esta caché,
+    compile_file (python -m maquina.binary) o generate_machines.py --tmc.
+    """
+    try:
+        binary = load_binary(precompiled_path(key[0]), use_mmap=False)
+    except (OSError, BinaryFormatError, ValueError, KeyError):
+        return None
+    if binary.meta.get("source") != _source_stamp(key):
+        return None  # desactualizado: el JSON cambió después de compilar
+    return _CacheEntry(compiled=binary.machine, binary=binary)
+
+
+def _write_precompiled(key: "CacheKey", entry: _CacheEntry) -> None:
+    """Guarda el .tmc junto al JSON; si no se puede escribir, se ignora."""
+    out = precompiled_path(key[0])
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(dumps_binary(entry.config, entry.get_compiled(),
+                                     source=_source_stamp(key)))
+        os.replace(tmp, out)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+class MachineCache:
+    """
+    Caché LRU de MTs ya parseadas, compartida por todo el proceso.
+
+    - La clave es (ruta resuelta, mtime, tamaño): si el JSON cambia en
+      disco, la entrada vieja se descarta y se vuelve a parsear.
+    - Guarda el TMConfig, su forma compilada (al primer uso) y un pool de
+      máquinas libres que se reutilizan con reset() en cada mensaje.
+    - Los TMConfig devueltos son compartidos: no deben modificarse.
+    - Con disk_cache=True la forma compilada también se guarda en disco,
+      junto al JSON (mt_encoder.json -> mt_encoder.tmc). En un proceso
+      nuevo se lee el .tmc en vez de parsear y compilar el JSON; si el
+      JSON cambió (mtime o tamaño distintos a los registrados en el .tmc)
+      se vuelve a generar. El TMConfig solo se reconstruye si se pide.
+    """
+
+    def __init__(self, max_size: int = 8, max_idle: int = 4, disk_cache: bool = True):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.disk_cache = disk_cache
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.load_seconds = 0.0  # tiempo total leyendo JSON/.tmc (ver --profile-startup)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> CacheKey:
+        resolved = Path(path).resolve()
+        st = resolved.stat()
+        return (str(resolved), st.st_mtime_ns, st.st_size)
+
+    def _entry(self, path: Union[str, Path]) -> _CacheEntry:
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Cargar fuera del lock; si otro hilo ganó la carrera, se usa la suya.
+        loaded = self._load(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                for old in [k for k in self._entries if k[0] == key[0]]:
+                    del self._entries[old]
+                entry = loaded
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+            return entry
+
+    def _load(self, key: CacheKey) -> _CacheEntry:
+        """
+        Carga la entrada de key desde el .tmc o el JSON. Se llama sin el
+        lock (varios hilos a la vez): los contadores se actualizan con él.
+        """
+        start = time.perf_counter()
+        from_disk = False
+        try:
+            if self.disk_cache:
+                entry = _load_precompiled(key)
+                if entry is not None:
+                    from_disk = True
+                    return entry
+            entry = _CacheEntry(load_mt_from_json(key[0]))
+            if self.disk_cache:
+                _write_precompiled(key, entry)
+            return entry
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.load_seconds += elapsed
+                if from_disk:
+                    self.disk_hits += 1
+
+    def get_config(self, path: Union[str, Path]) -> TMConfig:
+        """Devuelve el TMConfig de la ruta, parseándolo solo si hace falta."""
+        return self._entry(path).get_config()
+
+    def get_fingerprint(self, path: Union[str, Path]) -> str:
+        """Fingerprint de la MT (ver compiled.machine_fingerprint)."""
+        entry = self._entry(path)
+        if entry.fingerprint is None:
+            entry.fingerprint = machine_fingerprint(entry.get_compiled())
+        return entry.fingerprint
+
+    def get_compiled(self, path: Union[str, Path]) -> CompiledMachine:
+        """Devuelve la forma compilada de la MT (se compila una sola vez)."""
+        return self._entry(path).get_compiled()
+
+    @contextmanager
+    def machine(self, path: Union[str, Path], compiled: bool = True) -> Iterator[Machine]:
+        """
+        Presta una máquina del pool de la ruta dada.
+
+        El llamador debe hacer reset() antes de usarla; al salir del bloque
+        la máquina vuelve al pool.
+        """
+        entry = self._entry(path)
+        cls = CompiledTuringMachine if compiled else TuringMachine
+        tm = None
+        with self._lock:
+            for i, candidate in enumerate(entry.idle):
+                if type(candidate) is cls:
+                    tm = entry.idle.pop(i)
+                    break
+        if tm is None:
+            if compiled:
+                tm = CompiledTuringMachine(entry.get_compiled(), config=entry.config)
+            else:
+                tm = TuringMachine(entry.get_config())
+        try:
+            yield tm
+        finally:
+            with self._lock:
+                if len(entry.idle) < self.max_idle:
+                    entry.idle.append(tm)
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Descarta la entrada de una ruta, o todas si path es None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            resolved = str(Path(path).resolve())
+            for old in [k for k in self._entries if k[0] == resolved]:
+                del self._entries[old]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache = MachineCache()
+
+
+def get_default_cache() -> MachineCache:
+    """Caché compartida por encrypt()/decrypt() y demás ayudantes."""
+    return _default_cache
+
+
+def load_mt_cached(path: Union[str, Path]) -> TMConfig:
+    """Como load_mt_from_json, pero reutilizando la caché del proceso."""
+    return _default_cache.get_config(path)
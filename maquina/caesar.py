@@ -0,0 +1,170 @@
+# maquina/caesar.py
+
+"""
+Capa de ejecución común de las MTs de César.
+
+Encriptar y decriptar solo difieren en el JSON de la MT: encoder_mt.py y
+decoder_mt.py resuelven su ruta por defecto y delegan aquí. Cada función
+recibe la ruta del JSON ya resuelta (ver machine_path).
+
+Los módulos pesados (caché, motores, lotes, trazado) se importan dentro de
+cada función para que importar encoder_mt/decoder_mt sea barato.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
+
+from .turing import HALT_ACCEPTED, IncompleteRunError, TuringMachine
+
+if TYPE_CHECKING:
+    # Solo para las anotaciones: el resto de maquina/ se importa al usarse
+    from .batch import BatchResult
+    from .compiled import CompiledTuringMachine
+    from .memo import ResultCache
+    from .trace import DeltaTrace
+
+
+def project_root() -> Path:
+    """
+    Devuelve la ruta raíz del proyecto asumiendo que este archivo está en:
+    .../Proyecto-3-Teoria-de-la-computacion/maquina/caesar.py
+    """
+    return Path(__file__).resolve().parent.parent
+
+
+def machine_path(default_name: str, json_path: Optional[str] = None) -> Path:
+    """Ruta del JSON de la MT: json_path o <raiz_proyecto>/ejemplos/<default_name>."""
+    if json_path is None:
+        return project_root() / "ejemplos" / default_name
+    return Path(json_path)
+
+
+def load_machine(
+    mt_path: Path, compiled: bool = False
+) -> Union[TuringMachine, "CompiledTuringMachine"]:
+    """
+    Carga la MT de mt_path.
+
+    El JSON se parsea una sola vez por proceso (ver maquina/cache.py) y
+    solo se vuelve a leer si cambia en disco.
+
+    Con compiled=True devuelve una CompiledTuringMachine (tabla entera
+    densa), con la misma interfaz y las mismas cintas que el intérprete.
+    """
+    from .cache import get_default_cache, load_mt_cached
+
+    config = load_mt_cached(mt_path)
+    if compiled:
+        from .compiled import CompiledTuringMachine
+        return CompiledTuringMachine(get_default_cache().get_compiled(mt_path), config=config)
+    return TuringMachine(config)
+
+
+def run(mt_path: Path, input_word: str, memo: Optional["ResultCache"] = None) -> str:
+    """
+    Corre la MT de mt_path sobre "k#MENSAJE" y devuelve la cinta sin
+    blancos externos ni la llave.
+
+    Si la MT no acepta (entrada inválida, max_steps agotado, ...) lanza
+    IncompleteRunError en vez de devolver una cinta a medias.
+    Reutiliza una máquina compilada del pool del proceso (solo reset()).
+
+    Con memo (un memo.ResultCache), las entradas ya vistas para esta misma
+    MT se responden desde la caché sin correr la máquina.
+    """
+    from .batch import strip_key
+    from .cache import get_default_cache
+
+    if memo is not None:
+        fingerprint = get_default_cache().get_fingerprint(mt_path)
+        output = memo.get(fingerprint, input_word)
+        if output is None:
+            output = run(mt_path, input_word)
+            memo.put(fingerprint, input_word, output)
+        return output
+
+    with get_default_cache().machine(mt_path) as tm:
+        tm.reset([input_word])
+        tm.run(verbose=False)
+        raw = tm.get_tape(tape_index=0, strip_blanks=True)
+        if tm.halt_reason != HALT_ACCEPTED:
+            raise IncompleteRunError(tm.halt_reason, tm.current_state, tm.steps, raw)
+    return strip_key(raw)
+
+
+def run_many(
+    mt_path: Path,
+    input_words: Iterable[str],
+    workers: Optional[int] = 1,
+    chunk_size: int = 256,
+    vectorized: bool = False,
+    detect_cycles: bool = False,
+) -> Iterator["BatchResult"]:
+    """
+    Corre muchos mensajes "k#MENSAJE" con una sola carga de la MT.
+
+    Produce un BatchResult por entrada, en el mismo orden; los mensajes
+    inválidos o rechazados se reportan en BatchResult.error sin abortar
+    el lote.
+
+    Con workers != 1 el lote se reparte en un pool de procesos (workers=None
+    usa todos los núcleos), en bloques de chunk_size mensajes.
+
+    Con vectorized=True el lote corre en el motor NumPy (ver
+    maquina/vectorized.py), miles de mensajes a la vez en un solo proceso.
+
+    Con detect_cycles=True una MT que entra en un ciclo se corta con
+    halt_reason "cycle" (en serie y en paralelo; no con vectorized).
+    """
+    if vectorized:
+        if detect_cycles:
+            raise ValueError("detect_cycles no está soportado con vectorized=True")
+        from .vectorized import run_many_vectorized
+        return run_many_vectorized(mt_path, input_words)
+    if workers == 1:
+        from .batch import run_many as run_serial
+        return run_serial(mt_path, input_words, detect_cycles=detect_cycles)
+    from .parallel import run_parallel  # multiprocessing solo si hace falta
+    return run_parallel(mt_path, input_words, workers, chunk_size, detect_cycles)
+
+
+def run_stream(
+    mt_path: Path,
+    chunks: Iterable[str],
+    max_steps: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Corre un solo mensaje "k#MENSAJE" que llega por bloques (chunks) y
+    produce la salida, sin la llave, a medida que queda fija en la cinta.
+
+    Usa la simulación en línea de maquina/online.py: memoria constante y
+    sin esperar al final de la entrada. max_steps=None no limita los pasos.
+    """
+    from .cache import load_mt_cached
+    from .online import run_online
+    return run_online(load_mt_cached(mt_path), chunks, max_steps)
+
+
+def run_with_trace(
+    mt_path: Path,
+    input_word: str,
+    max_steps: Optional[int] = 10_000,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> tuple[str, "DeltaTrace"]:
+    """Corre la MT y retorna (salida, trazado).
+
+    El trazado es un DeltaTrace: guarda solo el delta de cada paso y
+    reconstruye bajo demanda paso, estado, cabeza y cinta renderizada.
+
+    max_steps=None usa el límite del JSON. should_stop/on_progress se
+    pasan a trace_run (cancelación cooperativa y progreso, p. ej. desde
+    un hilo de la GUI); si se cancela, la salida es la cinta parcial.
+    """
+    from .batch import strip_key
+    from .trace import trace_run
+
+    tm = load_machine(mt_path)
+    tm.reset([input_word])
+    trace = trace_run(tm, max_steps, should_stop=should_stop, on_progress=on_progress)
+    return strip_key(tm.get_tape(tape_index=0, strip_blanks=True)), trace
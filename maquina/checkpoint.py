@@ -0,0 +1,236 @@
+# maquina/checkpoint.py
+
+"""
+Checkpoints de una ejecución: la configuración instantánea completa de
+una MT (cintas, cabezas, estado, pasos) en un archivo compacto, para
+pausar una corrida larga y seguirla después, en otro proceso o máquina.
+
+Formato (.tmk), little-endian:
+
+    cabecera (HEADER):
+        magic      4s   b"TMCK"
+        version    H
+        reserved   H
+        num_tapes  I
+        steps      Q
+        meta_len   I
+        crc32      I    (de todo lo que sigue a la cabecera)
+    metadatos: JSON UTF-8 con el fingerprint de la MT (machine_fingerprint),
+               estado, motivo de detención, presupuestos, los símbolos de
+               los códigos y, por cinta, lo/hi/cabeza/bytes por celda
+    cintas:    celdas visitadas de cada cinta (1 byte por celda, o uint32
+               si hay más de 256 símbolos), comprimidas con zlib
+
+Funciona con TuringMachine y CompiledTuringMachine (y entre ellas: los
+códigos se traducen por nombre de símbolo al restaurar), también con una
+CompiledTuringMachine sin TMConfig (cargada de un .tmc, del pool de
+cache.py o de un worker de parallel.py).
+
+Uso:
+    run_with_checkpoints(tm, "corrida.tmk", every=1_000_000)
+    # ... si el proceso muere, en otro:
+    tm = TuringMachine(config)
+    run_with_checkpoints(tm, "corrida.tmk")   # retoma desde el checkpoint
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .compiled import CompiledTuringMachine, compile_machine, machine_fingerprint
+from .turing import HALT_STEP_LIMIT, TuringMachine
+
+MAGIC = b"TMCK"
+VERSION = 3
+HEADER = struct.Struct("<4sHHIQII")
+SUFFIX = ".tmk"
+
+Machine = Union[TuringMachine, CompiledTuringMachine]
+
+
+class CheckpointError(ValueError):
+    """El checkpoint está dañado o no corresponde a esta MT."""
+
+
+def _symbols(tm: Machine) -> List[str]:
+    """Símbolos de los códigos que guarda la cinta de tm (código = índice)."""
+    if isinstance(tm, CompiledTuringMachine):
+        return list(tm._symbols)
+    return list(tm._codec.symbols)
+
+
+def _codes_for(tm: Machine, symbols: List[str]) -> List[int]:
+    """Código en tm de cada símbolo (internando los que no conozca)."""
+    if isinstance(tm, CompiledTuringMachine):
+        return tm._encode(symbols)
+    return [tm._codec.code(sym) for sym in symbols]
+
+
+def _fingerprint(tm: Machine) -> str:
+    """
+    machine_fingerprint de la MT de tm: de su tabla compilada o, en una
+    TuringMachine, compilando su TMConfig. Así no depende del motor.
+    """
+    if isinstance(tm, CompiledTuringMachine):
+        return machine_fingerprint(tm.machine)
+    return machine_fingerprint(compile_machine(tm.config))
+
+
+def dumps_checkpoint(tm: Machine, fingerprint: Optional[str] = None) -> bytes:
+    """
+    Serializa la configuración instantánea de tm.
+
+    fingerprint es el de la MT de tm (ver _fingerprint); si no se da se calcula
+    (conviene pasarlo al guardar checkpoints seguidos de la misma MT).
+    """
+    if fingerprint is None:
+        fingerprint = _fingerprint(tm)
+    tapes_meta = []
+    packed = bytearray()
+    for tape, head in zip(tm.tapes, tm.heads):
+        cells = tape.cells[tape.lo + tape.origin:tape.hi + tape.origin + 1]
+        if isinstance(cells, bytearray):
+            width, data = 1, bytes(cells)
+        else:
+            codes = array("I", cells)
+            if sys.byteorder != "little":
+                codes.byteswap()
+            width, data = 4, codes.tobytes()
+        tapes_meta.append({"lo": tape.lo, "hi": tape.hi, "head": head, "width": width})
+        packed += data
+
+    meta = json.dumps({
+        "fingerprint": fingerprint,
+        "state": tm.current_state,
+        "halted": tm.halted,
+        "halt_reason": tm.halt_reason,
+        "max_steps": tm.max_steps,
+        "max_cells": tm.max_cells,
+        "symbols": _symbols(tm),
+        "tapes": tapes_meta,
+    }, ensure_ascii=False).encode("utf-8")
+    payload = meta + zlib.compress(bytes(packed))
+    header = HEADER.pack(MAGIC, VERSION, 0, tm.num_tapes, tm.steps, len(meta),
+                         zlib.crc32(payload))
+    return header + payload
+
+
+def restore_checkpoint(tm: Machine, data: bytes, fingerprint: Optional[str] = None) -> None:
+    """
+    Deja tm exactamente en la configuración guardada en data (pasos,
+    estado, cintas, cabezas, presupuestos y motivo de detención).
+
+    Falla con CheckpointError si data está dañado o es de otra MT.
+    """
+    if len(data) < HEADER.size:
+        raise CheckpointError("Archivo demasiado corto para ser un checkpoint")
+    magic, version, _reserved, num_tapes, steps, meta_len, crc = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise CheckpointError(f"Firma inválida: {magic!r}")
+    if version != VERSION:
+        raise CheckpointError(f"Versión no soportada: {version} (se esperaba {VERSION})")
+    payload = memoryview(data)[HEADER.size:]
+    if zlib.crc32(payload) != crc:
+        raise CheckpointError("Checksum inválido: el checkpoint está dañado")
+    meta = json.loads(bytes(payload[:meta_len]).decode("utf-8"))
+    if fingerprint is None:
+        fingerprint = _fingerprint(tm)
+    if meta["fingerprint"] != fingerprint or num_tapes != tm.num_tapes:
+        raise CheckpointError("El checkpoint es de otra MT (fingerprint distinto)")
+    packed = zlib.decompress(payload[meta_len:])
+
+    tm.reset([""])
+    mapping = _codes_for(tm, meta["symbols"])
+    identity = mapping == list(range(len(mapping)))
+    wide = max(mapping, default=0) > 255
+    offset = 0
+    for i, info in enumerate(meta["tapes"]):
+        count = info["hi"] - info["lo"] + 1
+        size = count * info["width"]
+        chunk = packed[offset:offset + size]
+        offset += size
+        if info["width"] == 4:
+            codes = array("I")
+            codes.frombytes(chunk)
+            if sys.byteorder != "little":
+                codes.byteswap()
+        else:
+            codes = bytearray(chunk)
+        if not identity:
+            codes = [mapping[c] for c in codes]
+        if wide or info["width"] == 4:
+            cells = array("I", codes)
+        else:
+            cells = bytearray(codes)
+
+        tape = tm.tapes[i]
+        tape.cells = cells
+        tape.origin = -info["lo"]
+        tape.lo = info["lo"]
+        tape.hi = info["hi"]
+        tm.heads[i] = info["head"]
+
+    tm.current_state = meta["state"]
+    tm.steps = steps
+    tm.max_steps = meta["max_steps"]
+    tm.max_cells = meta["max_cells"]
+    tm.halted = meta["halted"]
+    tm.halt_reason = meta["halt_reason"]
+
+
+def save_checkpoint(tm: Machine, path: Union[str, Path],
+                    fingerprint: Optional[str] = None) -> None:
+    """
+    Guarda el checkpoint de tm en path de forma atómica (archivo temporal
+    + os.replace): si el proceso muere a mitad, queda el checkpoint anterior.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(dumps_checkpoint(tm, fingerprint))
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def load_checkpoint(path: Union[str, Path], tm: Machine,
+                    fingerprint: Optional[str] = None) -> Machine:
+    """Restaura en tm el checkpoint de path y devuelve tm."""
+    restore_checkpoint(tm, Path(path).read_bytes(), fingerprint)
+    return tm
+
+
+def run_with_checkpoints(tm: Machine, path: Union[str, Path],
+                         every: int = 1_000_000, resume: bool = True) -> Optional[str]:
+    """
+    Corre tm hasta que se detenga, guardando un checkpoint en path cada
+    `every` pasos y uno final. Con resume=True, si path ya existe se
+    retoma desde ahí en vez de empezar desde la configuración actual.
+
+    Devuelve halt_reason, igual que run(). El resultado (cintas, pasos,
+    motivo) es el mismo que el de una sola llamada a run().
+    """
+    if every < 1:
+        raise ValueError("every debe ser >= 1")
+    fingerprint = _fingerprint(tm)
+    if resume and Path(path).exists():
+        load_checkpoint(path, tm, fingerprint)
+    limit = tm.max_steps
+    while True:
+        reason = tm.run(max_steps=min(limit, tm.steps + every))
+        if reason == HALT_STEP_LIMIT and tm.steps < limit:
+            # fin del tramo, no de la corrida
+            tm.halted = False
+            tm.halt_reason = None
+            tm.max_steps = limit
+            save_checkpoint(tm, path, fingerprint)
+            continue
+        tm.max_steps = limit
+        save_checkpoint(tm, path, fingerprint)
+        return reason
@@ -0,0 +1,164 @@
+# maquina/cli.py
+
+"""
+CLI común de main_encoder.py y main_decoder.py: los dos scripts solo
+eligen el modo ("encoder" o "decoder") y llaman a main().
+"""
+
+import argparse
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+from . import caesar
+from .cache import get_default_cache
+from .startup import StartupProfile
+from .turing import IncompleteRunError
+
+
+# Caracteres leídos por bloque en --online
+ONLINE_BLOCK = 64 * 1024
+
+
+def _mode(mode: str) -> dict:
+    """Textos y archivos del modo 'encoder' o 'decoder'"""
+    if mode == 'encoder':
+        return {
+            'tag': 'ENCRIPTAR',
+            'verb': 'encriptar',
+            'json': 'mt_encoder.json',
+            'input_file': 'input_encoder.txt',
+            'output_file': 'encoder_output.txt',
+            'example': '3#ROMA NO FUE CONSTRUIDA EN UN DIA.',
+        }
+    return {
+        'tag': 'DECRIPTAR',
+        'verb': 'decriptar',
+        'json': 'mt_decoder.json',
+        'input_file': 'input_decoder.txt',
+        'output_file': 'decoder_output.txt',
+        'example': '3#URPD QR IXH FRQVWUXLGD HQ XQ GLD.',
+    }
+
+
+def parse_args(ui: dict, argv=None):
+    parser = argparse.ArgumentParser(description=f"Cifrado César con MT: {ui['verb']}.")
+    parser.add_argument("entrada", nargs="?", help=f'Mensaje "k#MENSAJE" a {ui["verb"]}')
+    parser.add_argument("--stream", action="store_true",
+                        help="Procesar línea por línea de --input hacia --output")
+    parser.add_argument("-i", "--input", default="-",
+                        help="Archivo de entrada para --stream (- = stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Archivo de salida para --stream (- = stdout)")
+    parser.add_argument("--online", action="store_true",
+                        help="Tratar todo --input como un solo mensaje leído por bloques "
+                             "(salida incremental, memoria constante)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos para --stream (0 = todos los núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="Mensajes por bloque enviado a cada proceso")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Reportar en stderr el tiempo de cada fase del arranque")
+    return parser.parse_args(argv)
+
+
+def run_stream(ui: dict, mt_path: Path, args) -> None:
+    """Modo streaming: memoria acotada, salida incremental."""
+    from .streaming import stream_lines
+
+    process = partial(caesar.run_many, mt_path,
+                      workers=args.workers or None, chunk_size=args.chunk_size)
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = stream_lines(process, src, dst)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"[{ui['tag']}] {stats.summary()}", file=sys.stderr)
+
+
+def run_online(mt_path: Path, args) -> None:
+    """Modo en línea: un mensaje arbitrariamente largo, leído por bloques."""
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    def chunks():
+        # los saltos de línea no son parte del alfabeto: se ignoran
+        while True:
+            block = src.read(ONLINE_BLOCK)
+            if not block:
+                return
+            yield block.replace("\r", "").replace("\n", "")
+
+    try:
+        for out in caesar.run_stream(mt_path, chunks()):
+            dst.write(out)
+            dst.flush()
+        dst.write("\n")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+
+def main(mode: str, start: Optional[float] = None, argv=None) -> None:
+    """
+    Punto de entrada de main_encoder.py / main_decoder.py.
+
+    start es el perf_counter() del inicio del script, para que
+    --profile-startup cuente también sus imports.
+    """
+    ui = _mode(mode)
+    profile = StartupProfile(start)
+    profile.mark("imports")
+    args = parse_args(ui, argv)
+    profile.enabled = args.profile_startup
+    profile.mark("argumentos")
+    mt_path = caesar.machine_path(ui['json'])
+    if args.online:
+        run_online(mt_path, args)
+        profile.mark("en línea")
+        profile.report()
+        return
+    if args.stream:
+        run_stream(ui, mt_path, args)
+        profile.mark("streaming")
+        profile.report()
+        return
+
+    base = caesar.project_root()
+
+    if args.entrada is not None:
+        input_word = args.entrada
+    else:
+        input_file = base / "ejemplos" / ui['input_file']
+        if input_file.exists():
+            input_word = input_file.read_text(encoding="utf-8").strip()
+        else:
+            input_word = ui['example']
+
+    print(f"[{ui['tag']}] Entrada: {input_word}")
+    cache = get_default_cache()
+    try:
+        output = caesar.run(mt_path, input_word)
+    except IncompleteRunError as e:
+        print(f"[{ui['tag']}] Error: {e}", file=sys.stderr)
+        print(f"[{ui['tag']}] Cinta parcial: {e.output}", file=sys.stderr)
+        sys.exit(1)
+    profile.mark("simulación")
+    source = ".tmc" if cache.disk_hits else "JSON"
+    profile.split(f"cargar MT ({source})", cache.load_seconds)
+    print(f"[{ui['tag']}] Salida: {output}")
+
+    output_dir = base / "output"
+    output_dir.mkdir(exist_ok=True)
+    out_file = output_dir / ui['output_file']
+    out_file.write_text(output, encoding="utf-8")
+    print(f"Salida guardada en: {out_file}")
+    profile.mark("escribir salida")
+    profile.report()
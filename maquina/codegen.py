@@ -0,0 +1,389 @@
+# maquina/codegen.py
+
+"""
+Backend de generación de código: para una MT de 1 cinta se genera código
+Python especializado (un bloque por estado, con los símbolos y
+movimientos de sus transiciones escritos como constantes), se compila con
+compile() y el code object se guarda en disco con marshal.
+
+Forma del código generado (ver generate_source):
+
+    def run(cells, pos, lo, hi, state, steps, limit, k0=K0, ...):
+        while True:
+            if state < 29:                    # bisección sobre los estados
+                ...
+                elif state == 7:              # 'qProc_1'
+                    (macro-paso de barrido)
+                    while True:
+                        (límite de pasos, rango visitado)
+                        c = cells[pos]
+                        w = k2[c]             # se queda en qProc_1 y va a R
+                        if w >= 0:
+                            cells[pos] = w
+                            pos += 1
+                            steps += 1
+                            continue
+                        if c == 0:            # '_': pasa a otro estado
+                            steps += 1
+                            state = 3
+                            break
+                        return ..., NO_TRANSITION
+
+- Las transiciones de un estado se agrupan por (estado siguiente,
+  movimiento); los grupos grandes usan una tupla código -> símbolo escrito
+  y los chicos se escriben como comparaciones directas. Si un estado tiene
+  muchas salidas a otros estados (p. ej. q0 leyendo la llave), se
+  resuelven con una consulta a tablas de ese estado.
+- Mientras la MT se queda en un estado no se vuelve al despacho de
+  estados: el bucle interno sigue hasta cambiar de estado.
+- En los estados de barrido (compiled.Sweep) el bloque empieza con el
+  macro-paso escrito en línea, con sus símbolos y su tabla de translate
+  como constantes.
+- Todo (cinta, cabeza, estado, pasos, tablas) vive en variables locales.
+
+El code object se guarda en <cache_dir>/<hash>.<versión de Python>.marshal;
+el hash es la versión del generador más el machine_fingerprint de la MT
+(ver compiled.py), así que un cambio en la MT o en el generador produce
+otro archivo.
+
+Uso:
+    python -m maquina.codegen ejemplos/mt_encoder.json          # genera y cachea
+    python -m maquina.codegen ejemplos/mt_encoder.json --show   # muestra el código
+"""
+
+import marshal
+import os
+import sys
+import types
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .compiled import (
+    NO_TRANSITION,
+    SWEEP_CHUNK,
+    CompiledMachine,
+    CompiledTuringMachine,
+    Sweep,
+    machine_fingerprint,
+)
+from .turing import HALT_ACCEPTED, HALT_NO_TRANSITION, HALT_STEP_LIMIT, TMConfig
+
+# Versión del generador: forma parte del hash del código cacheado
+GENERATOR_VERSION = 1
+
+# Grupos de transiciones con al menos este tamaño usan una tabla
+TABLE_MIN = 4
+
+# Con más transiciones que esto hacia otros estados se usan tablas por estado
+EXIT_INLINE_MAX = 4
+
+# Estados por hoja del despacho (ver _dispatch)
+DISPATCH_LEAF = 4
+
+# Códigos de salida de run() generado
+_SLICE, _ACCEPTED, _NO_TRANSITION, _GROW = 0, 1, 2, 3
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "maquina" / "codegen"
+
+# hash -> run(), para no volver a cargar el mismo código en el proceso
+_RUNNERS: Dict[str, Callable] = {}
+
+
+def _cache_key(machine: CompiledMachine) -> str:
+    """Clave del code object: versión del generador + machine_fingerprint."""
+    return f"g{GENERATOR_VERSION}-{machine_fingerprint(machine)}"
+
+
+def _groups(machine: CompiledMachine, state: int) -> List[Tuple[int, int, Dict[int, int]]]:
+    """Transiciones de state agrupadas: [(siguiente, movimiento, {leído: escrito})]."""
+    g = machine.num_symbols
+    groups: Dict[Tuple[int, int], Dict[int, int]] = {}
+    for c in range(g):
+        i = state * g + c
+        nxt = machine.next_state[i]
+        if nxt != NO_TRANSITION:
+            groups.setdefault((nxt, machine.moves[i]), {})[c] = machine.writes[i]
+    # los grupos más grandes primero; ante empate, el que se queda en el estado
+    return sorted(
+        ((nxt, move, writes) for (nxt, move), writes in groups.items()),
+        key=lambda grp: (-len(grp[2]), grp[0] != state),
+    )
+
+
+def _sweep_lines(sweep: Sweep, loop: str, table: str) -> List[str]:
+    """
+    Macro-paso de barrido (ver compiled.Sweep) al entrar al estado: la
+    racha de símbolos de `loop` se reescribe de una vez con translate.
+    """
+    if sweep.move > 0:
+        body = [
+            "end = min(hi + 1, pos + limit - steps)",
+            "while pos < end:",
+            f"    seg = cells[pos:min(end, pos + {SWEEP_CHUNK})]",
+            f"    n = len(seg) - len(seg.lstrip({loop}))",
+            "    if n:",
+            f"        cells[pos:pos + n] = seg[:n].translate({table})",
+            "        pos += n",
+        ]
+    else:
+        body = [
+            "start = max(lo, pos - (limit - steps) + 1)",
+            "while pos >= start:",
+            f"    seg = cells[max(start, pos - {SWEEP_CHUNK - 1}):pos + 1]",
+            f"    n = len(seg) - len(seg.rstrip({loop}))",
+            "    if n:",
+            f"        cells[pos - n + 1:pos + 1] = seg[len(seg) - n:].translate({table})",
+            "        pos -= n",
+        ]
+    body += [
+        "        steps += n",
+        "    if n < len(seg):",
+        "        break",
+    ]
+    return ["if lo <= pos <= hi:"] + [f"    {line}" for line in body]
+
+
+def _dispatch(blocks: List[Tuple[int, List[str]]]) -> List[str]:
+    """
+    Despacho por estado: bisección sobre los códigos de estado hasta
+    quedar pocos bloques, que se eligen con if/elif.
+    """
+    if len(blocks) > DISPATCH_LEAF:
+        mid = len(blocks) // 2
+        return (
+            [f"if state < {blocks[mid][0]}:"]
+            + [f"    {line}" for line in _dispatch(blocks[:mid])]
+            + ["else:"]
+            + [f"    {line}" for line in _dispatch(blocks[mid:])]
+        )
+    out: List[str] = []
+    for n, (q, lines) in enumerate(blocks):
+        out.append(f"{'if' if n == 0 else 'elif'} state == {q}:  {lines[0]}")
+        out += [f"    {line}" for line in lines[1:]]
+    out += ["else:", f"    return pos, lo, hi, state, steps, {_NO_TRANSITION}"]
+    return out
+
+
+def generate_source(machine: CompiledMachine) -> str:
+    """Código Python de run() especializado para una MT de 1 cinta."""
+    if machine.num_tapes != 1:
+        raise ValueError("La generación de código solo soporta MTs de 1 cinta")
+    # Tablas y bytes constantes (valor -> nombre): se definen una vez a
+    # nivel de módulo y run() los recibe como valores por defecto
+    consts: Dict[Union[tuple, bytes], str] = {}
+
+    def const(value: Union[tuple, bytes]) -> str:
+        return consts.setdefault(value, f"k{len(consts)}")
+
+    blocks: List[Tuple[int, List[str]]] = []
+    for q in range(len(machine.states)):
+        lines = [f"# {machine.states[q]!r}"]
+        if machine.accept[q]:
+            lines.append(f"return pos, lo, hi, {q}, steps, {_ACCEPTED}")
+            blocks.append((q, lines))
+            continue
+        sweep = machine.sweeps[q]
+        if sweep is not None:
+            lines += _sweep_lines(sweep, const(sweep.loop), const(sweep.table))
+        lines += [
+            "while True:",
+            "    if steps >= limit:",
+            f"        return pos, lo, hi, {q}, steps, {_SLICE}",
+            "    if pos > hi:",
+            "        if pos >= size:",
+            f"            return pos, lo, hi, {q}, steps, {_GROW}",
+            "        hi = pos",
+            "    elif pos < lo:",
+            "        if pos < 0:",
+            f"            return pos, lo, hi, {q}, steps, {_GROW}",
+            "        lo = pos",
+            "    c = cells[pos]",
+        ]
+        groups = _groups(machine, q)
+        exits = [grp for grp in groups if grp[0] != q]
+        if sum(len(writes) for _nxt, _move, writes in exits) > EXIT_INLINE_MAX:
+            groups = [grp for grp in groups if grp[0] == q]
+        else:
+            exits = []
+        for nxt, move, writes in groups:
+            tail = ["pos += 1"] if move > 0 else ["pos -= 1"] if move < 0 else []
+            tail.append("steps += 1")
+            tail += ["continue"] if nxt == q else [f"state = {nxt}", "break"]
+            if len(writes) >= TABLE_MIN:
+                table = [-1] * 256
+                for c, w in writes.items():
+                    table[c] = w
+                lines += [
+                    f"    w = {const(tuple(table))}[c]",
+                    "    if w >= 0:",
+                    "        cells[pos] = w",
+                ] + [f"        {line}" for line in tail]
+            else:
+                for c, w in writes.items():
+                    lines.append(f"    if c == {c}:  # {machine.symbols[c]!r}")
+                    if w != c:
+                        lines.append(f"        cells[pos] = {w}")
+                    lines += [f"        {line}" for line in tail]
+        if exits:
+            # Muchas salidas del estado: una sola consulta por tablas
+            # (siguiente, escrito, movimiento) en vez de una cadena de if
+            next_table, write_table, move_table = [-1] * 256, [0] * 256, [0] * 256
+            for nxt, move, writes in exits:
+                for c, w in writes.items():
+                    next_table[c], write_table[c], move_table[c] = nxt, w, move
+            lines += [
+                f"    nxt = {const(tuple(next_table))}[c]",
+                "    if nxt >= 0:",
+                f"        cells[pos] = {const(tuple(write_table))}[c]",
+                f"        pos += {const(tuple(move_table))}[c]",
+                "        steps += 1",
+                "        state = nxt",
+                "        break",
+            ]
+        lines.append(f"    return pos, lo, hi, {q}, steps, {_NO_TRANSITION}")
+        blocks.append((q, lines))
+
+    out = [
+        f"# Generado por maquina/codegen.py (versión {GENERATOR_VERSION}): "
+        f"{len(machine.states)} estados, {machine.num_symbols} símbolos",
+        "",
+    ]
+    for value, name in consts.items():
+        out.append(f"{name.upper()} = {value!r}")
+    # Como valores por defecto las constantes son variables locales de run()
+    # sin costo por llamada
+    params = ["cells", "pos", "lo", "hi", "state", "steps", "limit"]
+    params += [f"{name}={name.upper()}" for name in consts.values()]
+    out += ["", "", f"def run({', '.join(params)}):", "    size = len(cells)", "    while True:"]
+    out += [f"        {line}" for line in _dispatch(blocks)]
+    out.append("")
+    return "\n".join(out)
+
+
+def _cache_file(cache_dir: Path, key: str) -> Path:
+    return cache_dir / f"{key[:32]}.{sys.implementation.cache_tag}.marshal"
+
+
+def load_runner(machine: CompiledMachine,
+                cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR) -> Callable:
+    """
+    run() generado para machine: de la memoria del proceso, del code object
+    cacheado en cache_dir o, si no está, generándolo y guardándolo ahí.
+    cache_dir=None no usa disco. Si el directorio no se puede escribir,
+    simplemente no se cachea.
+    """
+    key = _cache_key(machine)
+    runner = _RUNNERS.get(key)
+    if runner is not None:
+        return runner
+
+    code = None
+    path = _cache_file(Path(cache_dir), key) if cache_dir is not None else None
+    if path is not None:
+        try:
+            code = marshal.loads(path.read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            code = None  # no está o está dañado: se regenera
+    if not isinstance(code, types.CodeType):
+        code = compile(generate_source(machine), f"<maquina.codegen {key[:12]}>", "exec")
+        if path is not None:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(marshal.dumps(code))
+                os.replace(tmp, path)
+            except OSError:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+
+    namespace: dict = {}
+    exec(code, namespace)
+    runner = _RUNNERS[key] = namespace["run"]
+    return runner
+
+
+class GeneratedTuringMachine(CompiledTuringMachine):
+    """
+    CompiledTuringMachine cuyo bucle de 1 cinta es el run() generado para
+    esta MT (ver generate_source). Misma interfaz, mismas cintas, pasos y
+    halt_reason.
+
+    Con max_cells, cintas de más de 256 símbolos o MTs de varias cintas se
+    usa el bucle del motor compilado.
+    """
+
+    def __init__(
+        self,
+        machine: Union[TMConfig, CompiledMachine],
+        config: Optional[TMConfig] = None,
+        cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR,
+    ):
+        super().__init__(machine, config)
+        self._runner = load_runner(self.machine, cache_dir) if self.num_tapes == 1 else None
+
+    def _run_single_tape(self, limit: int) -> Optional[str]:
+        tape = self.tapes[0]
+        cells = tape.cells
+        if self._runner is None or self.max_cells is not None or not isinstance(cells, bytearray):
+            return super()._run_single_tape(limit)
+
+        run = self._runner
+        head = self.heads[0]
+        state = self._state
+        steps = self.steps
+        while True:
+            # Blancos de reserva a la derecha de lo visitado, para que run()
+            # no tenga que volver aquí cada vez que la cabeza pasa el final
+            # (más allá de hi la cinta es blanca, así que no cambia nada)
+            if len(cells) - tape.origin - tape.hi <= 2:
+                cells.extend(bytes((tape.blank,)) * max(len(cells), 16))
+            origin = tape.origin
+            pos, lo, hi, state, steps, code = run(
+                cells, head + origin, tape.lo + origin, tape.hi + origin, state, steps, limit)
+            head = pos - origin
+            tape.lo = lo - origin
+            tape.hi = hi - origin
+            if code != _GROW:
+                break
+            # La cabeza salió del array: Tape.ensure agranda (y puede mover
+            # el origen)
+            tape.ensure(head)
+
+        self.heads[0] = head
+        self._state = state
+        self.steps = steps
+        if code == _ACCEPTED:
+            return HALT_ACCEPTED
+        if code == _NO_TRANSITION:
+            return HALT_NO_TRANSITION
+        if steps >= self.max_steps:
+            return HALT_ACCEPTED if self.machine.accept[state] else HALT_STEP_LIMIT
+        return None
+
+
+def main(argv=None) -> None:
+    import argparse
+
+    from .compiled import compile_machine
+    from .parser import load_mt_from_json
+
+    parser = argparse.ArgumentParser(description="Genera el código Python especializado de una MT")
+    parser.add_argument("json", help="MT en JSON")
+    parser.add_argument("--show", action="store_true", help="Imprimir el código generado")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help="Directorio de la caché de code objects")
+    args = parser.parse_args(argv)
+
+    machine = compile_machine(load_mt_from_json(args.json))
+    if args.show:
+        print(generate_source(machine))
+        return
+    load_runner(machine, args.cache_dir)
+    key = _cache_key(machine)
+    print(f"{args.json} -> {_cache_file(Path(args.cache_dir), key)}")
+
+
+if __name__ == "__main__":
+    main()
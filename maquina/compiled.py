@@ -0,0 +1,709 @@
+# maquina/compiled.py
+
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+from .turing import (
+    TMConfig,
+    TransitionKey,
+    TransitionVal,
+    BudgetMixin,
+    DEADLINE_CHECK_EVERY,
+    HALT_ACCEPTED,
+    HALT_MEMORY_LIMIT,
+    HALT_NO_TRANSITION,
+    HALT_STEP_LIMIT,
+    HALT_TIMEOUT,
+)
+from .tape import Tape
+
+
+# Movimientos codificados como desplazamiento de la cabeza
+MOVE_CODES: Dict[str, int] = {"L": -1, "R": 1, "S": 0}
+MOVE_NAMES: Dict[int, str] = {v: k for k, v in MOVE_CODES.items()}
+
+# Valor de next_state para las entradas de la tabla sin transición
+NO_TRANSITION = -1
+
+# Límite de entradas de la tabla densa (estados * |Γ|^k)
+MAX_TABLE_SIZE = 1 << 24
+
+# Celdas procesadas por bloque en un macro-paso de barrido
+SWEEP_CHUNK = 1 << 16
+
+@dataclass
+class Sweep:
+    """
+    Estado de "barrido": en 1 cinta, todas sus transiciones hacia sí mismo
+    mueven en la misma dirección (L o R), así que una racha de símbolos de
+    `loop` se procesa como un solo macro-paso: la escritura depende solo
+    del símbolo leído y se aplica con bytes.translate.
+    """
+    move: int
+    loop: bytes
+    table: bytes = field(repr=False)
+
+    def run(self, cells: bytearray, pos: int, lo: int, hi: int, budget: int) -> int:
+        """
+        Aplica el barrido desde el índice físico pos sin salir de [lo, hi]
+        ni superar `budget` pasos. Devuelve la cantidad de pasos hechos.
+        """
+        n = 0
+        if self.move > 0:
+            end = min(hi + 1, pos + budget)
+            while pos < end:
+                seg = cells[pos:min(end, pos + SWEEP_CHUNK)]
+                run = len(seg) - len(seg.lstrip(self.loop))
+                if run:
+                    cells[pos:pos + run] = seg[:run].translate(self.table)
+                    pos += run
+                    n += run
+                if run < len(seg):
+                    break
+        else:
+            start = max(lo, pos - budget + 1)
+            while pos >= start:
+                seg = cells[max(start, pos - SWEEP_CHUNK + 1):pos + 1]
+                run = len(seg) - len(seg.rstrip(self.loop))
+                if run:
+                    cells[pos - run + 1:pos + 1] = seg[len(seg) - run:].translate(self.table)
+                    pos -= run
+                    n += run
+                if run < len(seg):
+                    break
+        return n
+
+
+@dataclass
+class CompiledMachine:
+    """
+    Forma "compilada" de un TMConfig.
+
+    Estados y símbolos de cinta se internan como enteros pequeños y la
+    función de transición se aplana en una tabla densa indexada por:
+
+        estado * |Γ|^k + (c1 + c2 * |Γ| + ... + ck * |Γ|^(k-1))
+
+    - next_state[i]: estado siguiente o NO_TRANSITION.
+    - writes[i*k + t], moves[i*k + t]: símbolo escrito y movimiento
+      (-1, 0, 1) de la cinta t.
+    - accept[q]: 1 si q es estado de aceptación.
+    """
+    states: List[str]
+    symbols: List[str]
+    num_tapes: int
+    blank: int
+    initial_state: int
+    accept: bytes
+    next_state: array
+    writes: array
+    moves: array
+    max_steps: int
+
+    def __post_init__(self):
+        # Derivado de la tabla: se recalcula al compilar o al cargar un .tmc
+        self.sweeps = detect_sweeps(self)
+
+    @property
+    def num_symbols(self) -> int:
+        return len(self.symbols)
+
+    def __getstate__(self) -> dict:
+        # Las tablas pueden ser vistas sobre un mmap (ver binary.py): al
+        # serializar (p. ej. hacia otro proceso) se copian a arrays.
+        state = dict(self.__dict__)
+        for name in ("next_state", "writes", "moves"):
+            value = state[name]
+            if isinstance(value, memoryview):
+                state[name] = array(value.format, value)
+        return state
+
+    def state_code(self, name: str) -> int:
+        return self.states.index(name)
+
+    def index(self, state: int, codes) -> int:
+        """Índice en la tabla para un estado y los códigos leídos."""
+        g = len(self.symbols)
+        i = 0
+        for c in reversed(codes):
+            i = i * g + c
+        return state * g ** self.num_tapes + i
+
+
+def detect_sweeps(machine: CompiledMachine) -> List[Optional[Sweep]]:
+    """
+    Detecta los estados de barrido de una MT de 1 cinta (ver Sweep).
+
+    Devuelve una lista indexada por código de estado con el Sweep o None.
+    """
+    sweeps: List[Optional[Sweep]] = [None] * len(machine.states)
+    g = len(machine.symbols)
+    if machine.num_tapes != 1 or g > 256:
+        return sweeps
+    for q in range(len(machine.states)):
+        if machine.accept[q]:
+            continue
+        loop = []
+        moves = set()
+        table = bytearray(range(256))
+        for c in range(g):
+            i = q * g + c
+            if machine.next_state[i] == q:
+                loop.append(c)
+                moves.add(machine.moves[i])
+                table[c] = machine.writes[i]
+        if loop and len(moves) == 1 and 0 not in moves:
+            sweeps[q] = Sweep(moves.pop(), bytes(loop), bytes(table))
+    return sweeps
+
+
+def decompile_transitions(machine: CompiledMachine) -> Dict[TransitionKey, TransitionVal]:
+    """Transiciones por nombre (como en TMConfig) a partir de la tabla."""
+    k = machine.num_tapes
+    g = machine.num_symbols
+    symbols = machine.symbols
+    transitions: Dict[TransitionKey, TransitionVal] = {}
+    for i, q2 in enumerate(machine.next_state):
+        if q2 == NO_TRANSITION:
+            continue
+        state, rest = divmod(i, g ** k)
+        reads = []
+        for _ in range(k):
+            rest, c = divmod(rest, g)
+            reads.append(symbols[c])
+        writes = tuple(symbols[machine.writes[i * k + t]] for t in range(k))
+        moves = tuple(MOVE_NAMES[machine.moves[i * k + t]] for t in range(k))
+        transitions[(machine.states[state], tuple(reads))] = (machine.states[q2], writes, moves)
+    return transitions
+
+
+def compile_machine(config: TMConfig) -> CompiledMachine:
+    """
+    Compila un TMConfig a tablas enteras.
+
+    Los estados que solo aparecen en transiciones (y no en Q) también se
+    internan, de modo que el comportamiento es idéntico al intérprete.
+    """
+    states: List[str] = []
+    state_codes: Dict[str, int] = {}
+
+    def intern_state(name: str) -> int:
+        if name not in state_codes:
+            state_codes[name] = len(states)
+            states.append(name)
+        return state_codes[name]
+
+    symbols: List[str] = []
+    symbol_codes: Dict[str, int] = {}
+
+    def intern_symbol(sym: str) -> int:
+        if sym not in symbol_codes:
+            symbol_codes[sym] = len(symbols)
+            symbols.append(sym)
+        return symbol_codes[sym]
+
+    for q in config.states:
+        intern_state(q)
+    intern_state(config.initial_state)
+    for q in config.accept_states:
+        intern_state(q)
+    for sym in config.tape_alphabet:
+        intern_symbol(sym)
+    intern_symbol(config.blank)
+    for (q, reads), (q2, writes, _moves) in config.transitions.items():
+        intern_state(q)
+        intern_state(q2)
+        for sym in reads:
+            intern_symbol(sym)
+        for sym in writes:
+            intern_symbol(sym)
+
+    k = config.num_tapes
+    g = len(symbols)
+    size = len(states) * g ** k
+    if size > MAX_TABLE_SIZE:
+        raise ValueError(
+            f"Tabla de transiciones demasiado grande para compilar ({size} entradas)"
+        )
+
+    next_state = array("i", [NO_TRANSITION]) * size
+    write_codes = array("i", [0]) * (size * k)
+    move_codes = array("b", [0]) * (size * k)
+
+    for (q, reads), (q2, writes, moves) in config.transitions.items():
+        i = 0
+        for sym in reversed(reads):
+            i = i * g + symbol_codes[sym]
+        i += state_codes[q] * g ** k
+        next_state[i] = state_codes[q2]
+        for t in range(k):
+            if moves[t] not in MOVE_CODES:
+                raise ValueError(f"Movimiento inválido en cinta {t}: {moves[t]}")
+            write_codes[i * k + t] = symbol_codes[writes[t]]
+            move_codes[i * k + t] = MOVE_CODES[moves[t]]
+
+    accept = bytearray(len(states))
+    for q in config.accept_states:
+        accept[state_codes[q]] = 1
+
+    return CompiledMachine(
+        states=states,
+        symbols=symbols,
+        num_tapes=k,
+        blank=symbol_codes[config.blank],
+        initial_state=state_codes[config.initial_state],
+        accept=bytes(accept),
+        next_state=next_state,
+        writes=write_codes,
+        moves=move_codes,
+        max_steps=config.max_steps,
+    )
+
+
+def machine_fingerprint(machine: CompiledMachine) -> str:
+    """
+    Hash (sha256, hex) que identifica una MT por su tabla compilada:
+    estados, símbolos, cintas, blanco, estado inicial, aceptación y
+    transiciones. max_steps no entra: no cambia qué MT es.
+
+    Es el fingerprint que usan la caché de resultados (memo.py), los
+    checkpoints y la caché de código generado (codegen.py). Toda entrada
+    de cache.py tiene la tabla compilada, venga del JSON o de un .tmc, y
+    ambos caminos dan el mismo valor.
+    """
+    import hashlib  # solo quien pide un fingerprint paga el import
+
+    h = hashlib.sha256(repr((
+        list(machine.states),
+        list(machine.symbols),
+        machine.num_tapes,
+        machine.blank,
+        machine.initial_state,
+        bytes(machine.accept),
+    )).encode("utf-8"))
+    for table in (machine.next_state, machine.writes, machine.moves):
+        codes = array("i", table)
+        if sys.byteorder == "big":
+            codes.byteswap()  # el mismo valor en cualquier plataforma
+        h.update(codes.tobytes())
+    return h.hexdigest()
+
+
+class CompiledTuringMachine(BudgetMixin):
+    """
+    Máquina de Turing determinista de k cintas sobre una tabla compilada.
+
+    Ofrece la misma interfaz pública que TuringMachine (reset, step, run,
+    get_tape, print_configuration, current_state, heads, steps, halted)
+    y produce exactamente las mismas cintas, pero cada paso es un par de
+    accesos a arrays en vez de construir claves de strings. La ganancia
+    está en run(), que corre en bucles con variables locales
+    (_run_single_tape, _run_multi_tape); step() suelto cuesta más o menos
+    lo mismo que en el intérprete.
+
+    - Las cintas son Tape con códigos de símbolo (bytearray si caben en un
+      byte); las cabezas son relativas al origen de cada cinta.
+    - Los símbolos de la entrada que no están en Γ se internan aparte; al
+      leerlos no hay transición y la máquina se detiene, igual que el
+      intérprete.
+    - En 1 cinta, al entrar a un estado de barrido (ver Sweep) la racha de
+      celdas se procesa en un macro-paso; steps cuenta cada celda, así que
+      el conteo y el corte por max_steps son exactos.
+    - Mismos presupuestos y halt_reason que TuringMachine.
+    """
+
+    def __init__(
+        self,
+        machine: Union[TMConfig, CompiledMachine],
+        config: Optional[TMConfig] = None,
+    ):
+        if isinstance(machine, TMConfig):
+            config = machine
+            machine = compile_machine(machine)
+        self.config = config
+        self.machine = machine
+        self.num_tapes = machine.num_tapes
+        self._base_codes = {s: i for i, s in enumerate(machine.symbols)}
+        # índice en la tabla = estado * |Γ|^k + Σ código_t * |Γ|^t
+        g = machine.num_symbols
+        self._state_stride = g ** machine.num_tapes
+        self._tape_strides = tuple(g ** t for t in range(machine.num_tapes))
+        self.reset([""])
+
+    # ----------------- manejo de cinta y estado ----------------- #
+
+    def _new_tape(self, codes) -> Tape:
+        if len(self._symbols) <= 256:
+            return Tape(bytearray(codes), self.machine.blank)
+        return Tape(array("I", codes), self.machine.blank)
+
+    def _encode(self, word: str) -> List[int]:
+        codes = []
+        for sym in word:
+            code = self._symbol_codes.get(sym)
+            if code is None:
+                if self._symbols is self.machine.symbols:
+                    # primera vez que aparece un símbolo ajeno: copiar tablas
+                    self._symbols = list(self._symbols)
+                    self._symbol_codes = dict(self._symbol_codes)
+                code = len(self._symbols)
+                self._symbol_codes[sym] = code
+                self._symbols.append(sym)
+            codes.append(code)
+        return codes
+
+    def reset(self, input_words: List[str]) -> None:
+        """
+        input_words: lista de strings, uno por cinta (igual que TuringMachine).
+        """
+        m = self.machine
+        self._symbols = m.symbols
+        self._symbol_codes = self._base_codes
+
+        encoded = []
+        for i in range(self.num_tapes):
+            if i < len(input_words) and input_words[i]:
+                encoded.append(self._encode(input_words[i]))
+            else:
+                encoded.append([m.blank])
+
+        self.tapes = [self._new_tape(codes) for codes in encoded]
+        self.heads = [0] * self.num_tapes
+        self._state = m.initial_state
+        self.halted = False
+        self.halt_reason: Optional[str] = None
+        self.steps = 0
+        self.max_steps = m.max_steps
+        self.deadline: Optional[float] = None
+        self.max_cells: Optional[int] = None
+
+    @property
+    def current_state(self) -> str:
+        return self.machine.states[self._state]
+
+    @current_state.setter
+    def current_state(self, name: str) -> None:
+        self._state = self.machine.state_code(name)
+
+    @property
+    def accepted(self) -> bool:
+        """True si la máquina está en un estado de aceptación."""
+        return bool(self.machine.accept[self._state])
+
+    def _ensure_head_in_bounds(self, tape_index: int) -> None:
+        """Asegura que la cabeza de la cinta i tenga una celda válida."""
+        self.tapes[tape_index].ensure(self.heads[tape_index])
+
+    # ----------------- ejecución ----------------- #
+
+    def step(self) -> bool:
+        """
+        Ejecuta un paso de la MT.
+        Devuelve False si ya no hay transición (la máquina se detiene).
+        """
+        if self.halted:
+            return False
+        # El reloj se consulta cada DEADLINE_CHECK_EVERY pasos, igual que en run()
+        if (self.deadline is not None and self.steps % DEADLINE_CHECK_EVERY == 0
+                and time.monotonic() >= self.deadline):
+            self._halt(HALT_TIMEOUT)
+            return False
+
+        m = self.machine
+        if m.accept[self._state]:
+            self._halt(HALT_ACCEPTED)
+            return False
+
+        k = self.num_tapes
+        g = m.num_symbols
+        tapes = self.tapes
+        heads = self.heads
+        strides = self._tape_strides
+        i = 0
+        foreign = False
+        for t in range(k):
+            tape = tapes[t]
+            head = heads[t]
+            if head < tape.lo or head > tape.hi:
+                tape.ensure(head)
+            c = tape.cells[head + tape.origin]
+            if c >= g:
+                foreign = True
+            i += c * strides[t]
+        if self.max_cells is not None and self.cells_used() > self.max_cells:
+            self._halt(HALT_MEMORY_LIMIT)
+            return False
+        if foreign:
+            # símbolo fuera de Γ => no hay transición
+            self._halt(HALT_NO_TRANSITION)
+            return False
+        i += self._state * self._state_stride
+
+        next_state = m.next_state[i]
+        if next_state == NO_TRANSITION:
+            self._halt(HALT_NO_TRANSITION)
+            return False
+
+        base = i * k
+        writes = m.writes
+        moves = m.moves
+        for t in range(k):
+            tape = tapes[t]
+            tape.cells[heads[t] + tape.origin] = writes[base + t]
+            heads[t] += moves[base + t]
+        self._state = next_state
+
+        self.steps += 1
+        if self.steps >= self.max_steps:
+            self._halt(HALT_ACCEPTED if self.accepted else HALT_STEP_LIMIT)
+
+        return True
+
+    def run(
+        self,
+        verbose: bool = False,
+        max_steps: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_cells: Optional[int] = None,
+        detect_cycles: bool = False,
+    ) -> Optional[str]:
+        """
+        Corre la MT hasta que se detenga o se agote algún presupuesto
+        (ver set_budget). Devuelve halt_reason.
+
+        Con detect_cycles=True corre paso a paso (sin macro-pasos) y se
+        detiene con HALT_CYCLE si una configuración se repite, como
+        TuringMachine.run.
+        """
+        self.set_budget(max_steps, timeout, max_cells)
+        if detect_cycles:
+            return self._run_detecting_cycles(verbose)
+        if verbose:
+            deadline = self.deadline
+            while not self.halted:
+                if self.steps >= self.max_steps:
+                    self._halt(HALT_STEP_LIMIT)
+                    break
+                if (deadline is not None and self.steps % DEADLINE_CHECK_EVERY == 0
+                        and time.monotonic() >= deadline):
+                    self._halt(HALT_TIMEOUT)
+                    break
+                if verbose:
+                    self.print_configuration()
+                if not self.step():
+                    break
+            return self.halt_reason
+
+        run_fast = self._run_single_tape if self.num_tapes == 1 else self._run_multi_tape
+        while not self.halted:
+            if self.steps >= self.max_steps:
+                self._halt(HALT_STEP_LIMIT)
+                break
+            if self.deadline is None:
+                reason = run_fast(self.max_steps)
+            else:
+                if time.monotonic() >= self.deadline:
+                    self._halt(HALT_TIMEOUT)
+                    break
+                # tramos de DEADLINE_CHECK_EVERY pasos, como step() y el intérprete
+                reason = run_fast(min(self.max_steps, self.steps + DEADLINE_CHECK_EVERY))
+            if reason is not None:
+                self._halt(reason)
+        return self.halt_reason
+
+    def _run_single_tape(self, limit: int) -> Optional[str]:
+        """
+        Bucle especializado para 1 cinta con todo en variables locales.
+
+        Corre hasta `limit` pasos; devuelve el motivo de detención, o None si
+        solo se terminó el tramo (limit < max_steps).
+        """
+        m = self.machine
+        g = m.num_symbols
+        accept = m.accept
+        next_states = m.next_state
+        writes = m.writes
+        moves = m.moves
+        max_cells = self.max_cells
+        reason = None
+
+        tape = self.tapes[0]
+        if max_cells is not None and not accept[self._state]:
+            # Dentro del bucle solo se revisa al crecer la cinta
+            tape.ensure(self.heads[0])
+            if len(tape) > max_cells:
+                return HALT_MEMORY_LIMIT
+
+        # Se trabaja con índices físicos sobre tape.cells; solo al salir del
+        # rango visitado se delega en Tape.ensure (que puede mover el origen).
+        cells = tape.cells
+        origin = tape.origin
+        pos = self.heads[0] + origin
+        lo = tape.lo + origin
+        hi = tape.hi + origin
+        state = self._state
+        steps = self.steps
+
+        # Los macro-pasos de barrido trabajan sobre bytes
+        sweeps = m.sweeps if isinstance(cells, bytearray) else None
+        last_state = -1
+
+        while True:
+            if accept[state]:
+                reason = HALT_ACCEPTED
+                break
+            if sweeps is not None and state != last_state:
+                # Recién se entró a este estado: probar un macro-paso
+                last_state = state
+                sweep = sweeps[state]
+                if sweep is not None and lo <= pos <= hi:
+                    n = sweep.run(cells, pos, lo, hi, limit - steps)
+                    if n:
+                        pos += n * sweep.move
+                        steps += n
+                        if steps >= limit:
+                            break
+            if pos < lo or pos > hi:
+                head = pos - origin
+                tape.ensure(head)
+                origin = tape.origin
+                pos = head + origin
+                lo = tape.lo + origin
+                hi = tape.hi + origin
+                if max_cells is not None and hi - lo + 1 > max_cells:
+                    reason = HALT_MEMORY_LIMIT
+                    break
+            c = cells[pos]
+            if c >= g:
+                reason = HALT_NO_TRANSITION
+                break
+            i = state * g + c
+            next_state = next_states[i]
+            if next_state == NO_TRANSITION:
+                reason = HALT_NO_TRANSITION
+                break
+            cells[pos] = writes[i]
+            state = next_state
+            pos += moves[i]
+            steps += 1
+            if steps >= limit:
+                break
+
+        if reason is None and steps >= self.max_steps:
+            reason = HALT_ACCEPTED if accept[state] else HALT_STEP_LIMIT
+        self.heads[0] = pos - origin
+        self._state = state
+        self.steps = steps
+        return reason
+
+    def _run_multi_tape(self, limit: int) -> Optional[str]:
+        """
+        Como _run_single_tape, para k > 1 cintas: posiciones físicas,
+        rangos visitados y celdas de cada cinta en listas locales, y el
+        índice de la tabla con los strides precalculados.
+        """
+        m = self.machine
+        k = self.num_tapes
+        g = m.num_symbols
+        accept = m.accept
+        next_states = m.next_state
+        writes = m.writes
+        moves = m.moves
+        state_stride = self._state_stride
+        strides = self._tape_strides
+        max_cells = self.max_cells
+        tapes = self.tapes
+        heads = self.heads
+        tape_range = range(k)
+        reason = None
+
+        if max_cells is not None and not accept[self._state]:
+            # Dentro del bucle solo se revisa al crecer alguna cinta
+            for t in tape_range:
+                tapes[t].ensure(heads[t])
+            if self.cells_used() > max_cells:
+                return HALT_MEMORY_LIMIT
+
+        cells = [tape.cells for tape in tapes]
+        origins = [tape.origin for tape in tapes]
+        pos = [heads[t] + origins[t] for t in tape_range]
+        lo = [tape.lo + tape.origin for tape in tapes]
+        hi = [tape.hi + tape.origin for tape in tapes]
+        state = self._state
+        steps = self.steps
+
+        while True:
+            if accept[state]:
+                reason = HALT_ACCEPTED
+                break
+            i = state * state_stride
+            foreign = grew = False
+            for t in tape_range:
+                p = pos[t]
+                if p < lo[t] or p > hi[t]:
+                    tape = tapes[t]
+                    head = p - origins[t]
+                    tape.ensure(head)
+                    origin = origins[t] = tape.origin
+                    p = pos[t] = head + origin
+                    lo[t] = tape.lo + origin
+                    hi[t] = tape.hi + origin
+                    grew = True
+                c = cells[t][p]
+                if c >= g:
+                    foreign = True
+                i += c * strides[t]
+            if grew and max_cells is not None and self.cells_used() > max_cells:
+                reason = HALT_MEMORY_LIMIT
+                break
+            if foreign:
+                reason = HALT_NO_TRANSITION
+                break
+            next_state = next_states[i]
+            if next_state == NO_TRANSITION:
+                reason = HALT_NO_TRANSITION
+                break
+            base = i * k
+            for t in tape_range:
+                cells[t][pos[t]] = writes[base + t]
+                pos[t] += moves[base + t]
+            state = next_state
+            steps += 1
+            if steps >= limit:
+                break
+
+        if reason is None and steps >= self.max_steps:
+            reason = HALT_ACCEPTED if accept[state] else HALT_STEP_LIMIT
+        for t in tape_range:
+            heads[t] = pos[t] - origins[t]
+        self._state = state
+        self.steps = steps
+        return reason
+
+    # ----------------- salida y debug ----------------- #
+
+    def get_tape(self, tape_index: int = 0, strip_blanks: bool = True) -> str:
+        """Retorna el contenido de una cinta como string."""
+        symbols = self._symbols
+        s = "".join([symbols[c] for c in self.tapes[tape_index]])
+        if strip_blanks:
+            return s.strip(symbols[self.machine.blank])
+        return s
+
+    def print_configuration(self) -> None:
+        """Imprime una configuración instantánea simple."""
+        print(f"Paso {self.steps} | Estado: {self.current_state}")
+        for i in range(self.num_tapes):
+            head = self.heads[i]
+            out = ""
+            for j, c in self.tapes[i].items():
+                sym = self._symbols[c]
+                if j == head:
+                    out += f"[{sym}]"
+                else:
+                    out += f" {sym} "
+            print(f"  Cinta {i+1}: {out}")
+        print("-" * 40)
@@ -1,93 +1,97 @@
 # maquina/decoder_mt.py
 
+"""
+Decriptación César con la MT de ejemplos/mt_decoder.json. La lógica es común
+con encoder_mt.py y vive en maquina/caesar.py; aquí solo se fija la MT.
+"""
+
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
 
+from . import caesar
 from .turing import TuringMachine
-from .parser import load_mt_from_json
 
+if TYPE_CHECKING:
+    from .batch import BatchResult
+    from .compiled import CompiledTuringMachine
+    from .memo import ResultCache
+    from .trace import DeltaTrace
 
-def _get_project_root() -> Path:
-    """
-    Devuelve la ruta raíz del proyecto asumiendo que este archivo está en:
-    .../Proyecto-3-Teoria-de-la-computacion/maquina/decoder_mt.py
-    """
-    return Path(__file__).resolve().parent.parent
+
+def _machine_path(json_path: Optional[str] = None) -> Path:
+    """Ruta del JSON de la MT: json_path o <raiz_proyecto>/ejemplos/mt_decoder.json."""
+    return caesar.machine_path("mt_decoder.json", json_path)
 
 
-def load_decoder_machine(json_path: Optional[str] = None) -> TuringMachine:
+def load_decoder_machine(
+    json_path: Optional[str] = None, compiled: bool = False
+) -> Union[TuringMachine, "CompiledTuringMachine"]:
     """
     Carga la máquina de Turing de decriptación (César con llave k).
 
     Si no se especifica json_path, usa:
         <raiz_proyecto>/ejemplos/mt_decoder.json
-    """
-    root = _get_project_root()
-    if json_path is None:
-        mt_path = root / "ejemplos" / "mt_decoder.json"
-    else:
-        mt_path = Path(json_path)
 
-    config = load_mt_from_json(str(mt_path))
-    tm = TuringMachine(config)
-    return tm
+    Ver caesar.load_machine (caché por proceso, compiled=True).
+    """
+    return caesar.load_machine(_machine_path(json_path), compiled)
 
 
-def decrypt(input_word: str, json_path: Optional[str] = None) -> str:
+def decrypt(input_word: str, json_path: Optional[str] = None,
+            memo: Optional["ResultCache"] = None) -> str:
     """
     Decripta una cadena usando la MT (César, llave k).
 
     Formato de entrada:
         "k#MENSAJE_CIFRADO" (en mayúsculas).
 
-    Devuelve el contenido de la cinta sin blancos externos.
+    Devuelve la cinta sin blancos externos ni la llave; si la MT no acepta
+    lanza IncompleteRunError. Ver caesar.run (pool de máquinas, memo).
+    """
+    return caesar.run(_machine_path(json_path), input_word, memo)
+
+
+def decrypt_many(
+    input_words: Iterable[str],
+    json_path: Optional[str] = None,
+    workers: Optional[int] = 1,
+    chunk_size: int = 256,
+    vectorized: bool = False,
+    detect_cycles: bool = False,
+) -> Iterator["BatchResult"]:
+    """
+    Decripta muchos mensajes "k#MENSAJE_CIFRADO" con una sola carga de la MT.
+
+    Un BatchResult por entrada, en orden. Ver caesar.run_many (workers,
+    chunk_size, vectorized, detect_cycles).
+    """
+    return caesar.run_many(_machine_path(json_path), input_words, workers,
+                           chunk_size, vectorized, detect_cycles)
+
+
+def decrypt_stream(
+    chunks: Iterable[str],
+    json_path: Optional[str] = None,
+    max_steps: Optional[int] = None,
+) -> Iterator[str]:
     """
-    tm = load_decoder_machine(json_path)
-    tm.reset([input_word])
-    tm.run(verbose=False)
-    raw = tm.get_tape(tape_index=0, strip_blanks=True)
-    # Remover llave si permanece en la salida
-    if '#' in raw:
-        parts = raw.split('#', 1)
-        if len(parts) == 2:
-            return parts[1]
-    return raw
-
-
-def decrypt_with_trace(input_word: str, json_path: Optional[str] = None, max_steps: int = 10_000) -> tuple[str, list]:
-    """Decripta y retorna (salida, trazado).
-
-    El trazado incluye paso, estado, cabeza y cinta renderizada.
+    Decripta un solo mensaje "k#MENSAJE_CIFRADO" que llega por bloques (chunks) y
+    produce la salida, sin la llave, a medida que queda fija en la cinta.
+    Ver caesar.run_stream.
     """
-    tm = load_decoder_machine(json_path)
-    tm.reset([input_word])
-    trace = []
-
-    def snapshot(step: int):
-        head = tm.heads[0]
-        tape_list = tm.tapes[0][:]
-        rendered = "".join(
-            f"[{c}]" if i == head else c for i, c in enumerate(tape_list)
-        )
-        trace.append({
-            "step": step,
-            "state": tm.current_state,
-            "head": head,
-            "tape": rendered
-        })
-
-    snapshot(0)
-    while not tm.halted and tm.steps < max_steps:
-        if not tm.step():
-            break
-        snapshot(tm.steps)
-
-    raw = tm.get_tape(tape_index=0, strip_blanks=True)
-    if '#' in raw:
-        parts = raw.split('#', 1)
-        if len(parts) == 2:
-            return parts[1], trace
-    return raw, trace
+    return caesar.run_stream(_machine_path(json_path), chunks, max_steps)
+
+
+def decrypt_with_trace(
+    input_word: str,
+    json_path: Optional[str] = None,
+    max_steps: Optional[int] = 10_000,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> tuple[str, "DeltaTrace"]:
+    """Decripta y retorna (salida, trazado). Ver caesar.run_with_trace."""
+    return caesar.run_with_trace(_machine_path(json_path), input_word, max_steps,
+                                 should_stop, on_progress)
 
 
 if __name__ == "__main__":
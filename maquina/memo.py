@@ -0,0 +1,122 @@
+# maquina/memo.py
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+# (fingerprint de la MT, entrada)
+ResultKey = Tuple[str, str]
+
+
+class ResultCache:
+    """
+    Caché de resultados de encrypt()/decrypt() por (MT, entrada).
+
+    - La clave incluye el fingerprint de la MT (ver
+      compiled.machine_fingerprint): si el JSON cambia, su fingerprint
+      cambia y los resultados viejos dejan de coincidir solos.
+    - En memoria es un LRU acotado por cantidad de entradas (max_entries) y
+      por tamaño total (max_bytes, contando entrada + salida en UTF-8).
+    - Con path, además guarda los resultados en una base sqlite que
+      sobrevive reinicios; un fallo en memoria se busca ahí antes de correr
+      la MT.
+    - hits / misses / disk_hits cuentan los accesos.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[ResultKey, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._db = None
+        if path is not None:
+            import sqlite3
+
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " fingerprint TEXT NOT NULL, input TEXT NOT NULL, output TEXT NOT NULL,"
+                " PRIMARY KEY (fingerprint, input))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _size(word: str, output: str) -> int:
+        return len(word.encode("utf-8")) + len(output.encode("utf-8"))
+
+    def get(self, fingerprint: str, word: str) -> Optional[str]:
+        """Salida guardada para (MT, entrada), o None."""
+        key = (fingerprint, word)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT output FROM results WHERE fingerprint = ? AND input = ?", key
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, row[0])
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, fingerprint: str, word: str, output: str) -> None:
+        """Guarda la salida de (MT, entrada) en memoria y, si hay, en disco."""
+        key = (fingerprint, word)
+        with self._lock:
+            self._remember(key, output)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (fingerprint, input, output) VALUES (?, ?, ?)",
+                    (fingerprint, word, output),
+                )
+                self._db.commit()
+
+    def _remember(self, key: ResultKey, output: str) -> None:
+        size = self._size(key[1], output)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        if size > self.max_bytes:
+            return  # no cabe ni sola: no se guarda en memoria
+        self._entries[key] = (output, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def clear(self, disk: bool = False) -> None:
+        """Vacía la memoria (y la base sqlite si disk=True)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if disk and self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
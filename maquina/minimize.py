@@ -0,0 +1,204 @@
+# maquina/minimize.py
+
+"""
+Pasada de análisis y minimización sobre un TMConfig.
+
+1. Transiciones muertas:
+   - las que salen de un estado de aceptación (la MT se detiene al entrar
+     en él, nunca las usa);
+   - las que leen un símbolo que nunca puede estar en la cinta: con
+     entradas sobre Σ, en la cinta solo aparecen Σ, el blanco y lo que
+     escriben las transiciones vivas (punto fijo).
+2. Estados alcanzables: recorrido desde q0 usando solo transiciones
+   vivas; se descartan los estados inalcanzables y sus transiciones.
+3. Estados equivalentes (refinamiento de particiones, como en la
+   minimización de AFDs): dos estados son equivalentes si ambos son o no
+   de aceptación y, para cada símbolo leído, escriben lo mismo, se mueven
+   igual y pasan a estados equivalentes. Cada clase se reemplaza por un
+   representante (q0 si está en la clase, si no el primero según Q).
+
+La MT resultante produce las mismas cintas y la misma cantidad de pasos
+para cualquier entrada sobre Σ; el estado final puede tener el nombre del
+representante de su clase.
+
+Uso:
+    python -m maquina.minimize ejemplos/mt_encoder.json -o mt_encoder.min.json
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from .turing import TMConfig, TransitionKey, TransitionVal
+
+
+@dataclass
+class MinimizationReport:
+    states_before: int
+    states_after: int
+    transitions_before: int
+    transitions_after: int
+    symbols_before: int
+    symbols_after: int
+    unreachable_states: List[str] = field(default_factory=list)
+    dead_transitions: int = 0
+    # representante -> estados que se fusionaron en él (sin incluirlo)
+    merged: Dict[str, List[str]] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        def line(name: str, before: int, after: int) -> str:
+            saved = (1 - after / before) * 100 if before else 0.0
+            return f"  {name:<12} {before:>6} -> {after:<6} (-{saved:.1f} %)"
+
+        lines = [
+            "Minimización:",
+            line("estados", self.states_before, self.states_after),
+            line("transiciones", self.transitions_before, self.transitions_after),
+            line("símbolos", self.symbols_before, self.symbols_after),
+            f"  estados inalcanzables: {len(self.unreachable_states)}",
+            f"  transiciones muertas:  {self.dead_transitions}",
+            f"  estados fusionados:    {sum(len(v) for v in self.merged.values())}",
+        ]
+        for rep, members in self.merged.items():
+            lines.append(f"    {rep} <- {', '.join(members)}")
+        return "\n".join(lines)
+
+
+def live_transitions(config: TMConfig) -> Dict[TransitionKey, TransitionVal]:
+    """
+    Transiciones que se pueden usar con alguna entrada sobre Σ: desde
+    estados alcanzables que no son de aceptación y leyendo símbolos que
+    pueden llegar a la cinta.
+    """
+    accept = set(config.accept_states)
+    symbols = set(config.input_alphabet) | {config.blank}
+    while True:
+        live = {}
+        states = {config.initial_state}
+        changed = True
+        # estados alcanzables usando solo transiciones con símbolos posibles
+        while changed:
+            changed = False
+            for key, val in config.transitions.items():
+                q, reads = key
+                if q in states and q not in accept and key not in live \
+                        and all(s in symbols for s in reads):
+                    live[key] = val
+                    if val[0] not in states:
+                        states.add(val[0])
+                    changed = True
+        written = {w for _q2, writes, _m in live.values() for w in writes}
+        if written <= symbols:
+            return live
+        symbols |= written
+
+
+def _refine(states: List[str], accept: Set[str],
+            transitions: Dict[TransitionKey, TransitionVal]) -> Dict[str, int]:
+    """Partición de estados en clases de equivalencia (estado -> clase)."""
+    by_state: Dict[str, List[Tuple[Tuple[str, ...], TransitionVal]]] = {q: [] for q in states}
+    for (q, reads), val in transitions.items():
+        by_state[q].append((reads, val))
+    for rows in by_state.values():
+        rows.sort()
+
+    block = {q: int(q in accept) for q in states}
+    while True:
+        signatures: Dict[tuple, int] = {}
+        new_block = {}
+        for q in states:
+            sig = (block[q],) + tuple(
+                (reads, writes, moves, block[q2])
+                for reads, (q2, writes, moves) in by_state[q]
+            )
+            new_block[q] = signatures.setdefault(sig, len(signatures))
+        if len(signatures) == len(set(block.values())):
+            return new_block
+        block = new_block
+
+
+def minimize(config: TMConfig) -> Tuple[TMConfig, MinimizationReport]:
+    """Devuelve (MT minimizada, reporte). config no se modifica."""
+    live = live_transitions(config)
+
+    # estados que siguen en juego: q0, destinos de transiciones vivas y los
+    # que tienen transiciones vivas
+    used = {config.initial_state}
+    for (q, _reads), (q2, _writes, _moves) in live.items():
+        used.add(q)
+        used.add(q2)
+    states = [q for q in config.states if q in used]
+    states += sorted(used - set(states))  # destinos no declarados en Q
+
+    accept = set(config.accept_states)
+    block = _refine(states, accept, live)
+    representative: Dict[int, str] = {}
+    if config.initial_state in block:
+        representative[block[config.initial_state]] = config.initial_state
+    for q in states:
+        representative.setdefault(block[q], q)
+    rename = {q: representative[block[q]] for q in states}
+
+    transitions: Dict[TransitionKey, TransitionVal] = {}
+    for (q, reads), (q2, writes, moves) in live.items():
+        if rename[q] == q:
+            transitions[(q, reads)] = (rename[q2], writes, moves)
+
+    new_states = [q for q in states if rename[q] == q]
+    symbols = set(config.input_alphabet) | {config.blank}
+    for (_q, reads), (_q2, writes, _moves) in transitions.items():
+        symbols.update(reads)
+        symbols.update(writes)
+    gamma = [s for s in config.tape_alphabet if s in symbols]
+
+    merged: Dict[str, List[str]] = {}
+    for q in states:
+        if rename[q] != q:
+            merged.setdefault(rename[q], []).append(q)
+
+    minimized = TMConfig(
+        states=new_states,
+        input_alphabet=list(config.input_alphabet),
+        tape_alphabet=gamma,
+        blank=config.blank,
+        initial_state=config.initial_state,
+        accept_states=[q for q in config.accept_states if q in new_states],
+        transitions=transitions,
+        num_tapes=config.num_tapes,
+        max_steps=config.max_steps,
+    )
+    report = MinimizationReport(
+        states_before=len(config.states),
+        states_after=len(new_states),
+        transitions_before=len(config.transitions),
+        transitions_after=len(transitions),
+        symbols_before=len(config.tape_alphabet),
+        symbols_after=len(gamma),
+        unreachable_states=[q for q in config.states if q not in used],
+        dead_transitions=len(config.transitions) - len(live),
+        merged=merged,
+    )
+    return minimized, report
+
+
+def main(argv=None) -> None:
+    import argparse
+    import os
+
+    from .parser import load_mt_from_json, save_mt_to_json
+
+    parser = argparse.ArgumentParser(description="Minimiza una MT en JSON")
+    parser.add_argument("json", help="MT de entrada")
+    parser.add_argument("-o", "--output",
+                        help="JSON de salida (por defecto <nombre>.min.json)")
+    args = parser.parse_args(argv)
+
+    out = args.output or os.path.splitext(args.json)[0] + ".min.json"
+    minimized, report = minimize(load_mt_from_json(args.json))
+    save_mt_to_json(minimized, out)
+    print(report.summary())
+    before, after = os.path.getsize(args.json), os.path.getsize(out)
+    print(f"  JSON:         {before:>6} -> {after:<6} bytes ({out})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# maquina/online.py
+
+"""
+Simulación en línea: la entrada llega por bloques (de un socket, un pipe,
+...) y la salida sale a medida que queda fija.
+
+- feed(bloque) agrega símbolos al final de la cinta 1 y avanza la MT hasta
+  que la cabeza llegue al final de lo recibido (ahí espera más entrada).
+- close() indica que no viene más: desde ahí, más allá de la entrada hay
+  blancos, como en una corrida normal, y la MT corre hasta detenerse.
+- Una celda de la cinta 1 es definitiva cuando la cabeza ya pasó a su
+  derecha y desde el estado actual no se puede llegar a ninguna transición
+  que mueva la cinta 1 a la izquierda (análisis estático de la MT, ver
+  right_only_states). Esas celdas se devuelven y se borran de la cinta,
+  así que una MT que barre hacia la derecha (como las de César) procesa
+  un flujo sin fin con memoria constante.
+
+El texto devuelto, concatenado, es igual a get_tape(0, strip_blanks=True)
+de una corrida normal sobre toda la entrada. Si la MT no es de barrido a
+la derecha el resultado es el mismo, pero recién sale al detenerse.
+"""
+
+import math
+from typing import Iterable, Iterator, List, Optional, Set
+
+from .turing import TMConfig, TuringMachine
+
+
+def right_only_states(config: TMConfig) -> Set[str]:
+    """
+    Estados desde los que la cabeza de la cinta 1 ya no puede moverse a
+    la izquierda: no tienen transiciones con L en la cinta 1 ni llegan a
+    un estado que las tenga.
+    """
+    sources: dict = {}
+    left: List[str] = []
+    for (q, _reads), (q2, _writes, moves) in config.transitions.items():
+        sources.setdefault(q2, set()).add(q)
+        if moves[0] == "L":
+            left.append(q)
+    # recorrido hacia atrás desde los estados que mueven a la izquierda
+    can_go_left = set(left)
+    pending = list(left)
+    while pending:
+        q = pending.pop()
+        for p in sources.get(q, ()):
+            if p not in can_go_left:
+                can_go_left.add(p)
+                pending.append(p)
+    states = set(config.states) | {q2 for q2, _w, _m in config.transitions.values()}
+    return states - can_go_left
+
+
+class OnlineTuringMachine:
+    """
+    Una TuringMachine alimentada por bloques.
+
+    Uso:
+        om = OnlineTuringMachine(config)
+        for bloque in bloques:
+            salida.write(om.feed(bloque))
+        salida.write(om.close())
+
+    max_steps=None (por defecto) no pone límite de pasos: un flujo sin fin
+    necesita pasos sin fin. Con un número, la MT se detiene con
+    "step-limit" como en run().
+    """
+
+    def __init__(self, config: TMConfig, max_steps: Optional[int] = None):
+        self.tm = TuringMachine(config)
+        self.tm.max_steps = math.inf if max_steps is None else max_steps
+        self._right_only = frozenset(right_only_states(config))
+        self._fed = 0            # posición lógica siguiente a la entrada recibida
+        self._emitted = None     # primera celda aún no devuelta (None: ninguna)
+        self._started = False    # ya salió algún símbolo no blanco
+        self._held = ""          # blancos retenidos (podrían ser los del final)
+        self.closed = False
+
+    @property
+    def halted(self) -> bool:
+        return self.tm.halted
+
+    @property
+    def halt_reason(self) -> Optional[str]:
+        return self.tm.halt_reason
+
+    def feed(self, chunk: str) -> str:
+        """Agrega chunk a la entrada, avanza la MT y devuelve la salida nueva."""
+        if self.closed:
+            raise ValueError("La entrada ya se cerró con close()")
+        if chunk:
+            tape = self.tm.tapes[0]
+            codes = self.tm._codec.encode(chunk)
+            end = self._fed + len(codes)
+            tape.ensure(end - 1)
+            start = self._fed + tape.origin
+            tape.cells[start:start + len(codes)] = codes
+            self._fed = end
+        self._advance()
+        return self._flush()
+
+    def close(self) -> str:
+        """Termina la entrada, corre la MT hasta detenerse y devuelve el resto."""
+        if not self.closed:
+            self.closed = True
+            self._advance()
+        return self._flush()
+
+    def _advance(self) -> None:
+        tm = self.tm
+        heads = tm.heads
+        step = tm.step
+        fed = self._fed
+        closed = self.closed
+        while not tm.halted and (closed or heads[0] < fed):
+            if not step():
+                break
+
+    def _flush(self) -> str:
+        """Devuelve (y borra de la cinta) las celdas que ya no pueden cambiar."""
+        tm = self.tm
+        tape = tm.tapes[0]
+        if tm.halted:
+            end = tape.hi + 1 if self.closed else self._fed
+        elif tm.current_state in self._right_only:
+            end = tm.heads[0]
+        else:
+            return ""
+        if self._emitted is None:
+            self._emitted = tape.lo
+        if end <= self._emitted:
+            return ""
+
+        first = self._emitted + tape.origin
+        last = end + tape.origin
+        text = tm._codec.decode(tape.cells[first:last])
+        # Las celdas devueltas no se vuelven a leer: se sacan de la cinta
+        del tape.cells[:last]
+        tape.origin -= last
+        tape.lo = end
+        self._emitted = end
+
+        return self._strip(text)
+
+    def _strip(self, text: str) -> str:
+        """
+        Quita los blancos de los extremos de la salida total, como get_tape:
+        los del principio se descartan y los del final se retienen hasta
+        ver si les sigue algo (si no, nunca salen).
+        """
+        blank = self.tm.config.blank
+        if not self._started:
+            text = text.lstrip(blank)
+            if not text:
+                return ""
+            self._started = True
+        body = text.rstrip(blank)
+        if not body:
+            self._held += text
+            return ""
+        out = self._held + body
+        self._held = text[len(body):]
+        return out
+
+
+def stream_without_key(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Quita el prefijo "k#" de un flujo de salida (como batch.strip_key):
+    retiene el texto hasta ver el primer '#'. Si no aparece, al final
+    sale todo tal cual.
+    """
+    head = ""
+    it = iter(chunks)
+    for chunk in it:
+        head += chunk
+        if "#" in head:
+            rest = head.split("#", 1)[1]
+            if rest:
+                yield rest
+            break
+    else:
+        if head:
+            yield head
+        return
+    for chunk in it:
+        if chunk:
+            yield chunk
+
+
+def run_online(config: TMConfig, chunks: Iterable[str],
+               max_steps: Optional[int] = None) -> Iterator[str]:
+    """
+    Corre la MT sobre la concatenación de chunks y va produciendo la
+    salida (sin la llave) a medida que queda fija.
+    """
+    om = OnlineTuringMachine(config, max_steps)
+
+    def raw() -> Iterator[str]:
+        for chunk in chunks:
+            out = om.feed(chunk)
+            if out:
+                yield out
+        out = om.close()
+        if out:
+            yield out
+
+    return stream_without_key(raw())
@@ -0,0 +1,74 @@
+# maquina/parallel.py
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .batch import BatchResult, run_one
+from .cache import get_default_cache
+from .compiled import CompiledMachine, CompiledTuringMachine
+
+
+# Máquina propia de cada proceso trabajador (ver _init_worker)
+_worker_tm: Optional[CompiledTuringMachine] = None
+
+
+def _init_worker(machine: CompiledMachine) -> None:
+    """Initializer del pool: recibe la MT compilada una sola vez por proceso."""
+    global _worker_tm
+    _worker_tm = CompiledTuringMachine(machine)
+
+
+def _run_chunk(start: int, words: List[str], detect_cycles: bool = False) -> List[BatchResult]:
+    return [run_one(_worker_tm, start + i, w, detect_cycles) for i, w in enumerate(words)]
+
+
+def _chunks(input_words: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    it = iter(input_words)
+    start = 0
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def run_parallel(
+    mt_path: Union[str, Path],
+    input_words: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    detect_cycles: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Como batch.run_many, pero repartiendo el trabajo en varios procesos.
+
+    - La MT compilada se envía a cada trabajador una vez (initializer).
+    - Las entradas se consumen en bloques de chunk_size a medida que hay
+      trabajadores libres, así que el iterable puede ser muy grande.
+    - Los resultados salen en el orden de entrada.
+    - detect_cycles se pasa a cada run_one, igual que en run_many.
+
+    workers=None usa os.cpu_count().
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser >= 1")
+    workers = workers or os.cpu_count() or 1
+    machine = get_default_cache().get_compiled(mt_path)
+
+    # Como máximo 2 bloques en vuelo por trabajador: memoria acotada
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(machine,)
+    ) as pool:
+        pending = deque()
+        for start, chunk in _chunks(input_words, chunk_size):
+            pending.append(pool.submit(_run_chunk, start, chunk, detect_cycles))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
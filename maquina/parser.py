@@ -1,5 +1,6 @@
 # maquina/parser.py
 
+import gzip
 import json
 from typing import Dict, Tuple, List
 
@@ -18,6 +19,7 @@ def load_mt_from_json(path: str) -> TMConfig:
       "q0": "q0",
       "F": [...],
       "num_tapes": 2,
+      "max_steps": 500000,      (opcional)
       "transitions": [
         [
           "q",
@@ -29,8 +31,11 @@ def load_mt_from_json(path: str) -> TMConfig:
         ...
       ]
     }
+
+    Si la ruta termina en .gz se lee comprimida con gzip.
     """
-    with open(path, "r", encoding="utf-8") as f:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
         data = json.load(f)
 
     states: List[str] = data["Q"]
@@ -68,6 +73,14 @@ def load_mt_from_json(path: str) -> TMConfig:
             raise ValueError(f"Transición duplicada para {key}")
         transitions[key] = val
 
+    extra = {}
+    if "max_steps" in data:
+        max_steps = data["max_steps"]
+        # bool es subclase de int: true/false del JSON no son un límite
+        if not isinstance(max_steps, int) or isinstance(max_steps, bool) or max_steps <= 0:
+            raise ValueError(f"max_steps debe ser un entero positivo: {max_steps!r}")
+        extra["max_steps"] = max_steps
+
     return TMConfig(
         states=states,
         input_alphabet=sigma,
@@ -77,4 +90,29 @@ def load_mt_from_json(path: str) -> TMConfig:
         accept_states=F,
         transitions=transitions,
         num_tapes=num_tapes,
+        **extra,
     )
+
+
+def mt_to_dict(config: TMConfig) -> dict:
+    """TMConfig -> dict con el mismo formato que lee load_mt_from_json."""
+    return {
+        "Q": list(config.states),
+        "Sigma": list(config.input_alphabet),
+        "Gamma": list(config.tape_alphabet),
+        "blank": config.blank,
+        "q0": config.initial_state,
+        "F": list(config.accept_states),
+        "num_tapes": config.num_tapes,
+        "max_steps": config.max_steps,
+        "transitions": [
+            [state, list(reads), next_state, list(writes), list(moves)]
+            for (state, reads), (next_state, writes, moves) in config.transitions.items()
+        ],
+    }
+
+
+def save_mt_to_json(config: TMConfig, path: str) -> None:
+    """Escribe una MT en JSON (mismo formato que generate_machines.py)."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(mt_to_dict(config), f, ensure_ascii=False, indent=2)
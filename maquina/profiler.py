@@ -0,0 +1,212 @@
+# maquina/profiler.py
+
+"""
+Perfil de ejecución de una TuringMachine: dónde se van los pasos.
+
+    profile = tm.enable_profiling()
+    tm.reset(["3#HOLA MUNDO."])
+    tm.run()
+    print(profile.report())          # o profile.to_json()
+
+Por cada paso se cuenta la transición usada (estado, símbolos leídos) y
+se actualiza el rango de posiciones de cada cabeza; por corrida (run) se
+mide el tiempo de reloj y el motivo de detención. Los contadores se
+acumulan entre corridas hasta tm.disable_profiling().
+
+Sin perfil activo la MT no paga nada por paso: enable_profiling cambia
+el step() de esa instancia por uno que cuenta. También cuenta los pasos
+dados con step() directo (p. ej. trace_run); report(), to_dict() y
+state_hits los incluyen (ver flush).
+
+Uso:
+    python -m maquina.profiler ejemplos/mt_encoder.json "3#HOLA MUNDO."
+"""
+
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class TapeProfile:
+    """Rango de posiciones de la cabeza y celdas visitadas de una cinta."""
+    head_min: Optional[int] = None
+    head_max: Optional[int] = None
+    cells: int = 0  # celdas visitadas, sumando las corridas
+
+
+def _show(sym: str) -> str:
+    """Símbolo para el reporte: los espacios entre comillas."""
+    return repr(sym) if not sym.strip() else sym
+
+
+class MachineProfile:
+    """
+    Estadísticas de una o varias corridas de la misma TuringMachine.
+
+    - runs, steps, run_seconds: corridas, pasos y tiempo de cada corrida.
+    - transition_hits: pasos por (estado, símbolos leídos). Los pasos de
+      step() sueltos entran al cerrar una corrida, en reset(), en
+      report()/to_dict()/state_hits o llamando a flush().
+    - state_hits: pasos por estado (derivado de transition_hits).
+    - tapes: un TapeProfile por cinta.
+    - halt_reasons: cuántas corridas terminaron por cada motivo.
+    """
+
+    def __init__(self, num_tapes: int, symbols: Optional[List[str]] = None):
+        self.runs = 0
+        self.steps = 0
+        self.run_seconds: List[float] = []
+        self.transition_hits: Counter = Counter()
+        self.halt_reasons: Counter = Counter()
+        self.tapes = [TapeProfile() for _ in range(num_tapes)]
+        # símbolos de los códigos que lee la MT (los pone la MT)
+        self.symbols: List[str] = symbols if symbols is not None else []
+        # pasos aún no traducidos: (estado, códigos leídos) -> pasos
+        self._pending: Dict[tuple, int] = {}
+        self._lows: List[Optional[int]] = [None] * num_tapes
+        self._highs: List[Optional[int]] = [None] * num_tapes
+        self._start: Optional[float] = None
+
+    # ----------------- registro (lo llama la MT) ----------------- #
+
+    def record(self, state: str, codes: tuple, heads: List[int]) -> None:
+        """Un paso desde state leyendo codes; heads son las cabezas nuevas."""
+        key = (state, codes)
+        pending = self._pending
+        pending[key] = pending.get(key, 0) + 1
+        self._track(heads)
+
+    def _track(self, heads: List[int]) -> None:
+        lows, highs = self._lows, self._highs
+        for i, h in enumerate(heads):
+            if lows[i] is None or h < lows[i]:
+                lows[i] = h
+            if highs[i] is None or h > highs[i]:
+                highs[i] = h
+
+    def begin_run(self, tm) -> None:
+        self._start = time.perf_counter()
+        self._track(tm.heads)
+
+    def flush(self) -> None:
+        """Traduce los pasos pendientes a símbolos y los suma a los contadores."""
+        symbols = self.symbols
+        for (state, codes), n in self._pending.items():
+            self.transition_hits[(state, tuple(symbols[c] for c in codes))] += n
+            self.steps += n
+        self._pending.clear()
+
+    def end_run(self, tm) -> None:
+        """Cierra la corrida: acumula pasos, tiempo, motivo y cintas."""
+        if self._start is not None:
+            self.run_seconds.append(time.perf_counter() - self._start)
+            self._start = None
+        self.runs += 1
+        self.halt_reasons[tm.halt_reason] += 1
+        self.flush()
+
+        for i, tape in enumerate(tm.tapes):
+            stats = self.tapes[i]
+            low, high = self._lows[i], self._highs[i]
+            if low is not None and (stats.head_min is None or low < stats.head_min):
+                stats.head_min = low
+            if high is not None and (stats.head_max is None or high > stats.head_max):
+                stats.head_max = high
+            stats.cells += len(tape)
+        self._lows = [None] * len(self.tapes)
+        self._highs = [None] * len(self.tapes)
+
+    # ----------------- resultados ----------------- #
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.run_seconds)
+
+    @property
+    def state_hits(self) -> Counter:
+        self.flush()
+        hits: Counter = Counter()
+        for (state, _reads), n in self.transition_hits.items():
+            hits[state] += n
+        return hits
+
+    def _percent(self, n: int) -> float:
+        return 100.0 * n / self.steps if self.steps else 0.0
+
+    def to_dict(self) -> dict:
+        self.flush()
+        return {
+            "runs": self.runs,
+            "steps": self.steps,
+            "seconds": self.seconds,
+            "run_seconds": self.run_seconds,
+            "halt_reasons": dict(self.halt_reasons),
+            "states": [
+                {"state": q, "steps": n, "percent": self._percent(n)}
+                for q, n in self.state_hits.most_common()
+            ],
+            "transitions": [
+                {"state": q, "read": list(reads), "steps": n, "percent": self._percent(n)}
+                for (q, reads), n in self.transition_hits.most_common()
+            ],
+            "tapes": [
+                {"head_min": t.head_min, "head_max": t.head_max, "cells": t.cells}
+                for t in self.tapes
+            ],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def report(self, top: int = 10) -> str:
+        """Reporte de texto con los `top` estados y transiciones más usados."""
+        self.flush()
+        rate = self.steps / self.seconds if self.seconds > 0 else 0.0
+        lines = [
+            f"Perfil: {self.runs} corrida(s), {self.steps:,} pasos, "
+            f"{self.seconds * 1000:.2f} ms ({rate:,.0f} pasos/s)",
+            "Estados:",
+        ]
+        for q, n in self.state_hits.most_common(top):
+            lines.append(f"  {q:<24} {n:>10,}  {self._percent(n):5.1f} %")
+        lines.append("Transiciones:")
+        for (q, reads), n in self.transition_hits.most_common(top):
+            name = f"{q} on {','.join(_show(s) for s in reads)}"
+            lines.append(f"  {name:<24} {n:>10,}  {self._percent(n):5.1f} %")
+        lines.append("Cintas:")
+        for i, t in enumerate(self.tapes):
+            lines.append(f"  cinta {i + 1}: cabeza en [{t.head_min}, {t.head_max}], "
+                         f"{t.cells:,} celdas visitadas")
+        reasons = ", ".join(f"{r} x{n}" for r, n in self.halt_reasons.most_common())
+        lines.append(f"Detención: {reasons}")
+        return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    import argparse
+
+    from .parser import load_mt_from_json
+    from .turing import TuringMachine
+
+    parser = argparse.ArgumentParser(description="Perfil de ejecución de una MT")
+    parser.add_argument("json", help="MT en JSON")
+    parser.add_argument("entradas", nargs="+", help='Entradas, p. ej. "3#HOLA"')
+    parser.add_argument("--top", type=int, default=10,
+                        help="Estados y transiciones a mostrar")
+    parser.add_argument("--json", dest="as_json", action="store_true",
+                        help="Imprimir el perfil como JSON")
+    args = parser.parse_args(argv)
+
+    tm = TuringMachine(load_mt_from_json(args.json))
+    profile = tm.enable_profiling()
+    for word in args.entradas:
+        tm.reset([word])
+        tm.run()
+    print(profile.to_json() if args.as_json else profile.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
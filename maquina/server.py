@@ -0,0 +1,251 @@
+# maquina/server.py
+
+"""
+Servicio local de cifrado/descifrado sobre asyncio.
+
+Protocolo: JSON delimitado por líneas (TCP o socket Unix).
+
+    petición:  {"id": 1, "op": "encrypt" | "decrypt" | "ping", "input": "3#HOLA"}
+    respuesta: {"id": 1, "ok": true, "output": "KROD", "accepted": true,
+                "steps": 7, "halt_reason": "accepted", "error": null}
+
+Las respuestas llevan el mismo "id" de la petición; con varias peticiones
+en vuelo por conexión pueden llegar en otro orden.
+
+Uso:
+    python -m maquina.server --port 8765
+    python -m maquina.server --unix /tmp/cesar.sock --executor process
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Optional, Tuple
+
+from .encoder_mt import encrypt_many, load_encoder_machine
+from .decoder_mt import decrypt_many, load_decoder_machine
+
+
+OPS = {"encrypt": encrypt_many, "decrypt": decrypt_many}
+
+# Largo máximo de una línea de petición
+MAX_LINE = 16 * 1024 * 1024
+
+
+def _preload(encoder_json: Optional[str], decoder_json: Optional[str]) -> None:
+    """Carga ambas MTs en la caché del proceso (initializer del pool)."""
+    load_encoder_machine(encoder_json, compiled=True)
+    load_decoder_machine(decoder_json, compiled=True)
+
+
+def _process(op: str, word: str, json_path: Optional[str]) -> dict:
+    """Corre un mensaje en el pool; reutiliza las máquinas de la caché."""
+    result = next(iter(OPS[op]([word], json_path)))
+    data = asdict(result)
+    del data["index"], data["input"]
+    return data
+
+
+class CipherServer:
+    """
+    Servidor asyncio que mantiene cargadas las MTs de encriptar y decriptar.
+
+    - Cada línea recibida se encola en una cola acotada (queue_size); si la
+      cola está llena, la conexión deja de leer hasta que haya lugar
+      (backpressure hacia el cliente).
+    - Un grupo de tareas toma peticiones de la cola y corre la simulación
+      en un pool (hilos o procesos), así el event loop sigue respondiendo.
+    """
+
+    def __init__(
+        self,
+        encoder_json: Optional[str] = None,
+        decoder_json: Optional[str] = None,
+        workers: Optional[int] = None,
+        queue_size: int = 1024,
+        executor: str = "thread",
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"executor debe ser 'thread' o 'process': {executor!r}")
+        self.paths = {"encrypt": encoder_json, "decrypt": decoder_json}
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.executor_kind = executor
+        self.executor: Optional[Executor] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._connections = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ----------------- ciclo de vida ----------------- #
+
+    def _make_executor(self) -> Executor:
+        args = (self.paths["encrypt"], self.paths["decrypt"])
+        if self.executor_kind == "process":
+            return ProcessPoolExecutor(self.workers, initializer=_preload, initargs=args)
+        _preload(*args)
+        return ThreadPoolExecutor(self.workers, thread_name_prefix="mt")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Empieza a escuchar en host:port, o en el socket Unix `path`."""
+        self.executor = self._make_executor()
+        self.queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers * 2)]
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        return self._server
+
+    @property
+    def address(self) -> Tuple:
+        """Dirección en la que escucha (útil con port=0)."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ----------------- atención de peticiones ----------------- #
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        pending = set()
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._reply(writer, lock, {"id": None, "ok": False,
+                                                     "error": "Línea demasiado larga"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                done = asyncio.get_running_loop().create_future()
+                pending.add(done)
+                done.add_done_callback(pending.discard)
+                # put() espera si la cola está llena: backpressure
+                await self.queue.put((line, writer, lock, done))
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # cliente desconectado o servidor cerrándose
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            line, writer, lock, done = await self.queue.get()
+            try:
+                response = await self._dispatch(loop, line)
+                await self._reply(writer, lock, response)
+            except Exception:
+                pass  # la conexión pudo cerrarse; no tumbar al trabajador
+            finally:
+                if not done.done():
+                    done.set_result(None)
+                self.queue.task_done()
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return {"id": None, "ok": False, "error": f"JSON inválido: {e}"}
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "La petición debe ser un objeto JSON"}
+
+        req_id = request.get("id")
+        op = request.get("op")
+        if op == "ping":
+            return {"id": req_id, "ok": True, "output": "pong"}
+        if op not in OPS:
+            return {"id": req_id, "ok": False, "error": f"Operación desconocida: {op!r}"}
+        word = request.get("input")
+        if not isinstance(word, str):
+            return {"id": req_id, "ok": False, "error": "'input' debe ser un string"}
+
+        try:
+            data = await loop.run_in_executor(self.executor, _process, op, word, self.paths[op])
+        except Exception as e:
+            return {"id": req_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        data["ok"] = data["error"] is None
+        return {"id": req_id, **data}
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, lock: asyncio.Lock, response: dict) -> None:
+        async with lock:
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            await writer.drain()
+
+
+async def request(op: str, word: str, host: str = "127.0.0.1", port: int = 8765,
+                  path: Optional[str] = None) -> dict:
+    """Cliente mínimo: envía una petición y espera su respuesta."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    try:
+        writer.write(json.dumps({"id": 0, "op": op, "input": word}).encode("utf-8") + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def main(argv=None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servicio local de cifrado César con MT")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Escuchar en este socket Unix en vez de TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Tamaño del pool de simulación (por defecto: núcleos)")
+    parser.add_argument("--queue-size", type=int, default=1024,
+                        help="Peticiones en espera antes de aplicar backpressure")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--encoder-json", default=None)
+    parser.add_argument("--decoder-json", default=None)
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = CipherServer(args.encoder_json, args.decoder_json, args.workers,
+                              args.queue_size, args.executor)
+        await server.start(args.host, args.port, args.unix)
+        print(f"Escuchando en {server.address}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
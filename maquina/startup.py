@@ -0,0 +1,47 @@
+# maquina/startup.py
+
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+
+class StartupProfile:
+    """
+    Tiempos por fase del arranque de un CLI (--profile-startup).
+
+    Cada mark() cierra la fase que empezó en la marca anterior. Si está
+    desactivado, mark() y report() no hacen nada.
+    """
+
+    def __init__(self, start: Optional[float] = None, enabled: bool = True):
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self._last = self.start
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def split(self, phase: str, seconds: float) -> None:
+        """Separa `seconds` de la última fase registrada como una fase aparte."""
+        if not self.enabled or not self.phases:
+            return
+        name, total = self.phases[-1]
+        seconds = min(seconds, total)
+        self.phases[-1] = (name, total - seconds)
+        self.phases.insert(len(self.phases) - 1, (phase, seconds))
+
+    def report(self, out: TextIO = sys.stderr) -> None:
+        if not self.enabled:
+            return
+        total = sum(s for _, s in self.phases)
+        print("Perfil de arranque:", file=out)
+        for phase, seconds in self.phases:
+            share = seconds / total * 100 if total else 0.0
+            print(f"  {phase:<28} {seconds * 1e3:8.2f} ms  {share:5.1f} %", file=out)
+        print(f"  {'total':<28} {total * 1e3:8.2f} ms", file=out)
+        print("  (para el detalle de imports: python -X importtime ...)", file=out)
@@ -0,0 +1,65 @@
+# maquina/streaming.py
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .batch import BatchResult
+
+
+@dataclass
+class StreamStats:
+    lines: int = 0
+    errors: int = 0
+    steps: int = 0
+    seconds: float = 0.0
+
+    @property
+    def lines_per_s(self) -> float:
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def steps_per_s(self) -> float:
+        return self.steps / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.lines} líneas en {self.seconds:.2f} s "
+            f"({self.lines_per_s:,.0f} líneas/s, {self.steps_per_s:,.0f} pasos/s), "
+            f"{self.errors} errores"
+        )
+
+
+def _read_lines(src: TextIO) -> Iterator[str]:
+    for line in src:
+        yield line.rstrip("\r\n")
+
+
+def stream_lines(
+    process_many: Callable[[Iterable[str]], Iterator[BatchResult]],
+    src: TextIO,
+    dst: TextIO,
+    errors: TextIO = sys.stderr,
+) -> StreamStats:
+    """
+    Procesa src línea por línea y escribe cada salida en dst a medida que
+    sale, sin cargar el archivo completo (memoria acotada).
+
+    process_many es encrypt_many/decrypt_many (o un parcial con workers).
+    Se escribe una línea de salida por línea de entrada; si una línea
+    falla se escribe lo que haya en la cinta (o una línea vacía) y el
+    error se reporta en `errors` con su número de línea.
+    """
+    stats = StreamStats()
+    start = time.perf_counter()
+    for result in process_many(_read_lines(src)):
+        stats.lines += 1
+        stats.steps += result.steps
+        if not result.ok:
+            stats.errors += 1
+            print(f"línea {result.index + 1}: {result.error}", file=errors)
+        dst.write((result.output or "") + "\n")
+    dst.flush()
+    stats.seconds = time.perf_counter() - start
+    return stats
@@ -0,0 +1,158 @@
+# maquina/tape.py
+
+from array import array
+from typing import Iterator, Tuple, Union
+
+Cells = Union[list, bytearray, array]
+
+
+class Tape:
+    """
+    Cinta bidireccional con origen lógico estable.
+
+    - Las posiciones son lógicas: la celda 0 es el primer símbolo de la
+      entrada y la cabeza puede tomar valores negativos.
+    - El almacenamiento físico (cells) es una lista, un bytearray o un
+      array; la posición lógica p vive en cells[p + origin].
+    - Crecer a la derecha es un append; crecer a la izquierda reserva un
+      bloque de blancos proporcional al tamaño actual, así que ambos lados
+      cuestan O(1) amortizado (en vez de list.insert(0), que es O(n)).
+    - [lo, hi] es el rango de celdas visitadas: es lo que se muestra y se
+      devuelve, igual que la lista que usaba antes TuringMachine.
+    """
+
+    __slots__ = ("cells", "origin", "lo", "hi", "blank")
+
+    def __init__(self, cells: Cells, blank):
+        if len(cells) == 0:
+            cells.append(blank)
+        self.cells = cells
+        self.blank = blank
+        self.origin = 0
+        self.lo = 0
+        self.hi = len(cells) - 1
+
+    def _blank_run(self, n: int) -> Cells:
+        cells = self.cells
+        if isinstance(cells, list):
+            return [self.blank] * n
+        if isinstance(cells, bytearray):
+            return bytes((self.blank,)) * n
+        return array(cells.typecode, [self.blank]) * n
+
+    def ensure(self, pos: int) -> None:
+        """Incluye la posición lógica pos en el rango visitado."""
+        if pos < self.lo:
+            physical = pos + self.origin
+            if physical < 0:
+                grow = max(len(self.cells), 16, -physical)
+                self.cells[0:0] = self._blank_run(grow)
+                self.origin += grow
+            self.lo = pos
+        elif pos > self.hi:
+            missing = pos + self.origin + 1 - len(self.cells)
+            if missing == 1:
+                self.cells.append(self.blank)
+            elif missing > 0:
+                self.cells.extend(self._blank_run(missing))
+            self.hi = pos
+
+    def __getitem__(self, pos: int):
+        return self.cells[pos + self.origin]
+
+    def __setitem__(self, pos: int, value) -> None:
+        self.cells[pos + self.origin] = value
+
+    def __len__(self) -> int:
+        return self.hi - self.lo + 1
+
+    def visited(self) -> Cells:
+        """Copia de las celdas visitadas, de lo a hi."""
+        return self.cells[self.lo + self.origin:self.hi + self.origin + 1]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.visited())
+
+    def items(self) -> Iterator[Tuple[int, object]]:
+        """Pares (posición lógica, celda) del rango visitado."""
+        return zip(range(self.lo, self.hi + 1), self.visited())
+
+
+class SymbolCodec:
+    """
+    Biyección símbolo <-> código entero (0, 1, 2, ...).
+
+    Se arma con Γ (en su orden) y los demás símbolos que use la máquina;
+    los símbolos nuevos que lleguen por la entrada se internan al final.
+    Mientras haya a lo más 256 símbolos, las cintas pueden guardarse como
+    bytearray (1 byte por celda).
+    """
+
+    __slots__ = ("symbols", "codes")
+
+    def __init__(self, symbols):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.codes = {s: i for i, s in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def code(self, sym) -> int:
+        """Código de sym; si es nuevo se le asigna el siguiente."""
+        code = self.codes.get(sym)
+        if code is None:
+            code = self.codes[sym] = len(self.symbols)
+            self.symbols.append(sym)
+        return code
+
+    def encode(self, word) -> Cells:
+        """Códigos de los símbolos de word (bytearray si caben en un byte)."""
+        if len(self.symbols) <= 256:
+            try:
+                return bytearray(map(self.codes.__getitem__, word))
+            except KeyError:
+                pass  # hay símbolos nuevos: internarlos primero
+        codes = [self.code(sym) for sym in word]
+        if len(self.symbols) <= 256:
+            return bytearray(codes)
+        return array("I", codes)
+
+    def decode(self, codes) -> str:
+        symbols = self.symbols
+        return "".join([symbols[c] for c in codes])
+
+
+class EncodedTape(Tape):
+    """
+    Tape que guarda códigos de un SymbolCodec (bytearray o array "I") pero
+    se lee y escribe con símbolos: tape[p], iter(tape), visited() e items()
+    devuelven strings, igual que una Tape sobre una lista.
+
+    El simulador accede directo a cells/origin para no decodificar.
+    """
+
+    __slots__ = ("codec",)
+
+    def __init__(self, word, codec: SymbolCodec, blank):
+        self.codec = codec
+        cells = codec.encode(word)
+        if len(cells) == 0:
+            cells.append(codec.code(blank))
+        super().__init__(cells, codec.code(blank))
+
+    def __getitem__(self, pos: int):
+        return self.codec.symbols[self.cells[pos + self.origin]]
+
+    def __setitem__(self, pos: int, value) -> None:
+        code = self.codec.code(value)
+        if code > 255 and isinstance(self.cells, bytearray):
+            self.cells = array("I", self.cells)
+        self.cells[pos + self.origin] = code
+
+    def visited_codes(self) -> Cells:
+        """Copia de los códigos visitados, de lo a hi."""
+        return super().visited()
+
+    def visited(self) -> list:
+        symbols = self.codec.symbols
+        return [symbols[c] for c in super().visited()]
@@ -0,0 +1,306 @@
+# maquina/trace.py
+
+import json
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .turing import HALT_CANCELLED, TuringMachine
+
+# Cada cuántos pasos trace_run consulta cancelación y reporta progreso
+PROGRESS_EVERY = 4096
+
+
+class DeltaTrace:
+    """
+    Trazado de una ejecución guardado por deltas.
+
+    Por cada paso solo se guarda (estado, cabeza, posición escrita, símbolo
+    escrito, movimiento), en arrays de enteros; cada `checkpoint_every`
+    pasos se guarda además una copia completa de la cinta. La cinta
+    renderizada de cualquier paso se reconstruye bajo demanda a partir del
+    checkpoint anterior, así que la memoria es O(pasos) en vez de
+    O(pasos * largo de la cinta).
+
+    Se comporta como una secuencia de dicts {"step", "state", "head",
+    "tape"}, igual que la lista que devolvía antes encrypt_with_trace.
+    """
+
+    def __init__(self, cells: List[str], lo: int, head: int, state: str,
+                 blank: str, checkpoint_every: Optional[int] = None):
+        self.blank = blank
+        # motivo de detención de la corrida trazada (lo fija trace_run)
+        self.halt_reason: Optional[str] = None
+        self.checkpoint_every = checkpoint_every or max(256, len(cells))
+        self._states: List[str] = []
+        self._state_codes: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+
+        self._state = array("i")
+        self._head = array("q")
+        self._pos = array("q")
+        self._written = array("i")
+        self._move = array("b")
+        # paso -> (lo, códigos de la cinta visitada)
+        self._checkpoints: Dict[int, Tuple[int, array]] = {}
+        # (paso, lo, códigos) de la última cinta reconstruida por _codes_at
+        self._last: Optional[Tuple[int, int, array]] = None
+
+        self._append(self._intern_state(state), head, 0, self._intern_symbol(blank), 0)
+        self._checkpoints[0] = (lo, array("i", [self._intern_symbol(c) for c in cells]))
+        self._cur_lo = lo
+        self._cur = array("i", self._checkpoints[0][1])
+
+    @classmethod
+    def start(cls, tm: TuringMachine, checkpoint_every: Optional[int] = None) -> "DeltaTrace":
+        """Crea el trazado con la configuración inicial (paso 0) de la cinta 1."""
+        tape = tm.tapes[0]
+        return cls(list(tape.visited()), tape.lo, tm.heads[0], tm.current_state,
+                   tm.config.blank, checkpoint_every)
+
+    # ----------------- registro ----------------- #
+
+    def _intern_state(self, state: str) -> int:
+        code = self._state_codes.get(state)
+        if code is None:
+            code = self._state_codes[state] = len(self._states)
+            self._states.append(state)
+        return code
+
+    def _intern_symbol(self, sym: str) -> int:
+        code = self._symbol_codes.get(sym)
+        if code is None:
+            code = self._symbol_codes[sym] = len(self._symbols)
+            self._symbols.append(sym)
+        return code
+
+    def _append(self, state: int, head: int, pos: int, written: int, move: int) -> None:
+        self._state.append(state)
+        self._head.append(head)
+        self._pos.append(pos)
+        self._written.append(written)
+        self._move.append(move)
+
+    def record(self, state: str, head: int, pos: int, written: str) -> None:
+        """
+        Registra un paso: nuevo estado y cabeza, y el símbolo escrito en pos
+        (la posición de la cabeza antes de moverse).
+        """
+        code = self._intern_symbol(written)
+        self._append(self._intern_state(state), head, pos, code, head - pos)
+        self._cur_lo = self._apply(self._cur, self._cur_lo, pos, code)
+        step = len(self._state) - 1
+        if step % self.checkpoint_every == 0:
+            self._checkpoints[step] = (self._cur_lo, array("i", self._cur))
+
+    def _apply(self, cells: array, lo: int, pos: int, code: int) -> int:
+        """Escribe code en la posición lógica pos, extendiendo la cinta."""
+        blank = self._symbol_codes[self.blank]
+        if pos < lo:
+            cells[0:0] = array("i", [blank]) * (lo - pos)
+            lo = pos
+        elif pos - lo >= len(cells):
+            cells.extend(array("i", [blank]) * (pos - lo + 1 - len(cells)))
+        cells[pos - lo] = code
+        return lo
+
+    # ----------------- acceso ----------------- #
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def states(self) -> List[str]:
+        """Estados distintos que aparecen en el trazado."""
+        return list(self._states)
+
+    def state_at(self, step: int) -> str:
+        return self._states[self._state[step]]
+
+    def head_at(self, step: int) -> int:
+        return self._head[step]
+
+    def delta(self, step: int) -> dict:
+        """Delta del paso (sin reconstruir la cinta)."""
+        return {
+            "step": step,
+            "state": self.state_at(step),
+            "head": self._head[step],
+            "pos": self._pos[step],
+            "written": self._symbols[self._written[step]],
+            "move": {-1: "L", 0: "S", 1: "R"}[self._move[step]],
+        }
+
+    def find_state(self, pattern: str, start: int = 0, backward: bool = False) -> Optional[int]:
+        """
+        Primer paso desde start (incluido) cuyo estado contiene pattern, hacia
+        adelante o hacia atrás; None si no hay ninguno. Solo compara los
+        códigos de estado, sin reconstruir cintas.
+        """
+        codes = {code for code, name in enumerate(self._states) if pattern in name}
+        if not codes:
+            return None
+        steps = range(min(start, len(self) - 1), -1, -1) if backward \
+            else range(max(start, 0), len(self))
+        states = self._state
+        for step in steps:
+            if states[step] in codes:
+                return step
+        return None
+
+    def _codes_at(self, step: int) -> Tuple[int, array]:
+        """
+        (lo, códigos) de la cinta tras el paso, desde el checkpoint anterior
+        o desde la última cinta reconstruida si está entre ambos (recorrer
+        el trazado hacia adelante no vuelve a aplicar los mismos deltas).
+        """
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError(step)
+        base = step - step % self.checkpoint_every
+        lo, codes = self._checkpoints[base]
+        if self._last is not None and base <= self._last[0] <= step:
+            base, lo, codes = self._last
+        cells = array("i", codes)
+        for i in range(base + 1, step + 1):
+            lo = self._apply(cells, lo, self._pos[i], self._written[i])
+        self._last = (step, lo, array("i", cells))
+        return lo, cells
+
+    def tape_at(self, step: int) -> Tuple[int, List[str]]:
+        """(lo, símbolos) de la cinta visitada tras el paso dado."""
+        lo, cells = self._codes_at(step)
+        return lo, [self._symbols[c] for c in cells]
+
+    def render(self, step: int, radius: Optional[int] = None) -> str:
+        """
+        Cinta del paso con el símbolo bajo la cabeza entre corchetes. Con
+        radius, solo radius celdas a cada lado de la cabeza.
+        """
+        lo, cells = self._codes_at(step)
+        return self._render(lo, cells, self._head[step], radius)
+
+    def _render(self, lo: int, cells: array, head: int, radius: Optional[int] = None) -> str:
+        first, last = 0, len(cells)
+        if radius is not None:
+            first = max(first, head - lo - radius)
+            last = min(last, head - lo + radius + 1)
+        symbols = self._symbols
+        text = "".join(
+            f"[{symbols[cells[i]]}]" if lo + i == head else symbols[cells[i]]
+            for i in range(first, last)
+        )
+        if first > 0:
+            text = "…" + text
+        if last < len(cells):
+            text += "…"
+        return text
+
+    def __getitem__(self, step: int) -> dict:
+        if step < 0:
+            step += len(self)
+        return {
+            "step": step,
+            "state": self.state_at(step),
+            "head": self._head[step],
+            "tape": self.render(step),
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        """Recorre los pasos en orden aplicando los deltas sobre una sola cinta."""
+        return self.entries(0, len(self))
+
+    def entries(self, start: int, stop: int, radius: Optional[int] = None) -> Iterator[dict]:
+        """
+        Entradas de los pasos start..stop-1: reconstruye la cinta una sola vez
+        (en start) y aplica los deltas siguientes. Con radius, cada cinta se
+        renderiza solo alrededor de la cabeza (ver render), así que el costo
+        por paso no depende del largo de la cinta.
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return
+        lo, cells = self._codes_at(start)
+        for step in range(start, stop):
+            if step > start:
+                lo = self._apply(cells, lo, self._pos[step], self._written[step])
+            yield {
+                "step": step,
+                "state": self.state_at(step),
+                "head": self._head[step],
+                "tape": self._render(lo, cells, self._head[step], radius),
+            }
+
+    def format_entry(self, entry: dict) -> str:
+        """Formato de texto de una entrada (el mismo que usa la GUI)."""
+        return (
+            f"Paso {entry['step']:>4} | Estado: {entry['state']:<10} | "
+            f"Cabeza: {entry['head']:>3}\n  Cinta: {entry['tape']}\n"
+        )
+
+    # ----------------- exportación ----------------- #
+
+    def export_text(self, out: TextIO) -> None:
+        """Escribe el trazado renderizado, paso por paso."""
+        for entry in self:
+            out.write(self.format_entry(entry))
+
+    def export_jsonl(self, out: TextIO) -> None:
+        """
+        Escribe el trazado compacto: una línea con la cinta inicial y luego
+        un delta por paso.
+        """
+        lo, codes = self._checkpoints[0]
+        out.write(json.dumps({
+            "blank": self.blank,
+            "lo": lo,
+            "tape": "".join(self._symbols[c] for c in codes),
+            "state": self.state_at(0),
+            "head": self._head[0],
+        }, ensure_ascii=False) + "\n")
+        for step in range(1, len(self)):
+            out.write(json.dumps(self.delta(step), ensure_ascii=False) + "\n")
+
+
+def trace_run(tm: TuringMachine, max_steps: Optional[int] = 10_000,
+              checkpoint_every: Optional[int] = None,
+              should_stop: Optional[Callable[[], bool]] = None,
+              on_progress: Optional[Callable[[int, int], None]] = None) -> DeltaTrace:
+    """
+    Corre tm (ya con reset()) hasta que se detenga o llegue a max_steps,
+    registrando cada paso de la cinta 1 en un DeltaTrace.
+
+    - max_steps=None usa el max_steps de la MT.
+    - should_stop() se consulta cada PROGRESS_EVERY pasos; si devuelve True
+      la corrida se detiene con halt_reason HALT_CANCELLED (el trazado
+      queda con los pasos hechos hasta ahí).
+    - on_progress(pasos, max_steps) se llama cada PROGRESS_EVERY pasos y
+      una vez al final.
+    - trace.halt_reason queda con el tm.halt_reason final (None si solo se
+      llegó al max_steps del trazado).
+    """
+    if max_steps is None:
+        max_steps = tm.max_steps
+    trace = DeltaTrace.start(tm, checkpoint_every)
+    tape = tm.tapes[0]
+    check_at = PROGRESS_EVERY if (should_stop or on_progress) else max_steps
+    while not tm.halted and tm.steps < max_steps:
+        if tm.steps >= check_at:
+            check_at += PROGRESS_EVERY
+            if on_progress is not None:
+                on_progress(tm.steps, max_steps)
+            if should_stop is not None and should_stop():
+                tm._halt(HALT_CANCELLED)
+                break
+        pos = tm.heads[0]
+        if not tm.step():
+            break
+        trace.record(tm.current_state, tm.heads[0], pos, tape[pos])
+    if on_progress is not None:
+        on_progress(tm.steps, max_steps)
+    trace.halt_reason = tm.halt_reason
+    return trace
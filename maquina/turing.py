@@ -1,7 +1,10 @@
 # maquina/turing.py
 
+import time
 from dataclasses import dataclass
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
+
+from .tape import EncodedTape, SymbolCodec
 
 
 # Claves y valores de la función de transición para k cintas
@@ -11,6 +14,20 @@ from typing import Dict, Tuple, List
 TransitionKey = Tuple[str, Tuple[str, ...]]
 TransitionVal = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
 
+# Motivos de detención (TuringMachine.halt_reason)
+HALT_ACCEPTED = "accepted"
+HALT_NO_TRANSITION = "no-transition"
+HALT_STEP_LIMIT = "step-limit"
+HALT_TIMEOUT = "timeout"
+HALT_MEMORY_LIMIT = "memory-limit"
+HALT_CANCELLED = "cancelled"
+HALT_CYCLE = "cycle"
+
+# Cada cuántos pasos se consulta el reloj cuando hay timeout
+DEADLINE_CHECK_EVERY = 1024
+
+MOVE_DELTAS = {"L": -1, "R": 1, "S": 0}
+
 
 @dataclass
 class TMConfig:
@@ -25,21 +42,164 @@ class TMConfig:
     max_steps: int = 100_000
 
 
-class TuringMachine:
+class IncompleteRunError(RuntimeError):
+    """
+    La MT se detuvo sin aceptar la entrada, así que la cinta no es una
+    salida válida (p. ej. agotó max_steps o leyó un símbolo sin transición).
+
+    halt_reason es el motivo (HALT_*); output, la cinta parcial.
+    """
+
+    def __init__(self, halt_reason: Optional[str], state: str, steps: int, output: str):
+        super().__init__(
+            f"La MT no aceptó la entrada (estado final {state}, motivo {halt_reason}, "
+            f"{steps} pasos)"
+        )
+        self.halt_reason = halt_reason
+        self.state = state
+        self.steps = steps
+        self.output = output
+
+
+class BudgetMixin:
+    """
+    Presupuestos de ejecución y motivo de detención, compartidos por
+    TuringMachine y CompiledTuringMachine.
+
+    La clase que lo usa debe inicializar en reset(): halted, halt_reason,
+    max_steps, deadline, max_cells y tapes.
+    """
+
+    def set_budget(
+        self,
+        max_steps: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_cells: Optional[int] = None,
+    ) -> None:
+        """
+        Fija presupuestos para la ejecución en curso (None = no cambiar).
+
+        - max_steps: pasos totales permitidos.
+        - timeout: segundos de reloj desde ahora.
+        - max_cells: celdas totales de cinta (sumando todas las cintas).
+
+        reset() vuelve a los valores por defecto.
+        """
+        if max_steps is not None:
+            self.max_steps = max_steps
+        if timeout is not None:
+            self.deadline = time.monotonic() + timeout
+        if max_cells is not None:
+            self.max_cells = max_cells
+
+    def _halt(self, reason: str) -> None:
+        self.halted = True
+        self.halt_reason = reason
+
+    def _tape_contents(self) -> tuple:
+        """(lo, hi, celdas visitadas) de cada cinta, comparables con ==."""
+        return tuple(
+            (tape.lo, tape.hi, tape.cells[tape.lo + tape.origin:tape.hi + tape.origin + 1])
+            for tape in self.tapes
+        )
+
+    def _run_detecting_cycles(self, verbose: bool = False) -> Optional[str]:
+        """
+        Bucle de run(detect_cycles=True): además de los presupuestos, detiene
+        la MT con HALT_CYCLE apenas se repite una configuración (estado,
+        cabezas y cintas). Como la MT es determinista, desde ahí repetiría el
+        mismo ciclo para siempre.
+
+        Usa el algoritmo de Brent: en los pasos 1, 2, 4, 8, ... se guarda la
+        configuración actual como referencia y cada paso se compara con
+        ella, primero estado y cabezas (barato) y solo si coinciden, las
+        cintas. Un ciclo de largo λ al que se entra en el paso μ se detecta
+        antes del paso 2·max(μ, λ) + λ.
+        """
+        deadline = self.deadline
+        ref_state, ref_heads, ref_tapes = self.current_state, list(self.heads), self._tape_contents()
+        power = lam = 1
+        while not self.halted:
+            if self.steps >= self.max_steps:
+                self._halt(HALT_STEP_LIMIT)
+                break
+            if (deadline is not None and self.steps % DEADLINE_CHECK_EVERY == 0
+                    and time.monotonic() >= deadline):
+                self._halt(HALT_TIMEOUT)
+                break
+            if verbose:
+                self.print_configuration()
+            if not self.step():
+                break
+            if (self.current_state == ref_state and self.heads == ref_heads
+                    and self._tape_contents() == ref_tapes):
+                self._halt(HALT_CYCLE)
+                break
+            if lam == power:
+                ref_state, ref_heads, ref_tapes = self.current_state, list(self.heads), self._tape_contents()
+                power *= 2
+                lam = 0
+            lam += 1
+        return self.halt_reason
+
+    def cells_used(self) -> int:
+        """Celdas de cinta visitadas, sumando todas las cintas."""
+        return sum(len(tape) for tape in self.tapes)
+
+
+class TuringMachine(BudgetMixin):
     """
     Máquina de Turing determinista de k cintas.
 
-    - Cada cinta es una lista de símbolos.
-    - Cada cinta tiene su propia cabeza de lectura/escritura.
+    - Cada cinta es una EncodedTape bidireccional (ver maquina/tape.py):
+      guarda un código por celda según un SymbolCodec armado con Γ, en un
+      bytearray si hay a lo más 256 símbolos (1 byte por celda en vez de
+      un puntero de 8 bytes a un str). tapes[i][p] sigue devolviendo el
+      símbolo como string.
+    - Cada cinta tiene su propia cabeza de lectura/escritura, con posición
+      relativa a un origen estable (puede ser negativa).
     - Las transiciones están definidas sobre el estado actual
-      y el k-tuple de símbolos leídos en cada cinta.
+      y el k-tuple de símbolos leídos en cada cinta. Para no armar esa
+      tupla en cada paso, se indexan en un trie de dicts:
+      estado -> código cinta 1 -> ... -> código cinta k -> transición.
+    - Presupuestos de ejecución: max_steps (por defecto el del TMConfig),
+      deadline (reloj monotónico) y max_cells (celdas totales de cinta).
+      Al detenerse, halt_reason indica el motivo (HALT_*).
     """
 
     def __init__(self, config: TMConfig):
         self.config = config
         self.num_tapes = config.num_tapes
+        self.profile = None  # ver enable_profiling
+        self._build_table()
         self.reset([""])
 
+    def _build_table(self) -> None:
+        """Arma el codec de símbolos y el trie de transiciones por códigos."""
+        config = self.config
+        symbols = list(config.tape_alphabet) + [config.blank]
+        for (_q, reads), (_q2, writes, _moves) in config.transitions.items():
+            symbols.extend(reads)
+            symbols.extend(writes)
+        codec = SymbolCodec(symbols)
+
+        trie: Dict[str, dict] = {}
+        for (q, reads), (q2, writes, moves) in config.transitions.items():
+            node = trie.setdefault(q, {})
+            for sym in reads[:-1]:
+                node = node.setdefault(codec.codes[sym], {})
+            deltas = tuple(MOVE_DELTAS.get(m) for m in moves)
+            node[codec.codes[reads[-1]]] = (
+                q2,
+                tuple(codec.codes[w] for w in writes),
+                None if None in deltas else deltas,
+                moves,
+            )
+        self._base_symbols = list(codec.symbols)  # copia: code() agrega al codec
+        self._codec = codec
+        self._table = trie
+        self._accept = frozenset(config.accept_states)
+
     # ----------------- manejo de cinta y estado ----------------- #
 
     def reset(self, input_words: List[str]) -> None:
@@ -50,46 +210,60 @@ class TuringMachine:
         Si la lista es más corta que num_tapes, las cintas faltantes se
         inicializan con una sola celda en blanco.
         """
+        if self.profile is not None:
+            # los pasos pendientes se traducen con el codec con que se leyeron
+            self.profile.flush()
+        if len(self._codec) > len(self._base_symbols):
+            # una entrada anterior internó símbolos ajenos: volver al codec base
+            self._codec = SymbolCodec(self._base_symbols)
+        codec = self._codec
+        if self.profile is not None:
+            self.profile.symbols = codec.symbols
+        blank = self.config.blank
+
         tapes = []
         heads = []
 
         for i in range(self.num_tapes):
             if i < len(input_words) and input_words[i]:
-                tapes.append(list(input_words[i]))
+                tapes.append(EncodedTape(input_words[i], codec, blank))
             else:
-                tapes.append([self.config.blank])
+                tapes.append(EncodedTape(blank, codec, blank))
             heads.append(0)
 
         self.tapes = tapes
         self.heads = heads
         self.current_state = self.config.initial_state
         self.halted = False
+        self.halt_reason: Optional[str] = None
         self.steps = 0
+        self.max_steps = self.config.max_steps
+        self.deadline: Optional[float] = None
+        self.max_cells: Optional[int] = None
+
+    @property
+    def accepted(self) -> bool:
+        """True si la máquina está en un estado de aceptación."""
+        return self.current_state in self._accept
 
     def _ensure_head_in_bounds(self, tape_index: int) -> None:
         """Asegura que la cabeza de la cinta i tenga una celda válida."""
-        head = self.heads[tape_index]
-        tape = self.tapes[tape_index]
-
-        if head < 0:
-            tape.insert(0, self.config.blank)
-            self.heads[tape_index] = 0
-        elif head >= len(tape):
-            tape.append(self.config.blank)
-
-    def _read_all(self) -> Tuple[str, ...]:
-        """Lee el símbolo bajo la cabeza de cada cinta."""
-        symbols = []
-        for i in range(self.num_tapes):
-            self._ensure_head_in_bounds(i)
-            symbols.append(self.tapes[i][self.heads[i]])
-        return tuple(symbols)
+        self.tapes[tape_index].ensure(self.heads[tape_index])
 
-    def _write_all(self, write_symbols: Tuple[str, ...]) -> None:
-        """Escribe en todas las cintas los símbolos dados."""
+    def _lookup(self):
+        """
+        Transición para los símbolos bajo las cabezas (o None), recorriendo
+        el trie con los códigos leídos directo de cada bytearray.
+        """
+        node = self._table.get(self.current_state)
+        tapes = self.tapes
+        heads = self.heads
         for i in range(self.num_tapes):
-            self._ensure_head_in_bounds(i)
-            self.tapes[i][self.heads[i]] = write_symbols[i]
+            if node is None:
+                return None
+            tape = tapes[i]
+            node = node.get(tape.cells[heads[i] + tape.origin])
+        return node
 
     def _move_all(self, moves: Tuple[str, ...]) -> None:
         """Mueve todas las cabezas según L, R o S."""
@@ -113,46 +287,139 @@ class TuringMachine:
         """
         if self.halted:
             return False
+        # El reloj se consulta cada DEADLINE_CHECK_EVERY pasos, igual que en run()
+        if (self.deadline is not None and self.steps % DEADLINE_CHECK_EVERY == 0
+                and time.monotonic() >= self.deadline):
+            self._halt(HALT_TIMEOUT)
+            return False
 
-        if self.current_state in self.config.accept_states:
-            self.halted = True
+        if self.current_state in self._accept:
+            self._halt(HALT_ACCEPTED)
             return False
 
-        read_symbols = self._read_all()
-        key: TransitionKey = (self.current_state, read_symbols)
+        tapes = self.tapes
+        heads = self.heads
+        k = self.num_tapes
+        for i in range(k):
+            tapes[i].ensure(heads[i])
+        if self.max_cells is not None and self.cells_used() > self.max_cells:
+            self._halt(HALT_MEMORY_LIMIT)
+            return False
 
-        if key not in self.config.transitions:
+        transition = self._lookup()
+        if transition is None:
             # sin transición definida => halt
-            self.halted = True
+            self._halt(HALT_NO_TRANSITION)
             return False
 
-        next_state, write_symbols, moves = self.config.transitions[key]
+        next_state, writes, deltas, moves = transition
 
         # escribir, cambiar estado, mover
-        self._write_all(write_symbols)
+        for i in range(k):
+            tape = tapes[i]
+            tape.cells[heads[i] + tape.origin] = writes[i]
         self.current_state = next_state
-        self._move_all(moves)
+        if deltas is None:
+            self._move_all(moves)  # lanza ValueError con el movimiento inválido
+        else:
+            for i in range(k):
+                heads[i] += deltas[i]
 
         self.steps += 1
-        if self.steps >= self.config.max_steps:
-            self.halted = True
+        if self.steps >= self.max_steps:
+            self._halt(HALT_ACCEPTED if self.accepted else HALT_STEP_LIMIT)
 
         return True
 
-    def run(self, verbose: bool = False) -> None:
-        """Corre la MT hasta que se detenga o se alcance max_steps."""
+    def run(
+        self,
+        verbose: bool = False,
+        max_steps: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_cells: Optional[int] = None,
+        detect_cycles: bool = False,
+    ) -> Optional[str]:
+        """
+        Corre la MT hasta que se detenga o se agote algún presupuesto
+        (ver set_budget). Devuelve halt_reason.
+
+        Con detect_cycles=True se detiene con HALT_CYCLE en cuanto una
+        configuración se repite, en vez de agotar max_steps.
+        """
+        self.set_budget(max_steps, timeout, max_cells)
+        if self.profile is None:
+            return self._run(verbose, detect_cycles)
+        self.profile.begin_run(self)
+        try:
+            return self._run(verbose, detect_cycles)
+        finally:
+            self.profile.end_run(self)
+
+    def _run(self, verbose: bool, detect_cycles: bool) -> Optional[str]:
+        if detect_cycles:
+            return self._run_detecting_cycles(verbose)
+        deadline = self.deadline
         while not self.halted:
+            if self.steps >= self.max_steps:
+                self._halt(HALT_STEP_LIMIT)
+                break
+            if (deadline is not None and self.steps % DEADLINE_CHECK_EVERY == 0
+                    and time.monotonic() >= deadline):
+                self._halt(HALT_TIMEOUT)
+                break
             if verbose:
                 self.print_configuration()
             if not self.step():
                 break
+        return self.halt_reason
+
+    # ----------------- perfil ----------------- #
+
+    def enable_profiling(self):
+        """
+        Activa el perfil (ver maquina/profiler.py) y lo devuelve; se
+        acumula entre corridas hasta disable_profiling().
+        """
+        from .profiler import MachineProfile
+
+        if self.profile is None:
+            self.profile = MachineProfile(self.num_tapes, self._codec.symbols)
+            # step de instancia: sin perfil, step() no tiene ningún chequeo extra
+            self.step = self._profiled_step
+        return self.profile
+
+    def disable_profiling(self):
+        """Desactiva el perfil y devuelve el que estaba activo (o None)."""
+        profile = self.profile
+        if profile is not None:
+            profile.flush()
+            self.profile = None
+            del self.step
+        return profile
+
+    def _profiled_step(self) -> bool:
+        """step() que además registra la transición usada en self.profile."""
+        state = self.current_state
+        if self.halted or state in self._accept:
+            # step() se detiene sin tocar las cintas: no hay nada que leer
+            return TuringMachine.step(self)
+        tapes = self.tapes
+        heads = self.heads
+        # el mismo ensure que hace step() antes de leer
+        for i in range(self.num_tapes):
+            tapes[i].ensure(heads[i])
+        codes = tuple(tape.cells[heads[i] + tape.origin] for i, tape in enumerate(tapes))
+        if not TuringMachine.step(self):
+            return False
+        self.profile.record(state, codes, heads)
+        return True
 
     # ----------------- salida y debug ----------------- #
 
     def get_tape(self, tape_index: int = 0, strip_blanks: bool = True) -> str:
         """Retorna el contenido de una cinta como string."""
         tape = self.tapes[tape_index]
-        s = "".join(tape)
+        s = self._codec.decode(tape.visited_codes())
         if strip_blanks:
             return s.strip(self.config.blank)
         return s
@@ -164,7 +431,7 @@ class TuringMachine:
             tape = self.tapes[i]
             head = self.heads[i]
             out = ""
-            for j, sym in enumerate(tape):
+            for j, sym in tape.items():
                 if j == head:
                     out += f"[{sym}]"
                 else:
@@ -0,0 +1,284 @@
+# maquina/vectorized.py
+
+"""
+Motor vectorizado: la misma MT de 1 cinta corriendo sobre N entradas a la
+vez con NumPy.
+
+- Las N cintas son las filas de un array 2-D de códigos de símbolo; las
+  cabezas, estados y contadores son arrays de largo N.
+- Cada iteración avanza un paso a todas las máquinas activas con búsquedas
+  en la tabla compilada (next_state / writes / moves de compiled.py); las
+  que se detienen salen del conjunto activo.
+- Produce las mismas cintas, estados, pasos y halt_reason que N llamadas
+  separadas a TuringMachine.run (salvo timeout/max_cells, que aquí no hay).
+
+NumPy es una dependencia opcional: solo se necesita para este módulo.
+"""
+
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional
+    np = None
+
+from .turing import HALT_ACCEPTED, HALT_NO_TRANSITION, HALT_STEP_LIMIT, TMConfig
+from .compiled import CompiledMachine, compile_machine
+from .batch import BatchResult, strip_key
+from .cache import get_default_cache
+
+
+# Códigos de halt_reason en el array de motivos (0 = sigue corriendo)
+REASONS = [None, HALT_ACCEPTED, HALT_NO_TRANSITION, HALT_STEP_LIMIT]
+_ACCEPTED, _NO_TRANSITION, _STEP_LIMIT = 1, 2, 3
+
+# Blancos extra a cada lado de la cinta al empezar
+MARGIN = 16
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("El motor vectorizado necesita NumPy: pip install numpy")
+
+
+class VectorizedTuringMachine:
+    """
+    N copias de una MT determinista de 1 cinta, avanzadas en bloque.
+
+    Uso:
+        vm = VectorizedTuringMachine(config)
+        vm.reset(["3#HOLA", "5#MUNDO"])
+        vm.run()
+        vm.get_tape(1), vm.current_state(1), vm.steps[1], vm.halt_reason(1)
+
+    Todas las cintas comparten el mismo origen físico; si alguna cabeza se
+    sale del array, se agranda para todas (al doble, como Tape).
+    """
+
+    def __init__(self, machine: Union[TMConfig, CompiledMachine]):
+        _require_numpy()
+        if isinstance(machine, TMConfig):
+            machine = compile_machine(machine)
+        if machine.num_tapes != 1:
+            raise ValueError("El motor vectorizado solo soporta MTs de 1 cinta")
+        self.machine = machine
+        self._next_state = np.asarray(machine.next_state, dtype=np.intp)
+        self._writes = np.asarray(machine.writes, dtype=np.intp)
+        self._moves = np.asarray(machine.moves, dtype=np.intp)
+        self._accept = np.frombuffer(bytes(machine.accept), dtype=np.uint8).astype(bool)
+        self.reset([])
+
+    # ----------------- carga de entradas ----------------- #
+
+    def reset(self, input_words: Sequence[str]) -> None:
+        """Una máquina por palabra, con la cinta inicial como en TuringMachine."""
+        m = self.machine
+        symbols = list(m.symbols)
+        codes = {s: i for i, s in enumerate(symbols)}
+        text = "".join(input_words)
+        for sym in sorted(set(text) - codes.keys()):
+            # símbolo fuera de Γ: al leerlo no hay transición
+            codes[sym] = len(symbols)
+            symbols.append(sym)
+        self._symbols = symbols
+        # code -> símbolo, para decodificar cintas con str.translate
+        self._decode = {i: sym for i, sym in enumerate(symbols)}
+
+        # Todas las entradas se codifican de una vez: cada carácter pasa a
+        # chr(código) y el texto resultante se lee como UTF-32.
+        table = {ord(sym): chr(code) for sym, code in codes.items() if len(sym) == 1}
+        flat = np.frombuffer(text.translate(table).encode("utf-32-le"), dtype="<u4")
+        lengths = np.fromiter(map(len, input_words), dtype=np.intp, count=len(input_words))
+
+        n = len(lengths)
+        width = max(int(lengths.max()) if n else 0, 1) + 2 * MARGIN
+        dtype = np.uint8 if len(symbols) <= 256 else np.int32
+        self.tapes = np.full((n, width), m.blank, dtype=dtype)
+        if flat.size:
+            starts = np.cumsum(lengths) - lengths
+            rows = np.repeat(np.arange(n), lengths)
+            cols = np.arange(flat.size) - np.repeat(starts, lengths) + MARGIN
+            self.tapes[rows, cols] = flat
+        self.origin = MARGIN
+        self.pos = np.full(n, MARGIN, dtype=np.intp)
+        # rango visitado de cada cinta (índices físicos), igual que Tape.lo/hi;
+        # una entrada vacía empieza con una celda en blanco
+        self.lo = self.pos.copy()
+        self.hi = MARGIN + np.maximum(lengths, 1) - 1
+        self.states = np.full(n, m.initial_state, dtype=np.intp)
+        self.steps = np.zeros(n, dtype=np.intp)
+        self.reasons = np.zeros(n, dtype=np.int8)
+        self.max_steps = m.max_steps
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def _grow(self, pos) -> int:
+        """
+        Agranda todas las cintas para que pos quepa en el array. Devuelve
+        cuántas celdas se agregaron a la izquierda (las posiciones físicas
+        de self.pos/lo/hi ya quedan corridas).
+        """
+        n, width = self.tapes.shape
+        left = right = 0
+        low, high = int(pos.min()), int(pos.max())
+        if low < 0:
+            left = max(width, -low)
+        if high >= width:
+            right = max(width, high - width + 1)
+        tapes = np.full((n, width + left + right), self.machine.blank, dtype=self.tapes.dtype)
+        tapes[:, left:left + width] = self.tapes
+        self.tapes = tapes
+        if left:
+            self.origin += left
+            self.pos += left
+            self.lo += left
+            self.hi += left
+        return left
+
+    # ----------------- ejecución ----------------- #
+
+    def run(self, max_steps: Optional[int] = None) -> None:
+        """
+        Corre todas las máquinas hasta que se detengan o lleguen a max_steps
+        (por defecto el del TMConfig).
+        """
+        if max_steps is not None:
+            self.max_steps = max_steps
+        limit = self.max_steps
+        g = self.machine.num_symbols
+        next_state = self._next_state
+        writes = self._writes
+        moves = self._moves
+        accept = self._accept
+        reasons = self.reasons
+
+        rows = np.flatnonzero(reasons == 0)
+        n = int(self.steps[rows].max()) if rows.size else 0
+        done = accept[self.states[rows]]
+        reasons[rows[done]] = _ACCEPTED
+        rows = rows[~done]
+
+        # Estado compacto de las máquinas activas; se vuelca a los arrays
+        # por máquina solo cuando alguna se detiene.
+        state = self.states[rows]
+        pos = self.pos[rows]
+        lo = self.lo[rows]
+        hi = self.hi[rows]
+
+        def retire(mask, reason: int) -> None:
+            gone = rows[mask]
+            reasons[gone] = reason
+            self.states[gone] = state[mask]
+            self.pos[gone] = pos[mask]
+            self.lo[gone] = lo[mask]
+            self.hi[gone] = hi[mask]
+            self.steps[gone] = n
+
+        while rows.size:
+            if n >= limit:
+                retire(slice(None), _STEP_LIMIT)
+                break
+            width = self.tapes.shape[1]
+            if pos.min() < 0 or pos.max() >= width:
+                shift = self._grow(pos)
+                pos += shift
+                lo += shift
+                hi += shift
+                width = self.tapes.shape[1]
+            np.minimum(lo, pos, out=lo)
+            np.maximum(hi, pos, out=hi)
+
+            flat = self.tapes.reshape(-1)
+            cell = rows * width + pos
+            read = flat[cell].astype(np.intp)
+            index = state * g + np.minimum(read, g - 1)
+            nxt = next_state[index]
+            dead = (nxt < 0) | (read >= g)
+            if dead.any():
+                retire(dead, _NO_TRANSITION)
+                keep = ~dead
+                rows, state, pos, lo, hi = rows[keep], state[keep], pos[keep], lo[keep], hi[keep]
+                cell, index, nxt = cell[keep], index[keep], nxt[keep]
+
+            flat[cell] = writes[index]
+            state = nxt
+            pos = pos + moves[index]
+            n += 1
+
+            done = accept[state]
+            if done.any():
+                retire(done, _ACCEPTED)
+                keep = ~done
+                rows, state, pos, lo, hi = rows[keep], state[keep], pos[keep], lo[keep], hi[keep]
+
+    # ----------------- resultados ----------------- #
+
+    def get_tape(self, index: int, strip_blanks: bool = True) -> str:
+        """Cinta visitada de la máquina index, como TuringMachine.get_tape."""
+        row = self.tapes[index, self.lo[index]:self.hi[index] + 1]
+        if row.dtype == np.uint8:
+            raw = row.tobytes().decode("latin-1")
+        else:
+            raw = row.astype("<u4").tobytes().decode("utf-32-le")
+        s = raw.translate(self._decode)
+        if strip_blanks:
+            return s.strip(self._symbols[self.machine.blank])
+        return s
+
+    def current_state(self, index: int) -> str:
+        return self.machine.states[self.states[index]]
+
+    def accepted(self, index: int) -> bool:
+        return bool(self._accept[self.states[index]])
+
+    def head(self, index: int) -> int:
+        """Cabeza lógica (relativa a la primera celda de la entrada)."""
+        return int(self.pos[index]) - self.origin
+
+    def halt_reason(self, index: int) -> Optional[str]:
+        return REASONS[self.reasons[index]]
+
+
+def run_many_vectorized(
+    mt_path: Union[str, Path],
+    input_words: Iterable[str],
+    chunk_size: int = 4096,
+) -> Iterator[BatchResult]:
+    """
+    Como batch.run_many, pero corriendo cada bloque de chunk_size entradas
+    en una VectorizedTuringMachine. Los resultados salen en orden.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser >= 1")
+    vm = VectorizedTuringMachine(get_default_cache().get_compiled(mt_path))
+    it = iter(input_words)
+    start = 0
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        words = [w for w in chunk if isinstance(w, str)]
+        vm.reset(words)
+        vm.run()
+        r = 0
+        for i, word in enumerate(chunk):
+            if not isinstance(word, str):
+                yield BatchResult(start + i, word, None, False, 0,
+                                  f"Entrada inválida (se esperaba str): {word!r}")
+                continue
+            yield _result(vm, r, start + i, word)
+            r += 1
+        start += len(chunk)
+
+
+def _result(vm: VectorizedTuringMachine, r: int, index: int, word: str) -> BatchResult:
+    accepted = vm.accepted(r)
+    error = None
+    if not accepted:
+        error = (f"La MT no aceptó la entrada (estado final {vm.current_state(r)}, "
+                 f"motivo {vm.halt_reason(r)})")
+    return BatchResult(index, word, strip_key(vm.get_tape(r)), accepted,
+                       int(vm.steps[r]), error, vm.halt_reason(r))
@@ -0,0 +1,125 @@
+# tests/conftest.py
+
+import itertools
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+EJEMPLOS = ROOT / "ejemplos"
+
+# maquina/ no es un paquete instalado: se importa desde la raíz del repo
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from maquina.turing import TMConfig  # noqa: E402
+
+CAESAR_MACHINES = ["mt_encoder", "mt_decoder", "mt_encoder_26", "mt_decoder_26"]
+
+# Alfabeto de las MTs aleatorias; "z" no está en Γ (entrada ajena)
+SIGMA = ["a", "b", "c"]
+BLANK = "_"
+
+
+@pytest.fixture(scope="session")
+def encoder_path() -> Path:
+    return EJEMPLOS / "mt_encoder.json"
+
+
+@pytest.fixture(scope="session")
+def decoder_path() -> Path:
+    return EJEMPLOS / "mt_decoder.json"
+
+
+def reference_run(config: TMConfig, words: List[str]) -> Tuple[List[str], str, int]:
+    """
+    Simulador de referencia: el TuringMachine original (cintas como listas,
+    sin caché ni tablas). Devuelve (cintas sin recortar, estado, pasos).
+    """
+    blank = config.blank
+    k = config.num_tapes
+    tapes = [list(words[i]) if i < len(words) and words[i] else [blank] for i in range(k)]
+    heads = [0] * k
+    state = config.initial_state
+    steps = 0
+    while state not in config.accept_states:
+        for i in range(k):
+            if heads[i] < 0:
+                tapes[i].insert(0, blank)
+                heads[i] = 0
+            elif heads[i] >= len(tapes[i]):
+                tapes[i].append(blank)
+        key = (state, tuple(tapes[i][heads[i]] for i in range(k)))
+        if key not in config.transitions:
+            break
+        state, writes, moves = config.transitions[key]
+        for i in range(k):
+            tapes[i][heads[i]] = writes[i]
+            heads[i] += {"L": -1, "R": 1, "S": 0}[moves[i]]
+        steps += 1
+        if steps >= config.max_steps:
+            break
+    return ["".join(t) for t in tapes], state, steps
+
+
+def random_config(rng: random.Random, num_tapes: int, num_states: int = 5) -> TMConfig:
+    """
+    MT aleatoria de num_tapes cintas sobre Σ = {a, b, c}: algunas
+    combinaciones sin transición, estados de barrido (lazos que mueven
+    siempre igual), un estado inalcanzable y destinos que no están en Q.
+    """
+    states = [f"q{i}" for i in range(num_states)]
+    gamma = SIGMA + [BLANK]
+    transitions = {}
+    for q in states + ["qMuerto"]:
+        sweep = rng.choice("LR") if rng.random() < 0.3 else None
+        for reads in itertools.product(gamma, repeat=num_tapes):
+            if rng.random() < 0.04:
+                continue
+            writes = tuple(rng.choice(gamma) for _ in range(num_tapes))
+            if sweep and reads[0] != BLANK and rng.random() < 0.8:
+                q2, moves = q, (sweep,) * num_tapes
+            else:
+                # pocas salidas a qf/qExtra: corridas largas además de cortas
+                roll = rng.random()
+                q2 = "qf" if roll < 0.03 else "qExtra" if roll < 0.04 else rng.choice(states)
+                moves = tuple(rng.choice("LRS") for _ in range(num_tapes))
+            transitions[(q, reads)] = (q2, writes, moves)
+    return TMConfig(
+        states=states + ["qf", "qMuerto"],
+        input_alphabet=list(SIGMA),
+        tape_alphabet=gamma,
+        blank=BLANK,
+        initial_state="q0",
+        accept_states=["qf"],
+        transitions=transitions,
+        num_tapes=num_tapes,
+        max_steps=rng.choice([40, 400]),
+    )
+
+
+def random_words(rng: random.Random, num_tapes: int, n: int, foreign: bool = True) -> List[List[str]]:
+    """n entradas (una palabra por cinta); con foreign, ~1 de cada 5 trae una "z" ajena a Γ."""
+    out = []
+    for _ in range(n):
+        words = ["".join(rng.choice(SIGMA) for _ in range(rng.randint(0, 12)))
+                 for _ in range(rng.randint(1, num_tapes))]
+        if foreign and words[0] and rng.random() < 0.2:
+            i = rng.randrange(len(words[0]))
+            words[0] = words[0][:i] + "z" + words[0][i + 1:]
+        out.append(words)
+    return out
+
+
+@pytest.fixture(scope="session")
+def random_machines() -> List[Tuple[TMConfig, List[List[str]]]]:
+    """MTs aleatorias de 1 a 3 cintas con sus entradas (semillas fijas)."""
+    machines = []
+    for seed in range(36):
+        rng = random.Random(seed)
+        k = seed % 3 + 1
+        machines.append((random_config(rng, k), random_words(rng, k, 12)))
+    return machines
@@ -0,0 +1,46 @@
+# tests/test_batch.py
+
+import json
+
+import pytest
+
+from maquina.batch import run_many
+from maquina.encoder_mt import encrypt_many
+from maquina.parallel import run_parallel
+from maquina.turing import HALT_CYCLE, HALT_STEP_LIMIT
+
+
+@pytest.fixture
+def cycling_path(tmp_path):
+    """MT que se queda para siempre en q0 con movimientos S si lee "b"."""
+    spec = {
+        "Q": ["q0", "qf"], "Sigma": ["a", "b"], "Gamma": ["a", "b", "_"],
+        "blank": "_", "q0": "q0", "F": ["qf"], "num_tapes": 1, "max_steps": 10_000,
+        "transitions": [
+            ["q0", ["a"], "q0", ["a"], ["R"]],
+            ["q0", ["b"], "q0", ["b"], ["S"]],
+            ["q0", ["_"], "qf", ["_"], ["S"]],
+        ],
+    }
+    path = tmp_path / "ciclo.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+def test_parallel_matches_serial(encoder_path):
+    words = [f"{k}#HOLA MUNDO" for k in range(27)] + ["3#hola", 42]
+    serial = list(encrypt_many(words, str(encoder_path)))
+    parallel = list(encrypt_many(words, str(encoder_path), workers=2, chunk_size=5))
+    assert parallel == serial
+    assert [r.ok for r in serial].count(False) == 2
+
+
+def test_parallel_detects_cycles(cycling_path):
+    words = ["aab", "aaa"]
+    serial = list(run_many(cycling_path, words, detect_cycles=True))
+    parallel = list(run_parallel(cycling_path, words, workers=2, chunk_size=1,
+                                 detect_cycles=True))
+    assert [r.halt_reason for r in serial] == [HALT_CYCLE, "accepted"]
+    assert parallel == serial
+    plain = list(run_parallel(cycling_path, words, workers=2, chunk_size=1))
+    assert plain[0].halt_reason == HALT_STEP_LIMIT
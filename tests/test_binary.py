@@ -0,0 +1,156 @@
+# tests/test_binary.py
+
+"""
+Formato .tmc: ida y vuelta JSON -> .tmc -> tablas/TMConfig, y la caché
+de disco de cache.py ante un .tmc viejo (source distinto) o dañado (CRC).
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import CAESAR_MACHINES, EJEMPLOS, reference_run
+from maquina.binary import (
+    BinaryFormatError,
+    HEADER,
+    compile_file,
+    dumps_binary,
+    load_binary,
+    loads_binary,
+)
+from maquina.cache import MachineCache, precompiled_path
+from maquina.compiled import CompiledTuringMachine, compile_machine
+from maquina.parser import load_mt_from_json
+from maquina.turing import TuringMachine
+
+
+def _tables(m):
+    return (m.states, m.symbols, m.num_tapes, m.blank, m.initial_state, bytes(m.accept),
+            list(m.next_state), list(m.writes), list(m.moves), m.max_steps)
+
+
+def _check_same_behavior(config, other, words):
+    tm = TuringMachine(other)
+    for word in words:
+        tapes, state, steps = reference_run(config, word)
+        tm.reset(word)
+        tm.run()
+        got = [tm.get_tape(t, strip_blanks=False) for t in range(config.num_tapes)]
+        assert (got, tm.current_state, tm.steps) == (tapes, state, steps), word
+
+
+def test_roundtrip_random_machines(random_machines):
+    for config, words in random_machines:
+        binary = loads_binary(dumps_binary(config))
+        assert _tables(binary.machine) == _tables(compile_machine(config))
+        _check_same_behavior(config, binary.to_config(), words)
+
+
+@pytest.mark.parametrize("name", CAESAR_MACHINES)
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_roundtrip_caesar_file(name, use_mmap, tmp_path):
+    json_path = EJEMPLOS / f"{name}.json"
+    config = load_mt_from_json(str(json_path))
+    out = compile_file(str(json_path), str(tmp_path / f"{name}.tmc"))
+    binary = load_binary(out, use_mmap=use_mmap)
+    assert _tables(binary.machine) == _tables(compile_machine(config))
+    assert binary.meta["source"] == [json_path.stat().st_mtime_ns, json_path.stat().st_size]
+
+    words = [["3#HOLA MUNDO"], ["25#ZZ TOP."], ["0#"], ["3#hola"], ["#X"]]
+    _check_same_behavior(config, binary.to_config(), words)
+    tm = CompiledTuringMachine(binary.machine)
+    for word in words:
+        tapes, state, steps = reference_run(config, word)
+        tm.reset(word)
+        tm.run()
+        assert (tm.get_tape(0, strip_blanks=False), tm.current_state, tm.steps) == \
+            (tapes[0], state, steps)
+
+
+@pytest.fixture
+def json_copy(encoder_path, tmp_path):
+    path = tmp_path / "mt_encoder.json"
+    shutil.copy(encoder_path, path)
+    return path
+
+
+def test_cache_uses_fresh_tmc(json_copy):
+    compile_file(json_copy)
+    cache = MachineCache()
+    cache.get_compiled(json_copy)
+    assert (cache.misses, cache.disk_hits) == (1, 1)
+
+
+def test_stale_source_is_ignored(json_copy):
+    """Si el JSON cambia después de compilar, el .tmc viejo no se usa."""
+    compile_file(json_copy)
+    old = load_binary(precompiled_path(json_copy)).meta["source"]
+
+    spec = json.loads(json_copy.read_text(encoding="utf-8"))
+    spec["max_steps"] = 1234
+    json_copy.write_text(json.dumps(spec), encoding="utf-8")
+    st = json_copy.stat()
+    os.utime(json_copy, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    cache = MachineCache()
+    assert cache.get_compiled(json_copy).max_steps == 1234
+    assert cache.disk_hits == 0
+
+    # La caché reescribió el .tmc con el source nuevo: un proceso nuevo lo usa
+    meta = load_binary(precompiled_path(json_copy)).meta
+    assert meta["source"] != old
+    fresh = MachineCache()
+    assert fresh.get_compiled(json_copy).max_steps == 1234
+    assert fresh.disk_hits == 1
+
+
+def test_tmc_without_source_is_ignored(json_copy):
+    """Un .tmc sin source (dumps_binary a mano) no se sabe de qué JSON salió."""
+    config = load_mt_from_json(str(json_copy))
+    precompiled_path(json_copy).write_bytes(dumps_binary(config))
+    cache = MachineCache()
+    cache.get_compiled(json_copy)
+    assert cache.disk_hits == 0
+
+
+def _corrupt(path, offset):
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+
+def test_bad_crc_raises(json_copy):
+    out = compile_file(json_copy)
+    _corrupt(out, len(out.read_bytes()) - 1)
+    with pytest.raises(BinaryFormatError, match="Checksum"):
+        load_binary(out)
+    load_binary(out, verify=False)  # sin verificar se lee igual
+
+
+def test_bad_header_raises(json_copy, tmp_path):
+    out = compile_file(json_copy)
+    _corrupt(out, 0)
+    with pytest.raises(BinaryFormatError, match="Firma"):
+        load_binary(out)
+    short = tmp_path / "corto.tmc"
+    short.write_bytes(out.read_bytes()[:HEADER.size - 1])
+    with pytest.raises(BinaryFormatError):
+        load_binary(short)
+
+
+def test_cache_falls_back_on_bad_crc(json_copy):
+    """Un .tmc dañado se descarta: se vuelve al JSON y se regenera el .tmc."""
+    expected = _tables(compile_machine(load_mt_from_json(str(json_copy))))
+    out = compile_file(json_copy)
+    _corrupt(out, len(out.read_bytes()) - 1)
+
+    cache = MachineCache()
+    assert _tables(cache.get_compiled(json_copy)) == expected
+    assert cache.disk_hits == 0
+    assert _tables(load_binary(out).machine) == expected
+
+    fresh = MachineCache()
+    assert _tables(fresh.get_compiled(json_copy)) == expected
+    assert fresh.disk_hits == 1
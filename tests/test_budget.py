@@ -0,0 +1,48 @@
+# tests/test_budget.py
+
+import json
+
+import pytest
+
+import maquina.compiled as compiled
+from maquina.cache import get_default_cache
+from maquina.compiled import CompiledTuringMachine
+from maquina.encoder_mt import encrypt
+from maquina.turing import (
+    DEADLINE_CHECK_EVERY,
+    HALT_NO_TRANSITION,
+    HALT_STEP_LIMIT,
+    HALT_TIMEOUT,
+    IncompleteRunError,
+)
+
+
+def test_compiled_run_checks_deadline_every_slice(encoder_path, monkeypatch):
+    """Con timeout, run() no pasa más de DEADLINE_CHECK_EVERY pasos sin mirar el reloj."""
+    clock = iter([0.0] + [10.0] * 10)
+    monkeypatch.setattr(compiled.time, "monotonic", lambda: next(clock))
+    tm = CompiledTuringMachine(get_default_cache().get_compiled(encoder_path))
+    tm.reset(["3#" + "HOLA MUNDO " * 10_000])
+    tm.deadline = 5.0
+    assert tm.run() == HALT_TIMEOUT
+    assert 0 < tm.steps <= DEADLINE_CHECK_EVERY
+
+
+def test_encrypt_rejects_invalid_input(encoder_path):
+    with pytest.raises(IncompleteRunError) as info:
+        encrypt("3#hola", str(encoder_path))
+    assert info.value.halt_reason == HALT_NO_TRANSITION
+    assert info.value.output == "3#hola"
+
+
+def test_encrypt_reports_step_limit(encoder_path, tmp_path):
+    """Un mensaje que agota max_steps no se devuelve truncado."""
+    spec = json.loads(encoder_path.read_text(encoding="utf-8"))
+    spec["max_steps"] = 50
+    path = tmp_path / "mt_encoder.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    with pytest.raises(IncompleteRunError) as info:
+        encrypt("3#" + "HOLA" * 100, str(path))
+    assert info.value.halt_reason == HALT_STEP_LIMIT
+    assert info.value.steps == 50
+    assert encrypt("3#HOLA", str(path)) == "KROD"
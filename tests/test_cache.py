@@ -0,0 +1,34 @@
+# tests/test_cache.py
+
+import shutil
+import threading
+
+from maquina.binary import compile_file
+from maquina.cache import MachineCache, precompiled_path
+
+
+def test_counters_under_concurrent_loads(encoder_path, tmp_path):
+    """Cargas simultáneas (fuera del lock) no pierden cuentas."""
+    paths = []
+    for i in range(32):
+        path = tmp_path / f"mt_{i}.json"
+        shutil.copy(encoder_path, path)
+        compile_file(str(path), str(precompiled_path(path)))
+        paths.append(path)
+
+    cache = MachineCache(max_size=64)
+    barrier = threading.Barrier(8)
+
+    def load(chunk):
+        barrier.wait()
+        for path in chunk:
+            cache.get_compiled(path)
+
+    threads = [threading.Thread(target=load, args=(paths[i::8],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.misses == 32
+    assert cache.disk_hits == 32
+    assert cache.load_seconds > 0
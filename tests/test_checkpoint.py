@@ -0,0 +1,135 @@
+# tests/test_checkpoint.py
+
+"""
+Checkpoints (.tmk): guardar a mitad de corrida y seguir en otro motor da
+el mismo resultado que una sola corrida; un .tmk dañado o de otra MT se
+rechaza con CheckpointError.
+"""
+
+import random
+
+import pytest
+
+from conftest import CAESAR_MACHINES, EJEMPLOS, reference_run
+from maquina.checkpoint import (
+    CheckpointError,
+    HEADER,
+    dumps_checkpoint,
+    load_checkpoint,
+    restore_checkpoint,
+    run_with_checkpoints,
+    save_checkpoint,
+)
+from maquina.compiled import CompiledTuringMachine
+from maquina.parser import load_mt_from_json
+from maquina.turing import TuringMachine
+
+ENGINES = {"interprete": TuringMachine, "compilado": CompiledTuringMachine}
+PAIRS = [(a, b) for a in ENGINES for b in ENGINES]
+
+
+def _snapshot(tm):
+    return ([tm.get_tape(t, strip_blanks=False) for t in range(tm.num_tapes)],
+            tm.current_state, tm.steps)
+
+
+def _check_resume(config, words, src, dst, rng):
+    """Corre unos pasos en src, guarda, restaura en dst y termina ahí."""
+    a = ENGINES[src](config)
+    b = ENGINES[dst](config)
+    for word in words:
+        a.reset(word)
+        for _ in range(rng.randint(0, 60)):
+            if not a.step():
+                break
+        data = dumps_checkpoint(a)
+        restore_checkpoint(b, data)
+        assert _snapshot(b) == _snapshot(a), word
+        assert b.halt_reason == a.halt_reason, word
+        b.run()
+        assert _snapshot(b) == reference_run(config, word), word
+
+
+@pytest.mark.parametrize("src,dst", PAIRS)
+def test_resume_random_machines(src, dst, random_machines):
+    rng = random.Random(0)
+    for config, words in random_machines:
+        _check_resume(config, words, src, dst, rng)
+
+
+@pytest.mark.parametrize("name", CAESAR_MACHINES)
+@pytest.mark.parametrize("src,dst", PAIRS)
+def test_resume_caesar(name, src, dst):
+    config = load_mt_from_json(str(EJEMPLOS / f"{name}.json"))
+    words = [["3#ROMA NO FUE CONSTRUIDA EN UN DIA."], ["25#XYZ"], ["3#hola"]]
+    _check_resume(config, words, src, dst, random.Random(1))
+
+
+@pytest.fixture
+def encoder(encoder_path):
+    return load_mt_from_json(str(encoder_path))
+
+
+def _half_run(config, word="3#ROMA NO FUE CONSTRUIDA EN UN DIA.", steps=40):
+    tm = TuringMachine(config)
+    tm.reset([word])
+    for _ in range(steps):
+        tm.step()
+    return tm
+
+
+def test_bad_crc(encoder, tmp_path):
+    path = tmp_path / "corrida.tmk"
+    save_checkpoint(_half_run(encoder), path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(CheckpointError, match="Checksum"):
+        load_checkpoint(path, TuringMachine(encoder))
+
+
+def test_bad_header(encoder):
+    data = dumps_checkpoint(_half_run(encoder))
+    with pytest.raises(CheckpointError, match="Firma"):
+        restore_checkpoint(TuringMachine(encoder), b"XXXX" + data[4:])
+    with pytest.raises(CheckpointError):
+        restore_checkpoint(TuringMachine(encoder), data[:HEADER.size - 1])
+
+
+def test_other_machine(encoder, decoder_path):
+    data = dumps_checkpoint(_half_run(encoder))
+    decoder = load_mt_from_json(str(decoder_path))
+    for engine in ENGINES.values():
+        with pytest.raises(CheckpointError, match="otra MT"):
+            restore_checkpoint(engine(decoder), data)
+
+
+def test_run_with_checkpoints_resumes(encoder, tmp_path):
+    """Un .tmk de una corrida interrumpida se retoma en otro motor."""
+    word = "3#ROMA NO FUE CONSTRUIDA EN UN DIA."
+    expected = reference_run(encoder, [word])
+    path = tmp_path / "corrida.tmk"
+    save_checkpoint(_half_run(encoder, word, steps=25), path)
+
+    tm = CompiledTuringMachine(encoder)
+    tm.reset(["otra entrada"])  # se descarta: manda el checkpoint
+    run_with_checkpoints(tm, path, every=7)
+    assert _snapshot(tm) == expected
+
+    # El último checkpoint es la configuración final
+    final = load_checkpoint(path, TuringMachine(encoder))
+    assert _snapshot(final) == expected
+    assert final.halted
+
+
+def test_run_with_checkpoints_matches_run(encoder, tmp_path):
+    word = "3#ROMA NO FUE CONSTRUIDA EN UN DIA."
+    tm = TuringMachine(encoder)
+    tm.reset([word])
+    reason = run_with_checkpoints(tm, tmp_path / "corrida.tmk", every=5, resume=False)
+    plain = TuringMachine(encoder)
+    plain.reset([word])
+    assert reason == plain.run()
+    assert _snapshot(tm) == _snapshot(plain)
+    with pytest.raises(ValueError):
+        run_with_checkpoints(tm, tmp_path / "otra.tmk", every=0)
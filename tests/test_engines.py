@@ -0,0 +1,126 @@
+# tests/test_engines.py
+
+"""
+Todos los motores contra el simulador de referencia (el TuringMachine
+original): mismas cintas, estado final y pasos, en MTs aleatorias de 1 a
+3 cintas y en las MTs de César.
+"""
+
+import random
+
+import pytest
+
+from conftest import CAESAR_MACHINES, EJEMPLOS, reference_run
+from maquina.codegen import GeneratedTuringMachine
+from maquina.compiled import CompiledTuringMachine
+from maquina.online import OnlineTuringMachine
+from maquina.parser import load_mt_from_json
+from maquina.turing import HALT_ACCEPTED, HALT_NO_TRANSITION, HALT_STEP_LIMIT, TuringMachine
+
+ENGINES = {
+    "interprete": TuringMachine,
+    "compilado": CompiledTuringMachine,
+    "generado": lambda config: GeneratedTuringMachine(config, cache_dir=None),
+}
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ .#"
+
+
+def caesar_words(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    words = []
+    for _ in range(n):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        key = str(rng.randint(0, 30))
+        if rng.random() < 0.1:
+            text += "x"  # minúscula: fuera de Γ
+        words.append([f"{key}#{text}"])
+    return words
+
+
+@pytest.fixture(scope="module", params=CAESAR_MACHINES)
+def caesar_machine(request):
+    return load_mt_from_json(str(EJEMPLOS / f"{request.param}.json")), caesar_words(40)
+
+
+def _expected_reason(config, state, steps):
+    if state in config.accept_states:
+        return HALT_ACCEPTED
+    return HALT_STEP_LIMIT if steps >= config.max_steps else HALT_NO_TRANSITION
+
+
+def _check_engine(factory, config, words, stepwise=False):
+    tm = factory(config)
+    for word in words:
+        tapes, state, steps = reference_run(config, word)
+        tm.reset(word)
+        if stepwise:
+            while tm.step():
+                pass
+        else:
+            tm.run()
+        got = [tm.get_tape(t, strip_blanks=False) for t in range(config.num_tapes)]
+        assert (got, tm.current_state, tm.steps) == (tapes, state, steps), word
+        assert tm.halt_reason == _expected_reason(config, state, steps), word
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_random_machines(engine, random_machines):
+    for config, words in random_machines:
+        _check_engine(ENGINES[engine], config, words)
+
+
+@pytest.mark.parametrize("engine", ["interprete", "compilado"])
+def test_random_machines_stepwise(engine, random_machines):
+    for config, words in random_machines:
+        _check_engine(ENGINES[engine], config, words, stepwise=True)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_caesar_machines(engine, caesar_machine):
+    config, words = caesar_machine
+    _check_engine(ENGINES[engine], config, words)
+
+
+def _check_vectorized(config, words):
+    from maquina.vectorized import VectorizedTuringMachine
+
+    vm = VectorizedTuringMachine(config)
+    vm.reset([w[0] for w in words])
+    vm.run()
+    for r, word in enumerate(words):
+        tapes, state, steps = reference_run(config, word)
+        got = (vm.get_tape(r, strip_blanks=False), vm.current_state(r), int(vm.steps[r]))
+        assert got == (tapes[0], state, steps), word
+        assert vm.halt_reason(r) == _expected_reason(config, state, steps), word
+
+
+def test_vectorized(random_machines, caesar_machine):
+    pytest.importorskip("numpy")
+    for config, words in random_machines:
+        if config.num_tapes == 1:
+            _check_vectorized(config, [w[:1] for w in words])
+    _check_vectorized(*caesar_machine)
+
+
+def _check_online(config, words, seed=0):
+    rng = random.Random(seed)
+    for word in words:
+        tapes, state, steps = reference_run(config, word[:1])
+        om = OnlineTuringMachine(config, max_steps=config.max_steps)
+        text = word[0]
+        out = []
+        while text:
+            cut = rng.randint(1, 7)
+            out.append(om.feed(text[:cut]))
+            text = text[cut:]
+        out.append(om.close())
+        assert "".join(out) == tapes[0].strip(config.blank), word
+        assert om.tm.current_state == state and om.tm.steps == steps, word
+
+
+def test_online(random_machines, caesar_machine):
+    for config, words in random_machines:
+        if config.num_tapes == 1:
+            _check_online(config, words)
+    _check_online(*caesar_machine)
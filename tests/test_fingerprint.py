@@ -0,0 +1,41 @@
+# tests/test_fingerprint.py
+
+import json
+
+from maquina.binary import compile_file, load_binary
+from maquina.cache import MachineCache
+from maquina.checkpoint import _fingerprint
+from maquina.compiled import CompiledTuringMachine, compile_machine, machine_fingerprint
+from maquina.parser import load_mt_from_json
+from maquina.turing import TuringMachine
+
+
+def test_same_machine_same_fingerprint(encoder_path, tmp_path):
+    """JSON, .tmc, caché y ambos motores dan el mismo fingerprint."""
+    config = load_mt_from_json(str(encoder_path))
+    expected = machine_fingerprint(compile_machine(config))
+
+    tmc = tmp_path / "mt_encoder.tmc"
+    compile_file(str(encoder_path), str(tmc))
+    machine = load_binary(str(tmc)).machine
+    assert machine_fingerprint(machine) == expected
+    assert MachineCache().get_fingerprint(encoder_path) == expected
+    assert _fingerprint(TuringMachine(config)) == expected
+    assert _fingerprint(CompiledTuringMachine(machine)) == expected
+
+
+def test_fingerprint_ignores_transition_order(encoder_path, tmp_path):
+    spec = json.loads(encoder_path.read_text(encoding="utf-8"))
+    spec["transitions"].reverse()
+    spec["max_steps"] = 7
+    path = tmp_path / "reordenada.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    a = machine_fingerprint(compile_machine(load_mt_from_json(str(encoder_path))))
+    b = machine_fingerprint(compile_machine(load_mt_from_json(str(path))))
+    assert a == b
+
+
+def test_different_machines_differ(encoder_path, decoder_path):
+    a = machine_fingerprint(compile_machine(load_mt_from_json(str(encoder_path))))
+    b = machine_fingerprint(compile_machine(load_mt_from_json(str(decoder_path))))
+    assert a != b
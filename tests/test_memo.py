@@ -0,0 +1,82 @@
+# tests/test_memo.py
+
+from maquina.encoder_mt import encrypt
+from maquina.memo import ResultCache
+
+FP = "f" * 64
+
+
+def test_evicts_least_recently_used():
+    memo = ResultCache(max_entries=3)
+    for word in "abc":
+        memo.put(FP, word, word.upper())
+    assert memo.get(FP, "a") == "A"  # "a" pasa a ser el más reciente
+    memo.put(FP, "d", "D")
+    assert len(memo) == 3
+    assert memo.get(FP, "b") is None
+    assert [memo.get(FP, w) for w in "acd"] == ["A", "C", "D"]
+    assert (memo.hits, memo.misses) == (4, 1)
+
+
+def test_evicts_by_bytes():
+    memo = ResultCache(max_bytes=10)
+    memo.put(FP, "ab", "AB")  # 4 bytes
+    memo.put(FP, "cd", "CD")  # 8
+    memo.put(FP, "ef", "EF")  # 12 > 10: sale "ab"
+    assert memo.total_bytes == 8
+    assert memo.get(FP, "ab") is None
+    memo.put(FP, "ñ", "Ñ")  # 2 + 2 bytes en UTF-8: sale "cd"
+    assert memo.total_bytes == 8
+    assert memo.get(FP, "cd") is None
+    assert memo.get(FP, "ef") == "EF"
+
+
+def test_entry_larger_than_limit_is_not_kept():
+    memo = ResultCache(max_bytes=10)
+    memo.put(FP, "ab", "AB")
+    memo.put(FP, "x" * 6, "y" * 6)
+    assert len(memo) == 1
+    assert memo.get(FP, "x" * 6) is None
+    assert memo.get(FP, "ab") == "AB"
+
+
+def test_replace_updates_size():
+    memo = ResultCache()
+    memo.put(FP, "ab", "AB")
+    memo.put(FP, "ab", "ABCD")
+    assert len(memo) == 1
+    assert memo.total_bytes == 6
+    assert memo.get(FP, "ab") == "ABCD"
+
+
+def test_key_includes_fingerprint():
+    memo = ResultCache()
+    memo.put(FP, "ab", "AB")
+    assert memo.get("0" * 64, "ab") is None
+
+
+def test_sqlite_survives_eviction_and_restart(tmp_path):
+    path = tmp_path / "memo.sqlite"
+    memo = ResultCache(max_entries=1, path=path)
+    memo.put(FP, "a", "A")
+    memo.put(FP, "b", "B")  # "a" sale de memoria, queda en disco
+    assert memo.get(FP, "a") == "A"
+    assert memo.disk_hits == 1
+    memo.close()
+
+    again = ResultCache(path=path)
+    assert again.get(FP, "b") == "B"
+    assert again.get(FP, "b") == "B"  # el segundo ya está en memoria
+    assert (again.hits, again.disk_hits) == (2, 1)
+    again.clear(disk=True)
+    assert again.get(FP, "a") is None
+    again.close()
+
+
+def test_encrypt_with_memo():
+    memo = ResultCache()
+    word = "3#ROMA NO FUE CONSTRUIDA EN UN DIA."
+    expected = encrypt(word)
+    assert encrypt(word, memo=memo) == expected
+    assert encrypt(word, memo=memo) == expected
+    assert (memo.hits, memo.misses, len(memo)) == (1, 1, 1)
@@ -0,0 +1,106 @@
+# tests/test_minimize.py
+
+"""
+minimize() conserva el comportamiento sobre entradas de Σ: mismas cintas,
+mismos pasos y misma aceptación; el estado final puede ser el
+representante de su clase.
+"""
+
+import random
+
+import pytest
+
+from conftest import BLANK, CAESAR_MACHINES, EJEMPLOS, random_config, random_words, reference_run
+from maquina.minimize import minimize
+from maquina.parser import load_mt_from_json, save_mt_to_json
+from maquina.turing import TMConfig
+
+
+def _check_same_behavior(config, minimized, report, words):
+    for word in words:
+        tapes, state, steps = reference_run(config, word)
+        min_tapes, min_state, min_steps = reference_run(minimized, word)
+        assert (min_tapes, min_steps) == (tapes, steps), word
+        assert (min_state in minimized.accept_states) == (state in config.accept_states), word
+        assert min_state == state or state in report.merged.get(min_state, []), word
+
+
+def _with_twin(config: TMConfig, rng: random.Random) -> TMConfig:
+    """Agrega qGemelo, copia exacta de q1, y desvía hacia él la mitad de las llegadas a q1."""
+    transitions = {}
+    for (q, reads), (q2, writes, moves) in config.transitions.items():
+        if q2 == "q1" and rng.random() < 0.5:
+            q2 = "qGemelo"
+        transitions[(q, reads)] = (q2, writes, moves)
+        if q == "q1":
+            transitions[("qGemelo", reads)] = (q2, writes, moves)
+    return TMConfig(**{**vars(config), "states": config.states + ["qGemelo"],
+                       "transitions": transitions})
+
+
+def test_random_machines():
+    merged = 0
+    for seed in range(60):
+        rng = random.Random(seed)
+        k = seed % 3 + 1
+        config = _with_twin(random_config(rng, k), rng)
+        minimized, report = minimize(config)
+        _check_same_behavior(config, minimized, report, random_words(rng, k, 12, foreign=False))
+        assert "qMuerto" in report.unreachable_states
+        assert report.states_after <= report.states_before + 1  # + qExtra si no estaba en Q
+        merged += "qGemelo" in report.merged.get("q1", [])
+    assert merged > 0
+
+
+@pytest.mark.parametrize("name", CAESAR_MACHINES)
+def test_caesar_machines(name, tmp_path):
+    config = load_mt_from_json(str(EJEMPLOS / f"{name}.json"))
+    minimized, report = minimize(config)
+
+    # El JSON minimizado es válido y se comporta igual
+    out = tmp_path / f"{name}.min.json"
+    save_mt_to_json(minimized, str(out))
+    reloaded = load_mt_from_json(str(out))
+
+    rng = random.Random(0)
+    sigma = config.input_alphabet
+    words = [["".join(rng.choice(sigma) for _ in range(rng.randint(0, 30)))] for _ in range(40)]
+    words += [["3#ROMA NO FUE CONSTRUIDA EN UN DIA."], ["25#AZ"], ["0#"]]
+    words = [w for w in words if set(w[0]) <= set(sigma)]
+    _check_same_behavior(config, minimized, report, words)
+    _check_same_behavior(config, reloaded, report, words)
+
+
+def test_merges_equivalent_states_and_drops_dead_transitions():
+    # q1 y q2 hacen lo mismo; la transición desde qf nunca se usa y la que
+    # lee "x" tampoco (nadie escribe "x")
+    transitions = {
+        ("q0", ("a",)): ("q1", ("b",), ("R",)),
+        ("q0", ("b",)): ("q2", ("b",), ("R",)),
+        ("q1", ("a",)): ("q1", ("a",), ("R",)),
+        ("q2", ("a",)): ("q2", ("a",), ("R",)),
+        ("q1", (BLANK,)): ("qf", (BLANK,), ("S",)),
+        ("q2", (BLANK,)): ("qf", (BLANK,), ("S",)),
+        ("q1", ("x",)): ("q0", ("x",), ("L",)),
+        ("qf", ("a",)): ("q0", ("a",), ("R",)),
+    }
+    config = TMConfig(
+        states=["q0", "q1", "q2", "qf", "qSolo"],
+        input_alphabet=["a", "b"],
+        tape_alphabet=["a", "b", "x", BLANK],
+        blank=BLANK,
+        initial_state="q0",
+        accept_states=["qf"],
+        transitions=transitions,
+        num_tapes=1,
+        max_steps=100,
+    )
+    minimized, report = minimize(config)
+    assert minimized.states == ["q0", "q1", "qf"]
+    assert report.merged == {"q1": ["q2"]}
+    assert report.unreachable_states == ["qSolo"]
+    assert report.dead_transitions == 2
+    assert "x" not in minimized.tape_alphabet
+    assert len(minimized.transitions) == 4
+    words = [[w] for w in ["", "a", "b", "aaa", "baa", "ab", "bb", "abab"]]
+    _check_same_behavior(config, minimized, report, words)
@@ -0,0 +1,25 @@
+# tests/test_parser.py
+
+import json
+
+import pytest
+
+from maquina.parser import load_mt_from_json
+
+
+def _with_max_steps(encoder_path, tmp_path, value):
+    spec = json.loads(encoder_path.read_text(encoding="utf-8"))
+    spec["max_steps"] = value
+    path = tmp_path / "mt.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("value", [True, False, 0, -5, 1.5, "100", None])
+def test_invalid_max_steps(encoder_path, tmp_path, value):
+    with pytest.raises(ValueError, match="max_steps"):
+        load_mt_from_json(_with_max_steps(encoder_path, tmp_path, value))
+
+
+def test_max_steps_from_json(encoder_path, tmp_path):
+    assert load_mt_from_json(_with_max_steps(encoder_path, tmp_path, 1234)).max_steps == 1234
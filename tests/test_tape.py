@@ -0,0 +1,23 @@
+# tests/test_tape.py
+
+from maquina.parser import load_mt_from_json
+from maquina.turing import TuringMachine
+
+
+def test_reset_drops_foreign_symbols(encoder_path):
+    """
+    Los símbolos ajenos a Γ que trae una entrada no deben quedar en el
+    codec de la siguiente: la cinta vuelve a ser un bytearray.
+    """
+    tm = TuringMachine(load_mt_from_json(str(encoder_path)))
+    base = len(tm._codec)
+    for i in range(300):
+        tm.reset([f"3#HOLA{chr(0x4E00 + i)}"])
+        tm.run()
+    assert len(tm._codec) == base + 1  # solo el símbolo ajeno de esta entrada
+
+    tm.reset(["3#HOLA"])
+    assert len(tm._codec) == base
+    assert isinstance(tm.tapes[0].cells, bytearray)
+    tm.run()
+    assert tm.get_tape(0) == "3#KROD"
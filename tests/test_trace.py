@@ -0,0 +1,26 @@
+# tests/test_trace.py
+
+from maquina.encoder_mt import encrypt, encrypt_with_trace
+from maquina.turing import HALT_ACCEPTED, HALT_CANCELLED
+
+
+def test_trace_matches_encrypt(encoder_path):
+    output, trace = encrypt_with_trace("3#HOLA MUNDO.", str(encoder_path), max_steps=None)
+    assert output == encrypt("3#HOLA MUNDO.", str(encoder_path))
+    assert trace.halt_reason == HALT_ACCEPTED
+    assert trace[len(trace) - 1]["tape"].startswith("3#" + output)
+
+
+def test_cancel_after_finish_keeps_result(encoder_path):
+    """Un should_stop que ya no se consulta no marca la corrida como cancelada."""
+    output, trace = encrypt_with_trace("3#HOLA", str(encoder_path), max_steps=None,
+                                       should_stop=lambda: True)
+    assert output == "KROD"
+    assert trace.halt_reason == HALT_ACCEPTED
+
+
+def test_cancel_stops_long_run(encoder_path):
+    _, trace = encrypt_with_trace("3#" + "HOLA" * 2000, str(encoder_path), max_steps=None,
+                                  should_stop=lambda: True)
+    assert trace.halt_reason == HALT_CANCELLED
+    assert len(trace) - 1 < 2000 * 4